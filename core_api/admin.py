@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Batch, DiscussionType, Schedule, UploadedFile
+from django.utils import timezone
+
+from .models import BackgroundJob, User, Batch, DiscussionType, Schedule, UploadedFile
 
 
 class UserAdmin(BaseUserAdmin):
@@ -96,6 +98,16 @@ class ScheduleAdmin(admin.ModelAdmin):
         "created_by",
     )  # Performance improvement
 
+    def get_queryset(self, request):
+        # One query for the whole changelist instead of one files.exists() per row
+        return super().get_queryset(request).with_submission_status()
+
+    @admin.display(
+        boolean=True, ordering="submission_count", description="Submission uploaded"
+    )
+    def is_submission_uploaded(self, obj):
+        return obj.is_submission_uploaded
+
 
 @admin.register(UploadedFile)
 class UploadedFileAdmin(admin.ModelAdmin):
@@ -140,3 +152,37 @@ class UploadedFileAdmin(admin.ModelAdmin):
         return "-"
 
     display_file_url.short_description = "File Link"
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "task",
+        "args",
+        "status",
+        "attempts",
+        "run_after",
+        "finished_at",
+    )
+    list_filter = ("status", "task")
+    search_fields = ("task",)
+    readonly_fields = (
+        "task",
+        "args",
+        "kwargs",
+        "attempts",
+        "worker",
+        "last_error",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+    actions = ["retry_jobs"]
+
+    @admin.action(description="Queue selected jobs again")
+    def retry_jobs(self, request, queryset):
+        retried = queryset.exclude(status="running").update(
+            status="queued", attempts=0, run_after=timezone.now()
+        )
+        self.message_user(request, f"Queued {retried} job(s) again.")
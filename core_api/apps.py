@@ -1,6 +1,21 @@
+import os
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.core import checks
 
 
 class CoreApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core_api"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .downloads import check_file_delivery_backend
+
+        checks.register(check_file_delivery_backend)
+
+        # Django's system check (files.E001) requires the upload temp dir to
+        # exist; MediaTempFileUploadHandler also creates it on first use.
+        if settings.FILE_UPLOAD_TEMP_DIR:
+            os.makedirs(settings.FILE_UPLOAD_TEMP_DIR, exist_ok=True)
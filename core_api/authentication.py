@@ -0,0 +1,65 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+def token_cache():
+    return caches[settings.TOKEN_AUTH_CACHE]
+
+
+def token_cache_key(key):
+    # Never use the raw token as a cache key.
+    return "authtoken:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def forget_tokens(keys):
+    # Drop them now, and again once the change is visible to other threads, so
+    # a request that read the old user mid-transaction can't re-cache it.
+    keys = [token_cache_key(key) for key in keys]
+    if keys:
+        token_cache().delete_many(keys)
+        transaction.on_commit(lambda: token_cache().delete_many(keys))
+
+
+def forget_user_tokens(user_ids):
+    forget_tokens(
+        Token.objects.filter(user_id__in=user_ids).values_list("key", flat=True)
+    )
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that keeps token -> (user, token) in the
+    settings.TOKEN_AUTH_CACHE cache, with the user's batch loaded, so an
+    authenticated request does not start with a Token/User query.
+
+    Entries expire after the cache's TIMEOUT and are evicted by
+    core_api.signals when the token is deleted or the user or their batch is
+    saved. Changes made with queryset.update() send no signals and are only
+    picked up once the entry expires.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        cached = token_cache().get(cache_key)
+        if cached is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related("user", "user__batch").get(
+                    key=key
+                )
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            cached = (token.user, token)
+            token_cache().set(cache_key, cached)
+
+        user, token = cached
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        return user, token
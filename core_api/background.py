@@ -0,0 +1,149 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+CLAIM_BATCH_SIZE = 20
+
+_tasks = {}
+
+
+def task(func):
+    """
+    Registers `func` so it can be queued with enqueue() and run by the worker.
+    Jobs name the function by module and qualified name, so renaming it
+    orphans jobs still queued under the old name.
+    """
+    _tasks[f"{func.__module__}.{func.__qualname__}"] = func
+    return func
+
+
+def _task_name(func):
+    name = f"{func.__module__}.{func.__qualname__}"
+    if _tasks.get(name) is not func:
+        raise ValueError(f"{name} is not registered with core_api.background.task.")
+    return name
+
+
+def enqueue(func, *args, **kwargs):
+    """
+    Queues func(*args, **kwargs) for `python manage.py run_worker`. The job is
+    written in the current transaction, so it is only seen once the work that
+    queued it commits, and is dropped if that rolls back. An identical job
+    still waiting in the queue is reused. Arguments must be JSON-serialisable
+    and tasks safe to run more than once.
+    With settings.BACKGROUND_TASKS_EAGER the job runs inline on commit instead.
+    """
+    name = _task_name(func)
+    job = BackgroundJob.objects.filter(
+        task=name, args=list(args), kwargs=kwargs, status="queued"
+    ).first()
+    if job is None:
+        job = BackgroundJob.objects.create(
+            task=name,
+            args=list(args),
+            kwargs=kwargs,
+            max_attempts=settings.BACKGROUND_JOB_MAX_ATTEMPTS,
+        )
+    if settings.BACKGROUND_TASKS_EAGER:
+        transaction.on_commit(lambda: _run_eagerly(job.pk))
+    return job
+
+
+def _run_eagerly(job_id):
+    job = _claim(job_id, "eager")
+    if job is not None:
+        run_job(job)
+
+
+def _claim(job_id, worker):
+    claimed = BackgroundJob.objects.filter(pk=job_id, status="queued").update(
+        status="running",
+        worker=worker,
+        started_at=timezone.now(),
+        attempts=F("attempts") + 1,
+    )
+    return BackgroundJob.objects.get(pk=job_id) if claimed else None
+
+
+def claim_next_job(worker):
+    """
+    Marks the oldest due job as running on `worker` and returns it, or None if
+    nothing is due. The conditional update makes a job go to exactly one
+    claimant, even with several worker processes on one database.
+    """
+    due = BackgroundJob.objects.filter(
+        status="queued", run_after__lte=timezone.now()
+    ).order_by("run_after", "pk")
+    for job_id in due.values_list("pk", flat=True)[:CLAIM_BATCH_SIZE]:
+        job = _claim(job_id, worker)
+        if job is not None:
+            return job
+    return None
+
+
+def run_job(job):
+    """
+    Runs a claimed job and records the outcome. A failure is retried after
+    BACKGROUND_JOB_RETRY_DELAY seconds, doubling per attempt, until the job
+    has had `max_attempts`.
+    """
+    func = _tasks.get(job.task)
+    fields = {"last_error": ""}
+    if func is None:
+        logger.error("Background job %s names unknown task %s", job.pk, job.task)
+        fields.update(status="failed", last_error=f"Unknown task {job.task}.")
+    else:
+        try:
+            func(*job.args, **job.kwargs)
+        except Exception:
+            logger.exception("Background job %s (%s) failed", job.pk, job.task)
+            fields["last_error"] = traceback.format_exc()[-4000:]
+            if job.attempts < job.max_attempts:
+                delay = settings.BACKGROUND_JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+                fields.update(
+                    status="queued", run_after=timezone.now() + timedelta(seconds=delay)
+                )
+            else:
+                fields["status"] = "failed"
+        else:
+            fields["status"] = "succeeded"
+    fields["finished_at"] = timezone.now()
+    BackgroundJob.objects.filter(pk=job.pk, status="running").update(**fields)
+    return fields["status"]
+
+
+def requeue_stale_jobs():
+    """
+    Puts back jobs left running longer than BACKGROUND_JOB_TIMEOUT seconds,
+    i.e. whose worker was stopped or crashed mid-job. Jobs out of attempts are
+    failed instead. Returns the number of jobs touched.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.BACKGROUND_JOB_TIMEOUT)
+    stale = BackgroundJob.objects.filter(status="running", started_at__lt=cutoff)
+    error = "Worker stopped before the job finished."
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status="failed", last_error=error, finished_at=timezone.now()
+    )
+    requeued = stale.update(status="queued", last_error=error, run_after=timezone.now())
+    return failed + requeued
+
+
+def purge_finished_jobs():
+    """
+    Deletes succeeded jobs older than BACKGROUND_JOB_RETENTION_DAYS; failed
+    jobs are kept for inspection. Returns the number deleted.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.BACKGROUND_JOB_RETENTION_DAYS)
+    deleted, _ = BackgroundJob.objects.filter(
+        status="succeeded", finished_at__lt=cutoff
+    ).delete()
+    return deleted
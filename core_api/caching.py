@@ -0,0 +1,55 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+BATCH_LIST_CACHE_KEY = "reference:batches"
+DISCUSSION_TYPE_LIST_CACHE_KEY = "reference:discussion-types"
+USERNAME_LIST_CACHE_KEY = "reference:usernames"
+
+
+def payload_digest(data):
+    encoded = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def forget_cached_list(cache_key):
+    # Drop it now, and again once the change is visible to other threads, so a
+    # request that read the old rows mid-transaction can't re-cache them.
+    cache.delete(cache_key)
+    transaction.on_commit(lambda: cache.delete(cache_key))
+
+
+class CachedListMixin:
+    """
+    Serves `list` from the default cache, with a strong ETag over the payload
+    so an unchanged list revalidates to a 304 without touching the database.
+
+    Only for viewsets whose list is the same for every user and ignores query
+    params. Call forget_cached_list(list_cache_key) whenever the underlying
+    rows change; core_api.signals does this for Batch, DiscussionType and
+    User.
+    """
+
+    list_cache_key = None
+    list_cache_timeout = 60 * 60  # Backstop for changes made without signals
+
+    def list(self, request, *args, **kwargs):
+        cached = cache.get(self.list_cache_key)
+        if cached is None:
+            data = list(super().list(request, *args, **kwargs).data)
+            cached = (payload_digest(data), data)
+            cache.set(self.list_cache_key, cached, self.list_cache_timeout)
+
+        digest, data = cached
+        # Per renderer, so the browsable API and JSON never share a 304.
+        etag = f'"{digest}-{request.accepted_renderer.format}"'
+        response = get_conditional_response(request, etag=etag) or Response(data)
+        response["ETag"] = etag
+        # Stored privately, but always revalidated: edits show up immediately.
+        response["Cache-Control"] = "private, no-cache"
+        return response
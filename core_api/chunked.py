@@ -0,0 +1,106 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from .models import ChunkedUpload
+
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+class ChunkWriteError(Exception):
+    pass
+
+
+class AssembledChunkedFile(File):
+    """
+    Presents a completed `.part` file to the storage backend. Exposing
+    temporary_file_path() makes FileSystemStorage rename it into place rather
+    than copying it (same trick as TemporaryUploadedFile).
+    """
+
+    def __init__(self, path, name, size):
+        super().__init__(None, name)
+        self._path = path
+        self.size = size
+
+    def temporary_file_path(self):
+        return self._path
+
+    def open(self, mode="rb"):
+        self.file = open(self._path, mode)
+        return self
+
+
+def next_expiry():
+    return timezone.now() + timedelta(hours=settings.CHUNKED_UPLOAD_EXPIRY_HOURS)
+
+
+def create_part_file(upload: ChunkedUpload):
+    os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+    open(upload.part_path, "wb").close()
+
+
+def write_chunk(upload: ChunkedUpload, index, stream):
+    """
+    Copies one chunk from `stream` into the `.part` file at its offset, in
+    COPY_BUFFER_SIZE pieces. Raises ChunkWriteError if the byte count does not
+    match what this chunk index should hold; the chunk is then simply re-sent.
+    """
+    expected = upload.expected_chunk_length(index)
+    written = 0
+    with open(upload.part_path, "r+b") as part:
+        part.seek(index * upload.chunk_size)
+        while stream is not None:
+            data = stream.read(min(COPY_BUFFER_SIZE, expected - written + 1))
+            if not data:
+                break
+            written += len(data)
+            if written > expected:
+                raise ChunkWriteError(
+                    f"Chunk {index} is larger than the expected {expected} bytes."
+                )
+            part.write(data)
+    if written != expected:
+        raise ChunkWriteError(
+            f"Chunk {index} has {written} bytes; expected {expected}."
+        )
+
+
+def discard_chunked_upload(upload: ChunkedUpload):
+    try:
+        os.remove(upload.part_path)
+    except FileNotFoundError:
+        pass
+    upload.delete()
+
+
+def purge_expired_uploads(now=None):
+    """
+    Deletes expired ChunkedUpload rows and their `.part` files, plus any `.part`
+    file left behind without a row. Returns the number of uploads purged.
+    """
+    now = now or timezone.now()
+    purged = 0
+    for upload in ChunkedUpload.objects.filter(expires_at__lte=now):
+        discard_chunked_upload(upload)
+        purged += 1
+
+    if os.path.isdir(settings.CHUNKED_UPLOAD_DIR):
+        live_ids = {str(pk) for pk in ChunkedUpload.objects.values_list("pk", flat=True)}
+        # Only stale strays: a brand-new upload may have its file before we saw its row.
+        cutoff = (now - timedelta(hours=settings.CHUNKED_UPLOAD_EXPIRY_HOURS)).timestamp()
+        for entry in os.scandir(settings.CHUNKED_UPLOAD_DIR):
+            upload_id, ext = os.path.splitext(entry.name)
+            if (
+                ext == ".part"
+                and upload_id not in live_ids
+                and entry.stat().st_mtime < cutoff
+            ):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+    return purged
@@ -0,0 +1,58 @@
+from django.db import connections
+
+from .background import enqueue, task
+from .models import BackgroundJob, UploadedFile
+
+JOB_BATCH_SIZE = 500  # Names per delete_stored_files job
+LOOKUP_BATCH_SIZE = 500
+
+
+def delete_files_on_commit(names, using="default"):
+    """
+    Queues the stored files `names` for deletion by the worker. The job row
+    is written in the current transaction, so the files are only deleted once
+    it commits and a rollback (of it or of a savepoint) drops the names with
+    it. Names dropped one after another on a connection, e.g. by a bulk or
+    cascading delete, are appended to the same queued job.
+    """
+    names = [name for name in names if name]
+    if not names:
+        return
+    connection = connections[using]
+    job_id = getattr(connection, "stale_files_job_id", None)
+    if job_id is not None:
+        # Matching the task too: SQLite may reuse a rolled-back job's id.
+        queued = BackgroundJob.objects.filter(
+            pk=job_id, task=_TASK_NAME, status="queued"
+        )
+        args = queued.values_list("args", flat=True).first()
+        # No row: rolled back, or already picked up by the worker.
+        if args is not None and len(args[0]) + len(names) <= JOB_BATCH_SIZE:
+            if queued.update(args=[args[0] + names]):
+                return
+    connection.stale_files_job_id = enqueue(delete_stored_files, names).pk
+
+
+@task
+def delete_stored_files(names):
+    """
+    Deletes stored files that no UploadedFile refers to any more. Names that
+    a row has claimed again since are kept. Returns the number deleted.
+    """
+    storage = UploadedFile._meta.get_field("file").storage
+    still_used = set()
+    for start in range(0, len(names), LOOKUP_BATCH_SIZE):
+        still_used.update(
+            UploadedFile.objects.filter(
+                file__in=names[start : start + LOOKUP_BATCH_SIZE]
+            ).values_list("file", flat=True)
+        )
+    deleted = 0
+    for name in names:
+        if name not in still_used:
+            storage.delete(name)
+            deleted += 1
+    return deleted
+
+
+_TASK_NAME = f"{delete_stored_files.__module__}.{delete_stored_files.__qualname__}"
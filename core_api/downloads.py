@@ -0,0 +1,193 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+STREAM_BLOCK_SIZE = 64 * 1024
+BYTE_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+FILE_DELIVERY_BACKENDS = ("python", "x-accel-redirect", "x-sendfile")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def content_disposition(filename):
+    try:
+        filename.encode("ascii")
+        filename_header = 'filename="{}"'.format(filename)
+    except UnicodeEncodeError:
+        filename_header = "filename*=UTF-8''{}".format(quote(filename))
+    return "attachment; {}".format(filename_header)
+
+
+def _delegated_response(uploaded_file, backend):
+    """
+    An empty response telling the front proxy which file to send. Django has
+    already done the permission check; the proxy streams the bytes (and deals
+    with Range requests) without holding a waitress thread.
+    """
+    filename = uploaded_file.original_filename
+    response = HttpResponse(
+        content_type=mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    )
+    response["Content-Disposition"] = content_disposition(filename)
+    if backend == "x-accel-redirect":
+        relative_name = uploaded_file.file.name.replace("\\", "/")
+        response["X-Accel-Redirect"] = settings.FILE_DELIVERY_INTERNAL_URL + quote(
+            relative_name
+        )
+    elif backend == "x-sendfile":
+        response["X-Sendfile"] = uploaded_file.file.path
+    else:
+        raise ImproperlyConfigured(f"Unknown FILE_DELIVERY_BACKEND {backend!r}.")
+    return response
+
+
+def check_file_delivery_backend(app_configs, **kwargs):
+    """System check: a typo here would otherwise only show up on downloads."""
+    backend = getattr(settings, "FILE_DELIVERY_BACKEND", "python")
+    if backend in FILE_DELIVERY_BACKENDS:
+        return []
+    return [
+        checks.Error(
+            f"Unknown FILE_DELIVERY_BACKEND {backend!r}.",
+            hint="Use one of: " + ", ".join(FILE_DELIVERY_BACKENDS) + ".",
+            id="core_api.E001",
+        )
+    ]
+
+
+def file_validators(uploaded_file):
+    """
+    Returns (size, etag, last_modified) for an UploadedFile. The strong ETag
+    changes whenever the bytes on disk could have: new size, new mtime, or a
+    re-created row. last_modified is a Unix timestamp.
+    """
+    stat = os.stat(uploaded_file.file.path)
+    upload_ts = int(uploaded_file.upload_date.timestamp())
+    etag = '"{:x}-{:x}-{:x}"'.format(stat.st_size, stat.st_mtime_ns, upload_ts)
+    last_modified = max(int(stat.st_mtime), upload_ts)
+    return stat.st_size, etag, last_modified
+
+
+def parse_byte_range(header, size):
+    """
+    Parses a single "bytes=first-last" range into inclusive (start, end).
+    Returns None when the header should be ignored (malformed or multi-range;
+    the full file is served instead). Raises RangeNotSatisfiable when it lies
+    entirely past the end of the file.
+    """
+    match = BYTE_RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:  # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise RangeNotSatisfiable
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return if_range == etag  # Strong comparison only
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _iter_file_range(uploaded_file, start, length):
+    file_handle = uploaded_file.file.open("rb")
+    try:
+        file_handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            data = file_handle.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    finally:
+        file_handle.close()
+
+
+def _set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Accept-Ranges"] = "bytes"
+    # Stored privately, but always revalidated: repeat views cost a 304.
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def serve_uploaded_file(request, uploaded_file):
+    """
+    Streams an UploadedFile the caller has already been authorised to read,
+    honouring If-None-Match / If-Modified-Since (304) and single byte ranges
+    (206). Raises FileNotFoundError if the file is missing from disk.
+
+    With settings.FILE_DELIVERY_BACKEND other than "python", the bytes are
+    handed off to the front proxy instead (see _delegated_response).
+    """
+    size, etag, last_modified = file_validators(uploaded_file)
+
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if conditional is not None:
+        return _set_validators(conditional, etag, last_modified)
+
+    backend = getattr(settings, "FILE_DELIVERY_BACKEND", "python")
+    if backend != "python":
+        # Same validators as when Django streams the file, so the client's
+        # next request can be answered with a 304 before any hand-off.
+        return _set_validators(
+            _delegated_response(uploaded_file, backend), etag, last_modified
+        )
+
+    filename = uploaded_file.original_filename
+    range_header = request.META.get("HTTP_RANGE")
+    if range_header and _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return _set_validators(response, etag, last_modified)
+        if byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                _iter_file_range(uploaded_file, start, length),
+                status=206,
+                content_type=mimetypes.guess_type(filename)[0]
+                or "application/octet-stream",
+            )
+            response["Content-Length"] = str(length)
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            response["Content-Disposition"] = content_disposition(filename)
+            return _set_validators(response, etag, last_modified)
+
+    response = FileResponse(
+        uploaded_file.file.open("rb"), as_attachment=True, filename=filename
+    )
+    response["Content-Disposition"] = content_disposition(filename)
+    return _set_validators(response, etag, last_modified)
@@ -0,0 +1,112 @@
+import os
+import zipfile
+
+from django.utils import timezone
+from django.utils.text import slugify
+
+# Formats that are already compressed internally (PDF streams, OOXML/ODF zips,
+# media). Deflating them again burns CPU for a negligible size gain.
+STORED_EXTENSIONS = {
+    ".pdf",
+    ".pptx",
+    ".docx",
+    ".xlsx",
+    ".odp",
+    ".odt",
+    ".ods",
+    ".zip",
+    ".7z",
+    ".rar",
+    ".gz",
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".webp",
+    ".mp3",
+    ".m4a",
+    ".mp4",
+    ".mov",
+    ".webm",
+}
+
+
+class _ZipStreamSink:
+    """
+    Write-only, non-seekable target for ZipFile. ZipFile then emits data
+    descriptors instead of seeking back, so the archive can be produced front
+    to back; the generator drains whatever was written after every block.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _archive_name(uploaded_file, used_names):
+    folder = "/".join(
+        [slugify(uploaded_file.batch.name), uploaded_file.discussion_type.slug]
+    )
+    base = os.path.basename(uploaded_file.file.name)
+    stem, ext = os.path.splitext(base)
+    name = f"{folder}/{base}"
+    counter = 1
+    while name in used_names:
+        name = f"{folder}/{stem}_{counter}{ext}"
+        counter += 1
+    used_names.add(name)
+    return name
+
+
+def iter_zip_archive(uploaded_files):
+    """
+    Yields a ZIP archive of `uploaded_files` (an iterable of UploadedFile with
+    batch and discussion_type loaded) piece by piece, holding at most one
+    file-read block in memory. Files missing from disk are skipped.
+    """
+    sink = _ZipStreamSink()
+    used_names = set()
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as archive:
+        for uploaded_file in uploaded_files:
+            try:
+                file_handle = uploaded_file.file.open("rb")
+            except FileNotFoundError:
+                continue
+            with file_handle:
+                size = uploaded_file.file.size
+                info = zipfile.ZipInfo(
+                    _archive_name(uploaded_file, used_names),
+                    date_time=timezone.localtime(
+                        uploaded_file.upload_date
+                    ).timetuple()[:6],
+                )
+                ext = os.path.splitext(uploaded_file.file.name)[1].lower()
+                info.compress_type = (
+                    zipfile.ZIP_STORED
+                    if ext in STORED_EXTENSIONS
+                    else zipfile.ZIP_DEFLATED
+                )
+                info.file_size = size
+                with archive.open(
+                    info, mode="w", force_zip64=size >= zipfile.ZIP64_LIMIT
+                ) as entry:
+                    for block in file_handle.chunks():
+                        entry.write(block)
+                        data = sink.drain()
+                        if data:
+                            yield data
+            data = sink.drain()
+            if data:
+                yield data
+    yield sink.drain()  # Central directory
@@ -0,0 +1,146 @@
+import logging
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from .background import task
+from .models import DocumentText, UploadedFile
+from .search import index_uploaded_file
+
+try:
+    import pypdf
+except ImportError:  # PDF text is optional; PPTX/DOCX need only the stdlib
+    pypdf = None
+
+logger = logging.getLogger(__name__)
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DRAWING_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+DOCX_PARTS = ("word/document.xml", "word/footnotes.xml", "word/endnotes.xml")
+PPTX_PART_RE = re.compile(r"ppt/(slides/slide|notesSlides/notesSlide)(\d+)\.xml")
+
+
+class UnsupportedDocument(Exception):
+    pass
+
+
+def _xml_text(stream, text_tag, paragraph_tag):
+    for _event, element in ElementTree.iterparse(stream):
+        if element.tag == text_tag:
+            yield element.text or ""
+        elif element.tag == paragraph_tag:
+            yield "\n"
+            element.clear()  # Keeps memory flat on large parts
+
+
+def _docx_text(archive):
+    names = set(archive.namelist())
+    for part in DOCX_PARTS:
+        if part in names:
+            with archive.open(part) as stream:
+                yield from _xml_text(stream, f"{WORD_NS}t", f"{WORD_NS}p")
+
+
+def _pptx_text(archive):
+    # Slides in order, then speaker notes in order
+    parts = sorted(
+        (match.group(1) != "slides/slide", int(match.group(2)), name)
+        for name in archive.namelist()
+        if (match := PPTX_PART_RE.fullmatch(name))
+    )
+    for _is_notes, _number, part in parts:
+        with archive.open(part) as stream:
+            yield from _xml_text(stream, f"{DRAWING_NS}t", f"{DRAWING_NS}p")
+        yield "\n"
+
+
+def _pdf_text(stream):
+    if pypdf is None:
+        raise UnsupportedDocument("PDF text extraction needs the pypdf package.")
+    for page in pypdf.PdfReader(stream).pages:
+        yield page.extract_text() or ""
+        yield "\n"
+
+
+def extract_text(stream, filename, max_chars):
+    """
+    Plain text of a PDF, PPTX or DOCX read from a seekable binary `stream`,
+    parsed locally and truncated to `max_chars`. Raises UnsupportedDocument
+    for other formats.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".pdf":
+        pieces = _pdf_text(stream)
+    elif extension in (".docx", ".pptx"):
+        archive = zipfile.ZipFile(stream)
+        pieces = _docx_text(archive) if extension == ".docx" else _pptx_text(archive)
+    else:
+        raise UnsupportedDocument(f"No text extractor for {extension or 'this file'}.")
+
+    chunks, length = [], 0
+    for piece in pieces:  # Stop parsing once the cap is reached
+        chunks.append(piece)
+        length += len(piece)
+        if length >= max_chars:
+            break
+    text = re.sub(r"[^\S\n]+", " ", "".join(chunks))
+    return re.sub(r"\s*\n\s*", "\n", text).strip()[:max_chars]
+
+
+@task
+def extract_document_text(file_id, force=False):
+    """
+    Extracts the text of UploadedFile `file_id` into its DocumentText and
+    refreshes the file's search index row. Files whose stored text came from
+    the same stored file (name and size) are skipped unless `force`. Returns
+    the DocumentText, or None if the upload no longer exists.
+    """
+    uploaded = (
+        UploadedFile.objects.select_related("schedule").filter(pk=file_id).first()
+    )
+    if uploaded is None or not uploaded.file:
+        return None
+    existing = DocumentText.objects.filter(pk=file_id).first()
+    name = uploaded.file.name
+    try:
+        size = uploaded.file.size
+    except OSError:
+        size = None
+    if (
+        existing is not None
+        and not force
+        and (existing.source_name, existing.source_size) == (name, size)
+    ):
+        return existing
+
+    fields = {"source_name": name, "source_size": size, "text": "", "error": ""}
+    if size is None:
+        fields.update(status="failed", error="Stored file is missing.")
+    elif size > settings.DOCUMENT_TEXT_MAX_FILE_SIZE:
+        fields.update(status="unsupported", error="File is too large to index.")
+    else:
+        try:
+            with uploaded.file.open("rb") as stream:
+                fields["text"] = extract_text(
+                    stream, name, settings.DOCUMENT_TEXT_MAX_CHARS
+                )
+            fields["status"] = "indexed"
+        except UnsupportedDocument as exc:
+            fields.update(status="unsupported", error=str(exc)[:255])
+        except Exception as exc:  # Corrupt or encrypted documents
+            logger.warning("Text extraction failed for file %s: %s", file_id, exc)
+            fields.update(status="failed", error=str(exc)[:255] or type(exc).__name__)
+
+    try:
+        with transaction.atomic():
+            document, _ = DocumentText.objects.update_or_create(
+                uploaded_file_id=file_id, defaults=fields
+            )
+            index_uploaded_file(uploaded)
+    except IntegrityError:  # Upload deleted while we were parsing it
+        return None
+    return document
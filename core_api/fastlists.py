@@ -0,0 +1,152 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .models import Batch, DiscussionType, UploadedFile
+from .serializers import sparse_field_names
+
+# Shared formatters: the exact to_representation the serializers use.
+_date_field = serializers.DateField()
+_datetime_field = serializers.DateTimeField()
+
+SCHEDULE_VALUES = (
+    "id",
+    "batch_id",
+    "discussion_type_id",
+    "title",
+    "presenter_id",
+    "presenter__username",
+    "scheduled_date",
+    "created_by_id",
+    "created_by__username",
+    "description",
+    "submission_count",
+    "latest_submission_date",
+)
+
+UPLOADED_FILE_VALUES = (
+    "id",
+    "uploader_id",
+    "uploader__username",
+    "batch_id",
+    "discussion_type_id",
+    "schedule_id",
+    "schedule__title",
+    "file",
+    "original_filename",
+    "upload_date",
+    "description",
+    "preview__page_count",
+    "preview__status",
+)
+
+
+def _names(model):
+    return dict(model.objects.values_list("pk", "name"))
+
+
+def schedule_list(rows, request=None):
+    """
+    ScheduleSerializer(many=True).data for .values(*SCHEDULE_VALUES) rows of a
+    with_submission_status() queryset, without a serializer per row. `request`
+    is unused; it keeps the signature FastListMixin.fast_list_builder expects.
+    """
+    batch_names = _names(Batch)
+    discussion_type_names = _names(DiscussionType)
+    to_date = _date_field.to_representation
+    to_datetime = _datetime_field.to_representation
+    return [
+        {
+            "id": row["id"],
+            "batch": row["batch_id"],
+            "batch_name": batch_names[row["batch_id"]],
+            "discussion_type": row["discussion_type_id"],
+            "discussion_type_name": discussion_type_names[row["discussion_type_id"]],
+            "title": row["title"],
+            "presenter": row["presenter_id"],
+            "presenter_username": row["presenter__username"],
+            "scheduled_date": to_date(row["scheduled_date"]),
+            "created_by": row["created_by_id"],
+            "created_by_username": row["created_by__username"],
+            "description": row["description"],
+            "is_submission_uploaded": row["submission_count"] > 0,
+            "submission_count": row["submission_count"],
+            "latest_submission_date": to_datetime(row["latest_submission_date"]),
+        }
+        for row in rows
+    ]
+
+
+def uploaded_file_list(rows, request):
+    """
+    UploadedFileSerializer(many=True).data for .values(*UPLOADED_FILE_VALUES)
+    rows, without a serializer per row. `file` is made absolute against
+    `request`, as FileField does.
+    """
+    batch_names = _names(Batch)
+    discussion_type_names = _names(DiscussionType)
+    storage_url = UploadedFile._meta.get_field("file").storage.url
+    to_datetime = _datetime_field.to_representation
+    result = []
+    for row in rows:
+        url = storage_url(row["file"]) if row["file"] else None
+        result.append(
+            {
+                "id": row["id"],
+                "uploader": row["uploader_id"],
+                "uploader_username": row["uploader__username"],
+                "batch": row["batch_id"],
+                "batch_name": batch_names[row["batch_id"]],
+                "discussion_type": row["discussion_type_id"],
+                "discussion_type_name": discussion_type_names[
+                    row["discussion_type_id"]
+                ],
+                "schedule": row["schedule_id"],
+                "schedule_title": row["schedule__title"],
+                "file": (
+                    request.build_absolute_uri(url)
+                    if url and request is not None
+                    else url
+                ),
+                "file_url": url,
+                "original_filename": row["original_filename"],
+                "upload_date": to_datetime(row["upload_date"]),
+                "description": row["description"],
+                "page_count": row["preview__page_count"],
+                "has_preview": row["preview__status"] == "ready",
+            }
+        )
+    return result
+
+
+class FastListMixin:
+    """
+    Serves `list` from .values(*fast_list_values) rows turned into dicts by
+    fast_list_builder(rows, request), skipping per-row serializer instances.
+    The output must match the serializer's byte for byte (see
+    FastListSerializationTests). Requests using ?fields= / ?omit= go through
+    the serializer instead.
+    """
+
+    fast_list_values = ()
+    fast_list_builder = None  # e.g. staticmethod(schedule_list)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not cls.fast_list_values or cls.fast_list_builder is None:
+            raise ImproperlyConfigured(
+                f"{cls.__name__} must set fast_list_values and fast_list_builder."
+            )
+
+    def list(self, request, *args, **kwargs):
+        if sparse_field_names(request, self.get_serializer_class()) is not None:
+            return super().list(request, *args, **kwargs)
+        rows = self.filter_queryset(self.get_queryset()).values(
+            *self.fast_list_values
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                self.fast_list_builder(page, request)
+            )
+        return Response(self.fast_list_builder(rows, request))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from core_api.models import UploadedFile
+from core_api.storage import content_sha256
+
+
+class Command(BaseCommand):
+    help = (
+        "Records the SHA-256 and size of uploaded files saved before those "
+        "columns existed, so their content can be linked by digest."
+    )
+
+    def handle(self, *args, **options):
+        pending = UploadedFile.objects.filter(content_sha256="").exclude(file="")
+        updated = missing = 0
+        for uploaded in pending.only("pk", "file").iterator():
+            try:
+                with uploaded.file.open("rb") as content:
+                    digest, size = content_sha256(content), content.size
+            except FileNotFoundError:
+                missing += 1
+                continue
+            UploadedFile.objects.filter(pk=uploaded.pk).update(
+                content_sha256=digest, size=size
+            )
+            updated += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"Recorded digests for {updated} file(s).")
+        )
+        if missing:
+            self.stdout.write(self.style.WARNING(f"{missing} file(s) missing on disk."))
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+
+from core_api.models import BackgroundJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Shows background job counts per task and status, and the latest "
+        "failures. --retry-failed queues failed jobs again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Queue every failed job again with a fresh set of attempts.",
+        )
+        parser.add_argument(
+            "--failures",
+            type=int,
+            default=10,
+            help="How many of the latest failed jobs to list (default 10).",
+        )
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            retried = BackgroundJob.objects.filter(status="failed").update(
+                status="queued", attempts=0, run_after=timezone.now()
+            )
+            self.stdout.write(self.style.SUCCESS(f"Queued {retried} failed job(s)."))
+
+        rows = (
+            BackgroundJob.objects.values("task", "status")
+            .annotate(count=Count("pk"))
+            .order_by("task", "status")
+        )
+        if not rows:
+            self.stdout.write("No background jobs.")
+        for row in rows:
+            self.stdout.write(f"{row['task']}: {row['count']} {row['status']}")
+
+        failures = BackgroundJob.objects.filter(status="failed").order_by(
+            "-finished_at"
+        )[: options["failures"]]
+        for job in failures:
+            error = job.last_error.strip().splitlines()[-1:] or [""]
+            self.stdout.write(
+                self.style.ERROR(
+                    f"#{job.pk} {job.task}{tuple(job.args)} after {job.attempts} "
+                    f"attempt(s): {error[0]}"
+                )
+            )
@@ -0,0 +1,100 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core_api.models import Schedule, UploadedFile, User
+
+DEFAULT_ROLES = ("professor", "batch_leader", "student")
+
+
+def list_querysets(user, page_size):
+    """
+    The first page of each role-scoped list the API serves to `user`, built
+    the way ScheduleViewSet / UploadedFileViewSet build them.
+    """
+    schedules = Schedule.objects.visible_to(user).order_by("-scheduled_date", "-id")
+    files = UploadedFile.objects.visible_to(user).order_by("-upload_date", "-id")
+    cases = [
+        ("schedules", schedules),
+        ("files", files),
+        ("files?uploader_id", files.filter(uploader=user)),
+    ]
+    if user.batch_id:
+        cases += [
+            ("schedules?batch_id", schedules.filter(batch_id=user.batch_id)),
+            ("files?batch_id", files.filter(batch_id=user.batch_id)),
+        ]
+    if user.role == "student":
+        cases.append(("schedules?presenter_id", schedules.filter(presenter=user)))
+    return [(label, queryset[:page_size]) for label, queryset in cases]
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the role-scoped Schedule and UploadedFile list queries and prints "
+        "their query plans, to check they use the composite list indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--username",
+            action="append",
+            dest="usernames",
+            help="Benchmark as this user (repeatable). Defaults to one user per role.",
+        )
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument(
+            "--no-explain", action="store_true", help="Skip printing query plans."
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="PostgreSQL only: EXPLAIN ANALYZE (runs the query).",
+        )
+
+    def _users(self, usernames):
+        if usernames:
+            users = list(User.objects.filter(username__in=usernames))
+            missing = set(usernames) - {u.username for u in users}
+            if missing:
+                raise CommandError(f"Unknown user(s): {', '.join(sorted(missing))}")
+            return users
+        users = []
+        for role in DEFAULT_ROLES:
+            user = User.objects.filter(role=role, is_active=True).first()
+            if user:
+                users.append(user)
+        if not users:
+            raise CommandError("No users to benchmark as; pass --username.")
+        return users
+
+    def handle(self, *args, **options):
+        iterations = max(1, options["iterations"])
+        explain_options = {}
+        if options["analyze"] and connection.vendor == "postgresql":
+            explain_options["analyze"] = True
+
+        self.stdout.write(
+            f"Database: {connection.vendor}; {iterations} iteration(s) per query; "
+            f"{Schedule.objects.count()} schedules, "
+            f"{UploadedFile.objects.count()} files."
+        )
+        for user in self._users(options["usernames"]):
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{user.username} ({user.role})"))
+            for label, queryset in list_querysets(user, options["page_size"]):
+                timings = []
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    rows = len(list(queryset.all()))
+                    timings.append((time.perf_counter() - start) * 1000)
+                self.stdout.write(
+                    f"  {label:<24} {rows:>4} rows  "
+                    f"median {statistics.median(timings):7.2f} ms  "
+                    f"max {max(timings):7.2f} ms"
+                )
+                if not options["no_explain"]:
+                    for line in queryset.explain(**explain_options).splitlines():
+                        self.stdout.write(f"      {line}")
@@ -0,0 +1,127 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core_api.fastlists import (
+    SCHEDULE_VALUES,
+    UPLOADED_FILE_VALUES,
+    schedule_list,
+    uploaded_file_list,
+)
+from core_api.models import Batch, DiscussionType, Schedule, UploadedFile, User
+from core_api.serializers import ScheduleSerializer, UploadedFileSerializer
+
+
+def _seed(rows):
+    batch = Batch.objects.create(
+        name="Serialization Benchmark", start_year=1900, end_year=1903
+    )
+    discussion_type = DiscussionType.objects.create(name="Serialization Benchmark")
+    user = User.objects.create_user(
+        username="serialization-benchmark", role="student", batch=batch
+    )
+    start = datetime.date(2000, 1, 1)
+    schedules = Schedule.objects.bulk_create(
+        Schedule(
+            batch=batch,
+            discussion_type=discussion_type,
+            title=f"Benchmark topic {i}",
+            presenter=user,
+            scheduled_date=start + datetime.timedelta(days=i % 3650),
+            created_by=user,
+            description="Benchmark description",
+        )
+        for i in range(rows)
+    )
+    UploadedFile.objects.bulk_create(
+        UploadedFile(
+            uploader=user,
+            batch=batch,
+            discussion_type=discussion_type,
+            schedule=schedules[i] if i % 2 else None,
+            file=f"benchmark/file_{i}.pdf",
+            original_filename=f"file_{i}.pdf",
+            description="Benchmark upload",
+        )
+        for i in range(rows)
+    )
+    return batch
+
+
+def _time(build):
+    start = time.perf_counter()
+    body = JSONRenderer().render(build())
+    return time.perf_counter() - start, body
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the serializer and .values() list paths for schedules and "
+        "files (query + build + JSON render). Seed rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, nargs="+", default=[1000, 10000], help="Row counts."
+        )
+
+    def handle(self, *args, **options):
+        request = Request(
+            APIRequestFactory().get("/api/files/", HTTP_HOST="localhost")
+        )
+        for rows in options["rows"]:
+            with transaction.atomic():
+                batch = _seed(rows)
+                schedules = (
+                    Schedule.objects.filter(batch=batch)
+                    .select_related(
+                        "batch", "discussion_type", "presenter", "created_by"
+                    )
+                    .with_submission_status()
+                    .order_by("-scheduled_date")
+                )
+                files = (
+                    UploadedFile.objects.filter(batch=batch)
+                    .select_related(
+                        "uploader", "batch", "discussion_type", "schedule", "preview"
+                    )
+                    .order_by("-upload_date")
+                )
+                cases = (
+                    (
+                        "schedules",
+                        lambda: ScheduleSerializer(
+                            schedules.all(), many=True, context={"request": request}
+                        ).data,
+                        lambda: schedule_list(schedules.values(*SCHEDULE_VALUES)),
+                    ),
+                    (
+                        "files",
+                        lambda: UploadedFileSerializer(
+                            files.all(), many=True, context={"request": request}
+                        ).data,
+                        lambda: uploaded_file_list(
+                            files.values(*UPLOADED_FILE_VALUES), request
+                        ),
+                    ),
+                )
+                self.stdout.write(self.style.MIGRATE_HEADING(f"{rows} rows"))
+                for label, serializer_path, fast_path in cases:
+                    serializer_time, serializer_body = _time(serializer_path)
+                    fast_time, fast_body = _time(fast_path)
+                    match = (
+                        "identical"
+                        if serializer_body == fast_body
+                        else self.style.ERROR("MISMATCH")
+                    )
+                    self.stdout.write(
+                        f"  {label:<10} serializer {serializer_time * 1000:8.1f} ms  "
+                        f"values {fast_time * 1000:8.1f} ms  "
+                        f"x{serializer_time / max(fast_time, 1e-9):5.1f}  {match}"
+                    )
+                transaction.set_rollback(True)
@@ -0,0 +1,157 @@
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    batch_id INTEGER NOT NULL,
+    upload_date TEXT NOT NULL,
+    original_filename TEXT NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX files_batch_date ON files (batch_id, upload_date DESC, id DESC);
+"""
+READ_SQL = (
+    "SELECT id, original_filename, upload_date FROM files WHERE batch_id = ? "
+    "ORDER BY upload_date DESC, id DESC LIMIT 50"
+)
+BATCHES = 8
+
+
+def _connect(path, tuned):
+    """
+    A connection configured the way Django would open it under each profile:
+    stock (rollback journal, BEGIN DEFERRED, Python's 5s timeout) or
+    settings.SQLITE_TUNING_PRAGMAS with BEGIN IMMEDIATE.
+    """
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    if tuned:
+        for name, value in settings.SQLITE_TUNING_PRAGMAS.items():
+            conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+def _seed(path, rows):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO files (batch_id, upload_date, original_filename, description) "
+        "VALUES (?, datetime('now', ?), ?, ?)",
+        (
+            (i % BATCHES, f"-{i} minutes", f"seed_{i}.pdf", "x" * 200)
+            for i in range(rows)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def run_profile(tuned, readers, writers, duration, seed_rows):
+    """
+    Runs `readers` threads issuing list queries and `writers` threads doing
+    read-then-insert transactions against a scratch database for `duration`
+    seconds. Returns counters and read latencies.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sqlite3")
+        _seed(path, seed_rows)
+        stop = threading.Event()
+        lock = threading.Lock()
+        stats = {"reads": 0, "writes": 0, "lock_errors": 0, "latencies": []}
+
+        def reader(index):
+            conn = _connect(path, tuned)
+            reads, latencies, errors = 0, [], 0
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    conn.execute(READ_SQL, (index % BATCHES,)).fetchall()
+                except sqlite3.OperationalError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                reads += 1
+            conn.close()
+            with lock:
+                stats["reads"] += reads
+                stats["lock_errors"] += errors
+                stats["latencies"].extend(latencies)
+
+        def writer():
+            conn = _connect(path, tuned)
+            writes, errors = 0, 0
+            begin = "BEGIN IMMEDIATE" if tuned else "BEGIN"
+            while not stop.is_set():
+                try:
+                    conn.execute(begin)
+                    conn.execute("SELECT COUNT(*) FROM files WHERE batch_id = 0")
+                    conn.execute(
+                        "INSERT INTO files (batch_id, upload_date, "
+                        "original_filename, description) "
+                        "VALUES (0, datetime('now'), 'new.pdf', ?)",
+                        ("y" * 200,),
+                    )
+                    conn.execute("COMMIT")
+                    writes += 1
+                except sqlite3.OperationalError:
+                    errors += 1
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+            conn.close()
+            with lock:
+                stats["writes"] += writes
+                stats["lock_errors"] += errors
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares stock SQLite against settings.SQLITE_TUNING_PRAGMAS under "
+        "parallel readers and writers, on a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument(
+            "--duration", type=float, default=5.0, help="Seconds per profile."
+        )
+        parser.add_argument("--seed-rows", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        readers = max(1, options["readers"])
+        writers = max(1, options["writers"])
+        duration = max(0.1, options["duration"])
+        self.stdout.write(
+            f"{readers} reader(s) + {writers} writer(s), {duration:g}s per profile, "
+            f"{options['seed_rows']} seed rows."
+        )
+        for label, tuned in (("stock", False), ("tuned", True)):
+            stats = run_profile(
+                tuned, readers, writers, duration, options["seed_rows"]
+            )
+            latencies = sorted(stats["latencies"]) or [0.0]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            self.stdout.write(
+                f"  {label:<6} reads/s {stats['reads'] / duration:9.0f}  "
+                f"writes/s {stats['writes'] / duration:7.0f}  "
+                f"lock errors {stats['lock_errors']:5d}  "
+                f"read median {statistics.median(latencies) * 1000:6.2f} ms  "
+                f"p95 {p95 * 1000:6.2f} ms"
+            )
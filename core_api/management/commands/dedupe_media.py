@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core_api.models import UploadedFile
+from core_api.storage import DedupFileSystemStorage
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves files uploaded before DedupFileSystemStorage into its blob store, "
+        "so identical uploads share one copy on disk."
+    )
+
+    def handle(self, *args, **options):
+        storage = UploadedFile._meta.get_field("file").storage
+        if not isinstance(storage, DedupFileSystemStorage):
+            raise CommandError(
+                'STORAGES["default"] is not core_api.storage.DedupFileSystemStorage.'
+            )
+        names = (
+            UploadedFile.objects.exclude(file="")
+            .order_by("file")
+            .values_list("file", flat=True)
+            .distinct()
+        )
+        adopted = freed = missing = 0
+        for name in names.iterator():
+            try:
+                freed += storage.adopt(name)
+            except FileNotFoundError:
+                missing += 1
+                continue
+            adopted += 1
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{adopted} file(s) in the blob store, {freed / 1048576:.1f} MB freed."
+            )
+        )
+        if missing:
+            self.stdout.write(self.style.WARNING(f"{missing} file(s) missing on disk."))
@@ -0,0 +1,30 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from core_api.models import UploadedFile
+from core_api.previews import generate_preview
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders first-page previews and page counts for uploaded files that "
+        "have none yet, or whose cached preview was evicted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="Re-render every file."
+        )
+
+    def handle(self, *args, **options):
+        statuses = Counter()
+        file_ids = UploadedFile.objects.order_by("pk").values_list("pk", flat=True)
+        for file_id in file_ids.iterator():
+            preview = generate_preview(file_id, force=options["force"])
+            if preview is not None:
+                statuses[preview.status] += 1
+        summary = ", ".join(
+            f"{count} {status}" for status, count in sorted(statuses.items())
+        )
+        self.stdout.write(self.style.SUCCESS(f"Previews: {summary or 'no files'}."))
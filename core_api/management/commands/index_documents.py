@@ -0,0 +1,32 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from core_api.extraction import extract_document_text
+from core_api.models import UploadedFile
+
+
+class Command(BaseCommand):
+    help = (
+        "Extracts searchable text from uploaded files that have none yet or "
+        "whose stored file changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="Re-extract every file."
+        )
+
+    def handle(self, *args, **options):
+        statuses = Counter()
+        file_ids = UploadedFile.objects.order_by("pk").values_list("pk", flat=True)
+        for file_id in file_ids.iterator():
+            document = extract_document_text(file_id, force=options["force"])
+            if document is not None:
+                statuses[document.status] += 1
+        summary = ", ".join(
+            f"{count} {status}" for status, count in sorted(statuses.items())
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Document text: {summary or 'no files'}.")
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core_api.chunked import purge_expired_uploads
+
+
+class Command(BaseCommand):
+    help = "Deletes expired resumable uploads and their partial files."
+
+    def handle(self, *args, **options):
+        purged = purge_expired_uploads()
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} expired upload(s)."))
@@ -0,0 +1,200 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core_api.models import UploadedFile
+from core_api.storage import BLOB_DIR, DedupFileSystemStorage
+
+SAMPLE_SIZE = 20  # Paths listed per category below verbosity 2
+
+
+def _scan_dir(path):
+    """Files (path, stat) and subdirectories directly inside `path`."""
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append((entry.path, entry.stat(follow_symlinks=False)))
+                except FileNotFoundError:  # Removed while we looked
+                    continue
+    except FileNotFoundError:
+        pass
+    return files, subdirs
+
+
+def scan_tree(roots, workers):
+    """
+    Walks the directory trees under `roots` with one scandir() per directory
+    on a thread pool, so the stat calls of sibling directories overlap.
+    Returns (files, directories): [(path, stat)] and every directory below
+    the roots.
+    """
+    files, directories = [], []
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="medmat-scan"
+    ) as executor:
+        pending = {executor.submit(_scan_dir, root) for root in roots}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                found, subdirs = future.result()
+                files.extend(found)
+                directories.extend(subdirs)
+                pending.update(executor.submit(_scan_dir, path) for path in subdirs)
+    return files, directories
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the files under MEDIA_ROOT with UploadedFile rows and reports "
+        "orphans (files no row references), unused blobs and rows whose file is "
+        "missing. Nothing is changed unless --delete is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--delete",
+            action="store_true",
+            help="Remove orphaned files, unused blobs and emptied directories.",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=60,
+            help=(
+                "Minutes a file must be untouched to count as orphaned; younger "
+                "files may belong to an upload still being saved (default 60)."
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=min(32, (os.cpu_count() or 1) + 4),
+            help="Directories scanned at once.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        self.verbosity = options["verbosity"]
+        storage = UploadedFile._meta.get_field("file").storage
+        media_root = os.path.abspath(settings.MEDIA_ROOT)
+        dedup = isinstance(storage, DedupFileSystemStorage)
+
+        # Dot-entries hold blobs, previews and in-progress uploads, not stored
+        # names; the blob store is checked separately.
+        workers = max(1, options["workers"])
+        top_files, top_dirs = _scan_dir(media_root)
+        roots = [path for path in top_dirs if not os.path.basename(path).startswith(".")]
+        files, directories = scan_tree(roots, workers)
+        directories.extend(roots)
+        files.extend(
+            (path, stat)
+            for path, stat in top_files
+            if not os.path.basename(path).startswith(".")
+        )
+        blobs = []
+        if dedup:
+            blobs, blob_dirs = scan_tree([os.path.join(media_root, BLOB_DIR)], workers)
+            directories.extend(blob_dirs)
+
+        on_disk = {
+            os.path.relpath(path, media_root).replace(os.sep, "/"): stat
+            for path, stat in files
+        }
+        referenced = {}
+        for pk, name in (
+            UploadedFile.objects.exclude(file="").values_list("pk", "file").iterator()
+        ):
+            referenced.setdefault(name.replace("\\", "/"), []).append(pk)
+        digests = set(
+            UploadedFile.objects.exclude(content_sha256="").values_list(
+                "content_sha256", flat=True
+            )
+        )
+
+        cutoff = time.time() - options["min_age"] * 60
+        orphans = sorted(
+            name
+            for name, stat in on_disk.items()
+            if name not in referenced and max(stat.st_mtime, stat.st_ctime) < cutoff
+        )
+        unused_blobs = sorted(
+            (os.path.basename(path), stat.st_size)
+            for path, stat in blobs
+            if stat.st_nlink == 1
+            and os.path.basename(path) not in digests
+            and max(stat.st_mtime, stat.st_ctime) < cutoff
+        )
+        missing = sorted(
+            (pk, name)
+            for name, pks in referenced.items()
+            if name not in on_disk
+            for pk in pks
+        )
+
+        self._report("Orphaned", orphans)
+        self._report("Unused blob", [digest for digest, _size in unused_blobs])
+        self._report("Missing", [f"#{pk} {name}" for pk, name in missing])
+
+        removed = 0
+        if options["delete"]:
+            # Re-check just before deleting: rows may have been saved since
+            # the scan started.
+            still_referenced = set()
+            for start in range(0, len(orphans), 500):
+                still_referenced.update(
+                    UploadedFile.objects.filter(
+                        file__in=orphans[start : start + 500]
+                    ).values_list("file", flat=True)
+                )
+            for name in orphans:
+                if name in still_referenced:
+                    continue
+                try:
+                    storage.delete(name)
+                except FileNotFoundError:
+                    continue
+                removed += 1
+            for digest, _size in unused_blobs:
+                if storage.delete_unused_blob(digest):
+                    removed += 1
+            for directory in sorted(directories, key=len, reverse=True):
+                try:
+                    os.rmdir(directory)  # Only succeeds once it is empty
+                except OSError:
+                    pass
+
+        orphan_bytes = sum(on_disk[name].st_size for name in orphans) + sum(
+            size for _digest, size in unused_blobs
+        )
+        summary = (
+            f"Scanned {len(on_disk) + len(blobs)} file(s) in "
+            f"{time.monotonic() - started:.1f}s: {len(orphans)} orphaned, "
+            f"{len(unused_blobs)} unused blob(s) ({orphan_bytes / 1048576:.1f} MB), "
+            f"{len(missing)} missing."
+        )
+        if options["delete"]:
+            summary += f" Removed {removed} file(s)."
+        else:
+            summary += " Dry run; use --delete to remove orphans."
+        self.stdout.write(self.style.SUCCESS(summary))
+        if missing:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{len(missing)} row(s) point at files that no longer exist."
+                )
+            )
+
+    def _report(self, label, items):
+        limit = None if self.verbosity >= 2 else SAMPLE_SIZE
+        for item in items[:limit]:
+            self.stdout.write(f"{label}: {item}")
+        if limit is not None and len(items) > limit:
+            self.stdout.write(f"{label}: ... and {len(items) - limit} more")
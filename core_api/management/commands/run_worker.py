@@ -0,0 +1,133 @@
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core_api.background import (
+    claim_next_job,
+    purge_finished_jobs,
+    requeue_stale_jobs,
+    run_job,
+)
+from core_api.chunked import purge_expired_uploads
+
+HOUSEKEEPING_INTERVAL = 300  # seconds
+
+
+def _run_on_thread(job):
+    try:
+        return run_job(job)
+    finally:
+        connections.close_all()  # Pool threads hold their own connections
+
+
+class _InlineExecutor:
+    """With --workers 1 jobs run on the worker's own thread and connection."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, job):
+        future = Future()
+        try:
+            future.set_result(run_job(job))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+
+class _PoolExecutor(ThreadPoolExecutor):
+    def submit(self, job):
+        return super().submit(_run_on_thread, job)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs queued background jobs (text extraction, previews, ...) on a "
+        "bounded thread pool until stopped. Also requeues jobs abandoned by a "
+        "stopped worker and purges expired uploads and old finished jobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.BACKGROUND_TASK_WORKERS,
+            help="Jobs run at once (default: settings.BACKGROUND_TASK_WORKERS).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait before checking an empty queue again.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of waiting for more.",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        name = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"Worker {name} running up to {workers} job(s) at once.")
+        statuses = {}
+        running = set()
+        next_housekeeping = 0
+        executor = (
+            _InlineExecutor()
+            if workers == 1
+            else _PoolExecutor(max_workers=workers, thread_name_prefix="medmat-worker")
+        )
+        with executor:
+            try:
+                while True:
+                    if time.monotonic() >= next_housekeeping:
+                        self._housekeeping()
+                        next_housekeeping = time.monotonic() + HOUSEKEEPING_INTERVAL
+                    job = None
+                    while len(running) < workers:
+                        job = claim_next_job(name)
+                        if job is None:
+                            break
+                        running.add(executor.submit(job))
+                    if not running:
+                        if options["once"]:
+                            break
+                        time.sleep(options["poll_interval"])
+                        continue
+                    done, running = wait(
+                        running,
+                        timeout=None if job is not None else options["poll_interval"],
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        try:
+                            status = future.result()
+                        except Exception as exc:  # Recording the outcome failed
+                            self.stderr.write(f"Job bookkeeping failed: {exc}")
+                            status = "unrecorded"
+                        statuses[status] = statuses.get(status, 0) + 1
+            except KeyboardInterrupt:
+                self.stdout.write("Stopping: finishing running jobs...")
+                wait(running)
+        summary = ", ".join(
+            f"{count} {status}" for status, count in sorted(statuses.items())
+        )
+        self.stdout.write(self.style.SUCCESS(f"Jobs: {summary or 'none run'}."))
+
+    def _housekeeping(self):
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(
+                self.style.WARNING(f"Recovered {requeued} abandoned job(s).")
+            )
+        purge_finished_jobs()
+        purge_expired_uploads()
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-16 22:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_api', '0002_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['batch', '-scheduled_date', '-id'], name='schedule_batch_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['presenter', '-scheduled_date', '-id'], name='schedule_presenter_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(fields=['batch', '-upload_date', '-id'], name='file_batch_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(fields=['uploader', '-upload_date', '-id'], name='file_uploader_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(fields=['discussion_type', '-upload_date', '-id'], name='file_dtype_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(fields=['schedule', '-upload_date', '-id'], name='file_schedule_date_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+FTS_TABLE = "core_api_uploadedfile_fts"
+
+
+def create_search_index(apps, schema_editor):
+    # SQLite only; PostgreSQL searches with to_tsvector, others fall back to
+    # icontains (see core_api.search).
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "original_filename, description, schedule_title, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+    except OperationalError:  # SQLite built without FTS5
+        return
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} "
+        "(rowid, original_filename, description, schedule_title) "
+        "SELECT f.id, f.original_filename, f.description, COALESCE(s.title, '') "
+        "FROM core_api_uploadedfile f "
+        "LEFT JOIN core_api_schedule s ON s.id = f.schedule_id"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core_api", "0003_list_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+FTS_TABLE = "core_api_uploadedfile_fts"
+FTS_OPTIONS = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
+
+def _rebuild_search_index(schema_editor, columns, select):
+    # FTS5 tables cannot gain columns; recreate and refill from the source rows.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    if FTS_TABLE not in schema_editor.connection.introspection.table_names():
+        return  # SQLite built without FTS5 (see 0004)
+    schema_editor.execute(f"DROP TABLE {FTS_TABLE}")
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({', '.join(columns)}, "
+        f"{FTS_OPTIONS})"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(columns)}) {select}"
+    )
+
+
+def add_content_column(apps, schema_editor):
+    _rebuild_search_index(
+        schema_editor,
+        ["original_filename", "description", "schedule_title", "content"],
+        "SELECT f.id, f.original_filename, f.description, COALESCE(s.title, ''), "
+        "COALESCE(t.text, '') FROM core_api_uploadedfile f "
+        "LEFT JOIN core_api_schedule s ON s.id = f.schedule_id "
+        "LEFT JOIN core_api_documenttext t "
+        "ON t.uploaded_file_id = f.id AND t.status = 'indexed'",
+    )
+
+
+def remove_content_column(apps, schema_editor):
+    _rebuild_search_index(
+        schema_editor,
+        ["original_filename", "description", "schedule_title"],
+        "SELECT f.id, f.original_filename, f.description, COALESCE(s.title, '') "
+        "FROM core_api_uploadedfile f "
+        "LEFT JOIN core_api_schedule s ON s.id = f.schedule_id",
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_api', '0004_uploadedfile_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentText',
+            fields=[
+                ('uploaded_file', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='document_text', serialize=False, to='core_api.uploadedfile')),
+                ('status', models.CharField(choices=[('indexed', 'Indexed'), ('unsupported', 'Unsupported'), ('failed', 'Failed')], max_length=20)),
+                ('text', models.TextField(blank=True)),
+                ('source_name', models.CharField(max_length=500)),
+                ('source_size', models.PositiveBigIntegerField(null=True)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(add_content_column, remove_content_column),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_api', '0006_uploadedfile_content_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilePreview',
+            fields=[
+                ('uploaded_file', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='preview', serialize=False, to='core_api.uploadedfile')),
+                ('status', models.CharField(choices=[('ready', 'Ready'), ('unavailable', 'Unavailable'), ('failed', 'Failed')], max_length=20)),
+                ('page_count', models.PositiveIntegerField(blank=True, null=True)),
+                ('source_sha256', models.CharField(max_length=64)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('generated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_api', '0008_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='schedule',
+            name='presenter',
+            field=models.ForeignKey(blank=True, limit_choices_to={'role__in': ['student']}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='presentations', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
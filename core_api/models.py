@@ -1,7 +1,14 @@
 from django.db import models
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.text import slugify
+import math
 import os
+import uuid
+
+from .storage import content_sha256
 
 
 # get_file_upload_path function remains the same
@@ -123,6 +130,65 @@ class DiscussionType(models.Model):
         ordering = ["name"]
 
 
+def _filter_any(queryset, conditions):
+    """
+    Rows of `queryset` matching any of `conditions`, as
+    pk IN (SELECT pk ... UNION SELECT pk ...). Each branch is a plain indexed
+    lookup, and unlike OR + DISTINCT the outer query (with its joins and
+    annotations) never has to be de-duplicated.
+    """
+    if len(conditions) == 1:
+        return queryset.filter(conditions[0])
+    manager = queryset.model._default_manager
+    branches = [
+        manager.filter(condition).order_by().values("pk") for condition in conditions
+    ]
+    return queryset.filter(pk__in=branches[0].union(*branches[1:]))
+
+
+class ScheduleQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """
+        Schedules `user` may see: everything for professors/admins, their batch
+        for batch leaders, and their batch plus schedules they present for students.
+        """
+        if user.is_staff:
+            if user.role == "batch_leader" and user.batch:
+                # Batch leader is already filtered to their batch for schedule management
+                return self.filter(batch=user.batch)
+            return self  # Admin/Professor
+        if user.role == "student":
+            conditions = [models.Q(presenter=user)]  # Schedules they present
+            if user.batch:
+                conditions.append(models.Q(batch=user.batch))  # Their batch
+            return _filter_any(self, conditions)
+        return self.none()
+
+    def with_submission_status(self):
+        """
+        Annotates submission_count and latest_submission_date via correlated
+        subqueries, so listing N schedules costs one query instead of N+1.
+        """
+        schedule_files = (
+            UploadedFile.objects.filter(schedule=models.OuterRef("pk"))
+            .order_by()
+            .values("schedule")
+        )
+        return self.annotate(
+            submission_count=Coalesce(
+                models.Subquery(
+                    schedule_files.annotate(count=models.Count("pk")).values("count")
+                ),
+                0,
+            ),
+            latest_submission_date=models.Subquery(
+                schedule_files.annotate(
+                    latest=models.Max("upload_date")
+                ).values("latest")
+            ),
+        )
+
+
 class Schedule(models.Model):
     batch = models.ForeignKey(Batch, on_delete=models.CASCADE, related_name="schedules")
     discussion_type = models.ForeignKey(
@@ -151,8 +217,13 @@ class Schedule(models.Model):
     )
     description = models.TextField(blank=True)
 
+    objects = ScheduleQuerySet.as_manager()
+
     @property
     def is_submission_uploaded(self):
+        # Use the with_submission_status() annotation when the queryset has it
+        if hasattr(self, "submission_count"):
+            return self.submission_count > 0
         return self.files.exists()
 
     def __str__(self):
@@ -160,6 +231,39 @@ class Schedule(models.Model):
 
     class Meta:
         ordering = ["-scheduled_date", "title"]
+        # Match the list access paths (ScheduleQuerySet.visible_to + date order);
+        # the trailing -id is the cursor pagination tiebreaker.
+        indexes = [
+            models.Index(
+                fields=["batch", "-scheduled_date", "-id"],
+                name="schedule_batch_date_idx",
+            ),
+            models.Index(
+                fields=["presenter", "-scheduled_date", "-id"],
+                name="schedule_presenter_date_idx",
+            ),
+        ]
+
+
+class UploadedFileQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """
+        Files `user` may list or read: everything for professors/admins, their
+        batch for batch leaders, and their batch plus their own uploads for
+        students. Mirrors FileObjectPermissions for safe methods.
+        """
+        if user.is_staff:
+            if user.role == "batch_leader" and user.batch:
+                return self.filter(batch=user.batch)
+            return self  # Admin/Professor see all (potentially filtered by params)
+        if user.role == "student":
+            conditions = [models.Q(uploader=user)]  # Always see their own uploads
+            if user.batch:
+                conditions.append(
+                    models.Q(batch=user.batch)
+                )  # And files in their current batch
+            return _filter_any(self, conditions)
+        return self.none()  # Should not be reached
 
 
 class UploadedFile(models.Model):
@@ -184,10 +288,21 @@ class UploadedFile(models.Model):
         blank=True,
         help_text="User provided description or topic for general files",
     )
+    # Identify the stored content, so an identical file can be linked instead
+    # of uploaded again (see UploadedFileViewSet.from_digest).
+    content_sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    size = models.PositiveBigIntegerField(null=True, blank=True)
+
+    objects = UploadedFileQuerySet.as_manager()
 
     def save(self, *args, **kwargs):
         if not self.pk and self.file:
             self.original_filename = self.file.name
+        if self.file and not self.file._committed:
+            content = self.file.file
+            self.content_sha256 = content_sha256(content)
+            content.sha256 = self.content_sha256  # The storage backend reuses it
+            self.size = content.size
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -201,3 +316,183 @@ class UploadedFile(models.Model):
 
     class Meta:
         ordering = ["-upload_date", "original_filename"]
+        # Match the list access paths (UploadedFileQuerySet.visible_to, the
+        # batch / discussion type / schedule / uploader filters, newest first);
+        # the trailing -id is the cursor pagination tiebreaker.
+        indexes = [
+            models.Index(
+                fields=["batch", "-upload_date", "-id"], name="file_batch_date_idx"
+            ),
+            models.Index(
+                fields=["uploader", "-upload_date", "-id"],
+                name="file_uploader_date_idx",
+            ),
+            models.Index(
+                fields=["discussion_type", "-upload_date", "-id"],
+                name="file_dtype_date_idx",
+            ),
+            models.Index(
+                fields=["schedule", "-upload_date", "-id"],
+                name="file_schedule_date_idx",
+            ),
+        ]
+
+
+class ChunkedUpload(models.Model):
+    """
+    An in-progress resumable upload. Chunks are written at their offset into a
+    single `.part` file under settings.CHUNKED_UPLOAD_DIR; on completion that file
+    becomes the UploadedFile's content. Rows past `expires_at` are purged by the
+    `purge_expired_uploads` management command.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    uploader = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="chunked_uploads"
+    )
+    batch = models.ForeignKey(
+        Batch, on_delete=models.CASCADE, related_name="chunked_uploads"
+    )
+    discussion_type = models.ForeignKey(
+        DiscussionType, on_delete=models.CASCADE, related_name="chunked_uploads"
+    )
+    schedule = models.ForeignKey(
+        Schedule,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="chunked_uploads",
+    )
+    description = models.CharField(max_length=255, blank=True)
+    original_filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    received_chunks = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    @property
+    def chunk_count(self):
+        return max(1, math.ceil(self.total_size / self.chunk_size))
+
+    @property
+    def missing_chunk_count(self):
+        return self.chunk_count - len(set(self.received_chunks))
+
+    @property
+    def missing_chunks(self):
+        # Filled in from the gaps between received indexes rather than by
+        # testing every index in range(chunk_count).
+        missing, start = [], 0
+        for index in sorted(set(self.received_chunks)) + [self.chunk_count]:
+            missing.extend(range(start, index))
+            start = index + 1
+        return missing
+
+    @property
+    def part_path(self):
+        return os.path.join(settings.CHUNKED_UPLOAD_DIR, f"{self.pk}.part")
+
+    def expected_chunk_length(self, index):
+        if index == self.chunk_count - 1:
+            return self.total_size - index * self.chunk_size
+        return self.chunk_size
+
+    def __str__(self):
+        return f"{self.original_filename} ({len(self.received_chunks)}/{self.chunk_count})"
+
+    class Meta:
+        ordering = ["-created_at"]
+
+
+class DocumentText(models.Model):
+    """
+    Plain text extracted from an UploadedFile for content search (see
+    core_api.extraction). `source_name` and `source_size` record which stored
+    file the text came from, so unchanged files are not parsed again.
+    """
+
+    STATUS_CHOICES = [
+        ("indexed", "Indexed"),
+        ("unsupported", "Unsupported"),
+        ("failed", "Failed"),
+    ]
+    uploaded_file = models.OneToOneField(
+        UploadedFile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="document_text",
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    text = models.TextField(blank=True)
+    source_name = models.CharField(max_length=500)
+    source_size = models.PositiveBigIntegerField(null=True)
+    error = models.CharField(max_length=255, blank=True)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.uploaded_file_id}: {self.status}"
+
+
+class FilePreview(models.Model):
+    """
+    First-page preview and page count for an UploadedFile (see
+    core_api.previews). The image lives in settings.PREVIEW_CACHE_DIR, keyed by
+    `source_sha256`; it may be evicted and is then regenerated on request.
+    """
+
+    STATUS_CHOICES = [
+        ("ready", "Ready"),
+        ("unavailable", "Unavailable"),
+        ("failed", "Failed"),
+    ]
+    uploaded_file = models.OneToOneField(
+        UploadedFile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="preview",
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    source_sha256 = models.CharField(max_length=64)
+    error = models.CharField(max_length=255, blank=True)
+    generated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.uploaded_file_id}: {self.status}"
+
+
+class BackgroundJob(models.Model):
+    """
+    A queued call to a function registered with core_api.background.task,
+    run by `python manage.py run_worker`. Failed attempts are retried with
+    back-off until `max_attempts`; the row stays behind as the job's status.
+    """
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    ]
+    task = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    worker = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The worker's poll: due jobs in order
+            models.Index(fields=["status", "run_after"], name="job_status_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk}: {self.status}"
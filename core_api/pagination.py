@@ -0,0 +1,31 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OptInCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination that only kicks in when the client asks for it.
+
+    Requests without a `cursor` or `page_size` query parameter keep getting the
+    plain, unpaginated list the frontend has always consumed. Subclasses set
+    `ordering`; the trailing "-id" keeps rows that share a date in a stable order.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    def get_page_size(self, request):
+        if (
+            self.cursor_query_param not in request.query_params
+            and self.page_size_query_param not in request.query_params
+        ):
+            return None  # Not requested: return the full list as before
+        return super().get_page_size(request)
+
+
+class UploadedFileCursorPagination(OptInCursorPagination):
+    ordering = ("-upload_date", "-id")
+
+
+class ScheduleCursorPagination(OptInCursorPagination):
+    ordering = ("-scheduled_date", "-id")
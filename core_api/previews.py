@@ -0,0 +1,229 @@
+import io
+import logging
+import os
+import re
+import tempfile
+import zipfile
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response
+from PIL import Image
+from rest_framework import status
+from rest_framework.response import Response
+
+from .background import enqueue, task
+from .extraction import pypdf
+from .models import FilePreview, UploadedFile
+from .storage import content_sha256
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_VERSION = 1  # Bump when the rendering changes; old previews stop matching
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tif", ".tiff"}
+APP_PROPS_NS = (
+    "{http://schemas.openxmlformats.org/officeDocument/2006/extended-properties}"
+)
+OOXML_THUMBNAILS = (
+    "docProps/thumbnail.jpeg",
+    "docProps/thumbnail.jpg",
+    "docProps/thumbnail.png",
+)
+SLIDE_RE = re.compile(r"ppt/slides/slide\d+\.xml")
+
+
+def preview_path(digest):
+    return os.path.join(
+        settings.PREVIEW_CACHE_DIR, digest[:2], f"{digest}-v{PREVIEW_VERSION}.jpg"
+    )
+
+
+def _ooxml_source(stream, extension):
+    """
+    Office files carry a first-page thumbnail in docProps when saved with
+    one (PowerPoint does by default); page counts come from the slide parts
+    or docProps/app.xml.
+    """
+    archive = zipfile.ZipFile(stream)
+    names = set(archive.namelist())
+    page_count = None
+    if extension == ".pptx":
+        page_count = sum(1 for name in names if SLIDE_RE.fullmatch(name)) or None
+    elif "docProps/app.xml" in names:
+        pages = ElementTree.fromstring(archive.read("docProps/app.xml")).findtext(
+            f"{APP_PROPS_NS}Pages", ""
+        )
+        page_count = int(pages) if pages.isdigit() else None
+    for name in OOXML_THUMBNAILS:
+        if name in names:
+            return Image.open(io.BytesIO(archive.read(name))), page_count
+    return None, page_count
+
+
+def _pdf_source(stream):
+    """
+    Pillow cannot rasterise PDF pages, so the preview is the largest picture
+    on page one: the whole page for scans and slide exports.
+    """
+    if pypdf is None:
+        return None, None
+    reader = pypdf.PdfReader(stream)
+    if not reader.pages:
+        return None, 0
+    pictures = [picture.image for picture in reader.pages[0].images]
+    image = max(pictures, key=lambda im: im.width * im.height, default=None)
+    return image, len(reader.pages)
+
+
+def _render(image, path):
+    image.thumbnail(settings.PREVIEW_SIZE)
+    if image.mode not in ("RGB", "L"):
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image.convert("RGBA"), mask=image.convert("RGBA"))
+        image = background
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, staged = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            image.save(out, "JPEG", quality=80, optimize=True)
+        os.replace(staged, path)
+    except BaseException:
+        os.remove(staged)
+        raise
+
+
+def prune_preview_cache():
+    """
+    Evicts the least recently served previews until the cache fits in
+    settings.PREVIEW_CACHE_MAX_BYTES (serving a preview touches its mtime).
+    Returns the number of files removed.
+    """
+    entries, total = [], 0
+    for dirpath, _dirnames, filenames in os.walk(settings.PREVIEW_CACHE_DIR):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+    removed = 0
+    for _mtime, size, path in sorted(entries):
+        if total <= settings.PREVIEW_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+@task
+def generate_preview(file_id, force=False):
+    """
+    Renders the first-page preview of UploadedFile `file_id` into the cache
+    and records its page count. Skipped when a preview for the same content
+    is already recorded and, if ready, still cached, unless `force`. Files
+    sharing content reuse one cached image. Returns the FilePreview, or None
+    if the upload no longer exists.
+    """
+    uploaded = UploadedFile.objects.filter(pk=file_id).first()
+    if uploaded is None or not uploaded.file:
+        return None
+    try:
+        digest = uploaded.content_sha256 or content_sha256(uploaded.file)
+    except FileNotFoundError:
+        digest = ""
+    path = preview_path(digest) if digest else None
+    existing = FilePreview.objects.filter(pk=file_id).first()
+    if (
+        existing is not None
+        and not force
+        and existing.source_sha256 == digest
+        and (existing.status != "ready" or os.path.exists(path))
+    ):
+        return existing
+
+    fields = {"source_sha256": digest, "page_count": None, "error": ""}
+    shared = (
+        FilePreview.objects.filter(source_sha256=digest, status="ready")
+        .exclude(pk=file_id)
+        .first()
+        if digest and not force
+        else None
+    )
+    extension = os.path.splitext(uploaded.file.name)[1].lower()
+    if not digest:
+        fields.update(status="failed", error="Stored file is missing.")
+    elif shared is not None and os.path.exists(path):
+        fields.update(status="ready", page_count=shared.page_count)
+    elif uploaded.size and uploaded.size > settings.PREVIEW_MAX_SOURCE_SIZE:
+        fields.update(status="unavailable", error="File is too large to preview.")
+    elif extension not in IMAGE_EXTENSIONS | {".pdf", ".pptx", ".docx"}:
+        fields.update(status="unavailable", error="No preview for this file type.")
+    else:
+        try:
+            with uploaded.file.open("rb") as stream:
+                if extension in IMAGE_EXTENSIONS:
+                    image, page_count = Image.open(stream), 1
+                    image.load()
+                elif extension == ".pdf":
+                    image, page_count = _pdf_source(stream)
+                else:
+                    image, page_count = _ooxml_source(stream, extension)
+                fields["page_count"] = page_count
+                if image is None:
+                    fields.update(
+                        status="unavailable", error="File has no preview image."
+                    )
+                else:
+                    _render(image, path)
+                    fields["status"] = "ready"
+        except Exception as exc:  # Corrupt or unreadable documents
+            logger.warning("Preview failed for file %s: %s", file_id, exc)
+            fields.update(status="failed", error=str(exc)[:255] or type(exc).__name__)
+
+    try:
+        with transaction.atomic():
+            preview, _ = FilePreview.objects.update_or_create(
+                uploaded_file_id=file_id, defaults=fields
+            )
+    except IntegrityError:  # Upload deleted while we were rendering it
+        return None
+    if fields["status"] == "ready":
+        prune_preview_cache()
+    return preview
+
+
+def preview_response(request, uploaded_file):
+    """
+    The cached preview JPEG with a strong ETag over the content digest, so
+    browsers revalidate to a 304. An evicted preview is regenerated in the
+    background and answered with 404 meanwhile.
+    """
+    preview = FilePreview.objects.filter(pk=uploaded_file.pk, status="ready").first()
+    if preview is None:
+        return Response(
+            {"detail": "No preview for this file."}, status=status.HTTP_404_NOT_FOUND
+        )
+    etag = f'"{preview.source_sha256}-v{PREVIEW_VERSION}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        path = preview_path(preview.source_sha256)
+        try:
+            response = FileResponse(open(path, "rb"), content_type="image/jpeg")
+        except FileNotFoundError:
+            enqueue(generate_preview, uploaded_file.pk)
+            return Response(
+                {"detail": "Preview is being regenerated; try again shortly."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        os.utime(path)  # Recently served: evicted last
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, max-age=86400"
+    return response
@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+from django.db.models import Count, Exists, OuterRef, Q
+
+from .models import Schedule, UploadedFile
+
+
+def _status_counts(today):
+    """
+    Aggregates splitting schedules into three disjoint buckets:
+    submitted (at least one linked file), pending (nothing yet, date not
+    passed) and overdue (nothing yet, date passed).
+    """
+    return {
+        "total": Count("pk"),
+        "submitted": Count("pk", filter=Q(has_submission=True)),
+        "pending": Count(
+            "pk", filter=Q(has_submission=False, scheduled_date__gte=today)
+        ),
+        "overdue": Count(
+            "pk", filter=Q(has_submission=False, scheduled_date__lt=today)
+        ),
+    }
+
+
+def with_has_submission(schedules):
+    return schedules.annotate(
+        has_submission=Exists(UploadedFile.objects.filter(schedule=OuterRef("pk")))
+    )
+
+
+def _grouped(schedules, today, id_field, name_field, name_key):
+    rows = (
+        schedules.values(id_field, name_field)
+        .annotate(**_status_counts(today))
+        .order_by(name_field)
+    )
+    return [
+        {id_field: row.pop(id_field), name_key: row.pop(name_field), **row}
+        for row in rows
+    ]
+
+
+def verification_report(schedules, today):
+    """
+    Submission counts for an already role-scoped Schedule queryset, overall
+    and grouped by batch, discussion type and presenter. Each breakdown is a
+    single GROUP BY query; nothing is materialised per schedule.
+    """
+    schedules = with_has_submission(schedules.order_by())
+    return {
+        "totals": schedules.aggregate(**_status_counts(today)),
+        "by_batch": _grouped(
+            schedules, today, "batch", "batch__name", "batch_name"
+        ),
+        "by_discussion_type": _grouped(
+            schedules,
+            today,
+            "discussion_type",
+            "discussion_type__name",
+            "discussion_type_name",
+        ),
+        "by_presenter": _grouped(
+            schedules, today, "presenter", "presenter__username", "presenter_username"
+        ),
+    }
+
+
+def missing_submissions(schedules):
+    return (
+        with_has_submission(schedules)
+        .filter(has_submission=False)
+        .select_related("batch", "discussion_type", "presenter")
+        .order_by("scheduled_date", "title")
+    )
+
+
+def dashboard_summary(user, today, limit):
+    """
+    Everything DashboardPage shows, as querysets/aggregates over the user's
+    role-scoped data. Students get the schedules they present and their own
+    uploads; staff get everything visible to them. Always five queries.
+    """
+    schedules = Schedule.objects.visible_to(user)
+    uploads = UploadedFile.objects.visible_to(user)
+    if user.role == "student":
+        schedules = schedules.filter(presenter=user)
+        uploads = uploads.filter(uploader=user)
+
+    month_end = (today.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(
+        days=1
+    )
+    with_status = with_has_submission(schedules.order_by())
+    counts = with_status.aggregate(
+        **_status_counts(today),
+        upcoming_this_month=Count(
+            "pk", filter=Q(scheduled_date__gte=today, scheduled_date__lte=month_end)
+        ),
+    )
+    by_batch = []
+    if user.is_staff:
+        by_batch = _grouped(
+            with_status.filter(batch__is_active=True),
+            today,
+            "batch",
+            "batch__name",
+            "batch_name",
+        )
+
+    return {
+        "counts": counts,
+        "by_batch": by_batch,
+        "upcoming_schedules": schedules.filter(scheduled_date__gte=today)
+        .select_related("batch", "discussion_type", "presenter", "created_by")
+        .with_submission_status()
+        .order_by("scheduled_date", "title")[:limit],
+        "recent_uploads": uploads.select_related(
+            "uploader", "batch", "discussion_type", "schedule"
+        ).order_by("-upload_date")[:limit],
+        "pending_submissions": missing_submissions(schedules)[:limit],
+    }
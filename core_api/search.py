@@ -0,0 +1,148 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import DocumentText, UploadedFile
+
+# SQLite FTS5 index over UploadedFile (rowid = UploadedFile.id); created by
+# migration 0004 when the SQLite build has FTS5, kept in sync by core_api.signals.
+FTS_TABLE = "core_api_uploadedfile_fts"
+# bm25 column weights: original_filename, description, schedule_title, content
+FTS_WEIGHTS = "10.0, 5.0, 5.0, 1.0"
+MAX_TERMS = 8
+TERM_RE = re.compile(r"\w+")
+
+_fts_tables = {}
+
+
+def search_terms(query):
+    return TERM_RE.findall(query or "")[:MAX_TERMS]
+
+
+def _has_fts(connection):
+    key = (connection.alias, str(connection.settings_dict["NAME"]))
+    if key not in _fts_tables:
+        _fts_tables[key] = (
+            connection.vendor == "sqlite"
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_tables[key]
+
+
+def search_uploaded_files(queryset, query):
+    """
+    Narrows an (already role-scoped) UploadedFile queryset to rows whose
+    filename, description, schedule title or extracted text contain every
+    term of `query` as a word prefix, best matches first. Uses the FTS5 index
+    on SQLite, full-text search on PostgreSQL, and unranked icontains anywhere
+    else.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    connection = connections[queryset.db]
+
+    if _has_fts(connection):
+        match = " ".join(f'"{term}"*' for term in terms)
+        table = UploadedFile._meta.db_table
+        return (
+            queryset.filter(
+                pk__in=RawSQL(
+                    f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                    [match],
+                )
+            )
+            .annotate(
+                search_rank=RawSQL(
+                    f"SELECT bm25({FTS_TABLE}, {FTS_WEIGHTS}) FROM {FTS_TABLE} "
+                    f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+                    [match],
+                )
+            )
+            .order_by("search_rank", "-upload_date")  # bm25: lower is better
+        )
+
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+        )
+
+        vector = (
+            SearchVector("original_filename", weight="A", config="simple")
+            + SearchVector("description", weight="B", config="simple")
+            + SearchVector("schedule__title", weight="B", config="simple")
+            + SearchVector("document_text__text", weight="D", config="simple")
+        )
+        tsquery = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            search_type="raw",
+            config="simple",
+        )
+        return (
+            queryset.annotate(search_vector=vector)
+            .filter(search_vector=tsquery)
+            .annotate(search_rank=SearchRank(vector, tsquery))
+            .order_by("-search_rank", "-upload_date")
+        )
+
+    condition = Q()
+    for term in terms:
+        condition &= (
+            Q(original_filename__icontains=term)
+            | Q(description__icontains=term)
+            | Q(schedule__title__icontains=term)
+            | Q(document_text__text__icontains=term)
+        )
+    return queryset.filter(condition).order_by("-upload_date")
+
+
+def index_uploaded_file(uploaded_file, using="default"):
+    connection = connections[using]
+    if not _has_fts(connection):
+        return
+    schedule_title = uploaded_file.schedule.title if uploaded_file.schedule_id else ""
+    content = (
+        DocumentText.objects.using(using)
+        .filter(pk=uploaded_file.pk, status="indexed")
+        .values_list("text", flat=True)
+        .first()
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [uploaded_file.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} "
+            "(rowid, original_filename, description, schedule_title, content) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            [
+                uploaded_file.pk,
+                uploaded_file.original_filename,
+                uploaded_file.description,
+                schedule_title,
+                content or "",
+            ],
+        )
+
+
+def unindex_uploaded_file(pk, using="default"):
+    connection = connections[using]
+    if not _has_fts(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def index_schedule_title(schedule_pk, title, using="default"):
+    """Updates the schedule title indexed for every file linked to the schedule."""
+    connection = connections[using]
+    if not _has_fts(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {FTS_TABLE} SET schedule_title = %s WHERE rowid IN "
+            f"(SELECT id FROM {UploadedFile._meta.db_table} WHERE schedule_id = %s)",
+            [title, schedule_pk],
+        )
@@ -1,10 +1,70 @@
 # core_api/serializers.py
+from django.conf import settings
 from rest_framework import serializers
-from .models import User, Batch, DiscussionType, Schedule, UploadedFile
+from .models import (
+    User,
+    Batch,
+    DiscussionType,
+    Schedule,
+    UploadedFile,
+    ChunkedUpload,
+)
 
 # from django.contrib.auth.hashers import make_password # Not used for user creation via API
 
 
+def sparse_field_names(request, serializer_class):
+    """
+    The Meta.fields of `serializer_class` kept by ?fields=a,b or ?omit=a,b on
+    a GET request, or None when neither is given. Unknown names are ignored;
+    "id" is always kept.
+    """
+    if request is None or request.method != "GET":
+        return None
+    params = request.query_params
+    available = set(serializer_class.Meta.fields)
+    if params.get("fields"):
+        wanted = {name.strip() for name in params["fields"].split(",")}
+        return (available & wanted) | {"id"}
+    if params.get("omit"):
+        unwanted = {name.strip() for name in params["omit"].split(",")}
+        return (available - unwanted) | {"id"}
+    return None
+
+
+class SparseFieldsMixin:
+    """
+    Lets readers trim the output with ?fields= / ?omit= (see
+    sparse_field_names). `field_sources` maps a serializer field to the model
+    paths it reads; unlisted fields read the model field of the same name, and
+    () means nothing from the row itself (annotations, method fields).
+    """
+
+    field_sources = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        wanted = sparse_field_names(self.context.get("request"), type(self))
+        if wanted is not None:
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+    @classmethod
+    def trim_queryset(cls, queryset, field_names, always=()):
+        """
+        Restricts `queryset` to the joins and columns `field_names` read, plus
+        `always` (e.g. ordering columns) and the primary key.
+        """
+        paths = {"id", *always}
+        for name in field_names:
+            paths.update(cls.field_sources.get(name, (name,)))
+        relations = {path.rsplit("__", 1)[0] for path in paths if "__" in path}
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*paths)
+
+
 class SimpleUserSerializer(serializers.ModelSerializer):
     batch_id = serializers.IntegerField(
         source="batch.id", read_only=True, allow_null=True
@@ -58,7 +118,7 @@ class DiscussionTypeSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class ScheduleSerializer(serializers.ModelSerializer):
+class ScheduleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     batch_name = serializers.CharField(source="batch.name", read_only=True)
     discussion_type_name = serializers.CharField(
         source="discussion_type.name", read_only=True
@@ -74,6 +134,25 @@ class ScheduleSerializer(serializers.ModelSerializer):
     is_submission_uploaded = serializers.BooleanField(
         read_only=True
     )  # From model property
+    # Both come from Schedule.objects.with_submission_status() on list/detail reads
+    submission_count = serializers.SerializerMethodField()
+    latest_submission_date = serializers.SerializerMethodField()
+
+    field_sources = {
+        "batch_name": ("batch__name",),
+        "discussion_type_name": ("discussion_type__name",),
+        "presenter_username": ("presenter__username",),
+        "created_by_username": ("created_by__username",),
+        "is_submission_uploaded": (),
+        "submission_count": (),
+        "latest_submission_date": (),
+    }
+    # Need Schedule.objects.with_submission_status() to avoid a query per row
+    annotated_fields = {
+        "is_submission_uploaded",
+        "submission_count",
+        "latest_submission_date",
+    }
 
     class Meta:
         model = Schedule
@@ -92,10 +171,59 @@ class ScheduleSerializer(serializers.ModelSerializer):
             "created_by_username",
             "description",
             "is_submission_uploaded",
+            "submission_count",
+            "latest_submission_date",
         ]
 
+    def get_submission_count(self, obj):
+        if hasattr(obj, "submission_count"):
+            return obj.submission_count
+        return obj.files.count()  # Not annotated, e.g. right after create/update
+
+    def get_latest_submission_date(self, obj):
+        if hasattr(obj, "latest_submission_date"):
+            latest = obj.latest_submission_date
+        else:
+            latest = (
+                obj.files.order_by("-upload_date")
+                .values_list("upload_date", flat=True)
+                .first()
+            )
+        return serializers.DateTimeField().to_representation(latest) if latest else None
+
+
+class MissingSubmissionSerializer(serializers.ModelSerializer):
+    """A schedule with no uploaded file yet, for the verification report."""
+
+    batch_name = serializers.CharField(source="batch.name", read_only=True)
+    discussion_type_name = serializers.CharField(
+        source="discussion_type.name", read_only=True
+    )
+    presenter_username = serializers.CharField(
+        source="presenter.username", read_only=True, allow_null=True
+    )
+    is_overdue = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Schedule
+        fields = [
+            "id",
+            "batch",
+            "batch_name",
+            "discussion_type",
+            "discussion_type_name",
+            "title",
+            "presenter",
+            "presenter_username",
+            "scheduled_date",
+            "is_overdue",
+        ]
+
+    def get_is_overdue(self, obj):
+        return obj.scheduled_date < self.context["today"]
+
 
-class UploadedFileSerializer(serializers.ModelSerializer):
+class UploadedFileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     uploader_username = serializers.CharField(
         source="uploader.username", read_only=True
     )
@@ -108,6 +236,20 @@ class UploadedFileSerializer(serializers.ModelSerializer):
         source="schedule.title", read_only=True, allow_null=True
     )
     file_url = serializers.URLField(source="file.url", read_only=True)
+    page_count = serializers.IntegerField(
+        source="preview.page_count", read_only=True, allow_null=True
+    )
+    has_preview = serializers.SerializerMethodField()
+
+    field_sources = {
+        "uploader_username": ("uploader__username",),
+        "batch_name": ("batch__name",),
+        "discussion_type_name": ("discussion_type__name",),
+        "schedule_title": ("schedule__title",),
+        "file_url": ("file",),
+        "page_count": ("preview__page_count",),
+        "has_preview": ("preview__status",),
+    }
 
     class Meta:
         model = UploadedFile
@@ -127,6 +269,8 @@ class UploadedFileSerializer(serializers.ModelSerializer):
             "original_filename",
             "upload_date",
             "description",
+            "page_count",
+            "has_preview",
         ]
         read_only_fields = [
             "uploader",
@@ -139,6 +283,74 @@ class UploadedFileSerializer(serializers.ModelSerializer):
             "upload_date",
         ]
 
+    def get_has_preview(self, obj):
+        preview = getattr(obj, "preview", None)
+        return preview is not None and preview.status == "ready"
+
     def create(self, validated_data):
         # uploader set in view, original_filename in model
         return super().create(validated_data)
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    total_size = serializers.IntegerField(min_value=1)
+    chunk_count = serializers.IntegerField(read_only=True)
+    missing_chunks = serializers.ListField(
+        child=serializers.IntegerField(), read_only=True
+    )
+
+    class Meta:
+        model = ChunkedUpload
+        fields = [
+            "id",
+            "batch",
+            "discussion_type",
+            "schedule",
+            "description",
+            "original_filename",
+            "total_size",
+            "chunk_size",
+            "chunk_count",
+            "received_chunks",
+            "missing_chunks",
+            "created_at",
+            "expires_at",
+        ]
+        read_only_fields = [
+            "chunk_size",
+            "received_chunks",
+            "created_at",
+            "expires_at",
+        ]
+
+    def validate_total_size(self, value):
+        if value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Uploads are limited to {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes."
+            )
+        return value
+
+
+class DigestUploadSerializer(serializers.ModelSerializer):
+    """
+    Upload fields plus the SHA-256 and size of content the client expects the
+    server to hold already (POST /api/files/from-digest/).
+    """
+
+    content_sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$")
+    size = serializers.IntegerField(min_value=0)
+
+    class Meta:
+        model = UploadedFile
+        fields = [
+            "batch",
+            "discussion_type",
+            "schedule",
+            "description",
+            "original_filename",
+            "content_sha256",
+            "size",
+        ]
+
+    def validate_content_sha256(self, value):
+        return value.lower()
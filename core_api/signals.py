@@ -0,0 +1,109 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import forget_tokens, forget_user_tokens
+from .background import enqueue
+from .caching import (
+    BATCH_LIST_CACHE_KEY,
+    DISCUSSION_TYPE_LIST_CACHE_KEY,
+    USERNAME_LIST_CACHE_KEY,
+    forget_cached_list,
+)
+from .cleanup import delete_files_on_commit
+from .extraction import extract_document_text
+from .models import Batch, DiscussionType, Schedule, UploadedFile, User
+from .previews import generate_preview
+from .search import index_schedule_title, index_uploaded_file, unindex_uploaded_file
+
+
+@receiver(post_save, sender=User)
+def forget_saved_user(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which neither cache holds.
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    forget_user_tokens([instance.pk])
+    forget_cached_list(USERNAME_LIST_CACHE_KEY)
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user(sender, **kwargs):
+    forget_cached_list(USERNAME_LIST_CACHE_KEY)
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    # Also runs for tokens cascade-deleted with their user.
+    forget_tokens([instance.key])
+
+
+@receiver(post_save, sender=Batch)
+@receiver(pre_delete, sender=Batch)  # Before SET_NULL clears members' batch
+def forget_batch_member_tokens(sender, instance, **kwargs):
+    forget_user_tokens(instance.members.values("pk"))
+
+
+@receiver(post_save, sender=Batch)
+@receiver(post_delete, sender=Batch)
+def forget_batch_list(sender, **kwargs):
+    forget_cached_list(BATCH_LIST_CACHE_KEY)
+
+
+@receiver(post_delete, sender=Batch)
+def forget_usernames_of_deleted_batch(sender, **kwargs):
+    # SET_NULL clears members' batch_id with a bulk update: no User signals.
+    forget_cached_list(USERNAME_LIST_CACHE_KEY)
+
+
+@receiver(post_save, sender=DiscussionType)
+@receiver(post_delete, sender=DiscussionType)
+def forget_discussion_type_list(sender, **kwargs):
+    forget_cached_list(DISCUSSION_TYPE_LIST_CACHE_KEY)
+
+
+@receiver(post_save, sender=UploadedFile)
+def index_saved_file(sender, instance, using, **kwargs):
+    index_uploaded_file(instance, using)
+    enqueue(extract_document_text, instance.pk)
+    enqueue(generate_preview, instance.pk)
+
+
+@receiver(post_delete, sender=UploadedFile)
+def unindex_deleted_file(sender, instance, using, **kwargs):
+    unindex_uploaded_file(instance.pk, using)
+
+
+@receiver(pre_save, sender=UploadedFile)
+def remember_replaced_file(sender, instance, using, raw=False, **kwargs):
+    # Only new content can replace the stored file; other edits skip the query.
+    if raw or instance.pk is None or not instance.file or instance.file._committed:
+        return
+    instance._replaced_file_name = (
+        sender.objects.using(using)
+        .filter(pk=instance.pk)
+        .values_list("file", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=UploadedFile)
+def delete_replaced_file(sender, instance, using, **kwargs):
+    replaced = instance.__dict__.pop("_replaced_file_name", None)
+    if replaced and replaced != instance.file.name:
+        delete_files_on_commit([replaced], using)
+
+
+@receiver(post_delete, sender=UploadedFile)
+def delete_file_of_deleted_upload(sender, instance, using, **kwargs):
+    if instance.file:
+        delete_files_on_commit([instance.file.name], using)
+
+
+@receiver(post_save, sender=Schedule)
+def index_saved_schedule_title(sender, instance, using, **kwargs):
+    index_schedule_title(instance.pk, instance.title, using)
+
+
+@receiver(pre_delete, sender=Schedule)  # Before SET_NULL unlinks its files
+def unindex_deleted_schedule_title(sender, instance, using, **kwargs):
+    index_schedule_title(instance.pk, "", using)
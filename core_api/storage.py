@@ -0,0 +1,165 @@
+import hashlib
+import os
+import shutil
+import threading
+
+from django.core.files.storage import FileSystemStorage
+
+BLOB_DIR = ".blobs"
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# Serialises blob creation/removal against linking between the threads of one
+# process (waitress serves requests from many). The worker and reconcile_media
+# remove blobs from other processes, so _save() also copes with a blob that
+# disappears before it is linked.
+_blob_lock = threading.Lock()
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while data := fh.read(HASH_BUFFER_SIZE):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def content_sha256(content):
+    """
+    SHA-256 of a File being saved: taken from the upload handler when it
+    hashed the upload while streaming it (see MediaTempFileUploadHandler),
+    otherwise by reading the content once.
+    """
+    digest = getattr(content, "sha256", None)
+    if digest:
+        return digest
+    if hasattr(content, "temporary_file_path"):
+        return file_sha256(content.temporary_file_path())
+    hasher = hashlib.sha256()
+    for chunk in content.chunks():
+        hasher.update(chunk if isinstance(chunk, bytes) else chunk.encode())
+    return hasher.hexdigest()
+
+
+def _link_or_copy(source, destination):
+    try:
+        os.link(source, destination)
+    except (FileExistsError, FileNotFoundError):
+        raise
+    except OSError:  # No hard links on this filesystem, or link limit reached
+        with open(source, "rb") as src, open(destination, "xb") as dst:
+            shutil.copyfileobj(src, dst, HASH_BUFFER_SIZE)
+
+
+class DedupFileSystemStorage(FileSystemStorage):
+    """
+    FileSystemStorage that stores each distinct file once. The content lives
+    in MEDIA_ROOT/.blobs/<aa>/<bb>/<sha256>, and every saved name is a hard
+    link to that blob, so paths under MEDIA_ROOT, downloads and
+    X-Accel-Redirect work as before. A duplicate upload only adds a link.
+
+    A blob is in use while another name links to it (its link count) or an
+    UploadedFile row records its digest, which also covers names that had to
+    be copies: where a hard link cannot be made (filesystem without them, link
+    limit reached) the name gets its own copy. Deleting the last name using a
+    blob removes the blob too.
+    """
+
+    def blob_name(self, digest):
+        return "/".join((BLOB_DIR, digest[:2], digest[2:4], digest))
+
+    def _save(self, name, content):
+        digest = content_sha256(content)
+        blob_name = self.blob_name(digest)
+        with _blob_lock:
+            wrote_blob = False
+            while True:
+                if not self.exists(blob_name):
+                    saved = super()._save(blob_name, content)
+                    if saved != blob_name:  # Another process created it meanwhile
+                        super().delete(saved)
+                    wrote_blob = True
+                try:
+                    return self._link(self.path(blob_name), name)
+                except FileNotFoundError:
+                    # Removed as unused by another process since we checked.
+                    # Write it again from the content, unless that was moved
+                    # into the blob and is gone with it.
+                    if wrote_blob:
+                        raise
+
+    def _link(self, blob_path, name):
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        while True:
+            try:
+                _link_or_copy(blob_path, full_path)
+            except FileExistsError:
+                name = self.get_available_name(name)
+                full_path = self.path(name)
+            else:
+                break
+        name = os.path.relpath(full_path, self.location)
+        return str(name).replace("\\", "/")
+
+    def delete(self, name):
+        if not name:
+            raise ValueError("The name must be given to delete().")
+        path = self.path(name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return
+        digest = None
+        # With more than two links, other names still share the blob. Hashing
+        # happens outside _blob_lock so a large file does not stall uploads.
+        if stat.st_nlink <= 2 and not os.path.isdir(path):
+            digest = file_sha256(path)
+        super().delete(name)
+        if digest is not None and not self._digest_recorded(digest):
+            self.delete_unused_blob(digest)
+
+    def _digest_recorded(self, digest):
+        from .models import UploadedFile  # models imports this module
+
+        return UploadedFile.objects.filter(content_sha256=digest).exists()
+
+    def adopt(self, name):
+        """
+        Moves an existing stored file into the blob store: it becomes a link to
+        the blob for its content, creating the blob from it if there is none.
+        Returns the bytes freed (the file's size if it duplicated a blob).
+        """
+        path = self.path(name)
+        with _blob_lock:
+            stat = os.stat(path)
+            blob_path = self.path(self.blob_name(file_sha256(path)))
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                _link_or_copy(path, blob_path)
+                return 0
+            if os.path.samestat(os.stat(blob_path), stat):
+                return 0
+            staged = f"{path}.dedup"
+            try:
+                os.link(blob_path, staged)
+            except OSError:  # Keep the separate copy
+                return 0
+            os.replace(staged, path)
+            return stat.st_size
+
+    def delete_unused_blob(self, digest):
+        """
+        Deletes the blob for `digest` if no stored name links to it any more.
+        The caller checks that no UploadedFile row records the digest. Returns
+        the bytes freed.
+        """
+        path = self.path(self.blob_name(digest))
+        with _blob_lock:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                return 0
+            if stat.st_nlink > 1:
+                return 0
+            os.remove(path)
+        return stat.st_size
@@ -1,12 +1,69 @@
+import datetime
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.utils import ConnectionHandler
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
-from .models import User, Batch, DiscussionType, Schedule, UploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from .authentication import token_cache, token_cache_key
+from . import previews
+from .background import enqueue, requeue_stale_jobs, task
+from .downloads import check_file_delivery_backend
+from .extraction import extract_document_text
+from .fastlists import FastListMixin
+from .storage import DedupFileSystemStorage
+from .throttling import LoginScreenRateThrottle
+from .views import ChunkedUploadViewSet
+from .models import (
+    User,
+    Batch,
+    DiscussionType,
+    Schedule,
+    UploadedFile,
+    ChunkedUpload,
+    DocumentText,
+    BackgroundJob,
+)
+from django.core.files.move import file_move_safe
 from django.core.files.uploadedfile import (
     SimpleUploadedFile,
 )  # For testing file uploads
 
 
+class TempMediaRootMixin:
+    """Points MEDIA_ROOT (and the upload temp dir inside it) at a throwaway directory."""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            FILE_UPLOAD_TEMP_DIR=os.path.join(self.media_root, ".upload_tmp"),
+            CHUNKED_UPLOAD_DIR=os.path.join(self.media_root, ".chunked_uploads"),
+            PREVIEW_CACHE_DIR=os.path.join(self.media_root, ".previews"),
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+
 class AuthTests(APITestCase):
     def setUp(self):
         self.superuser = User.objects.create_superuser(
@@ -123,4 +180,1895 @@ class FileUploadTests(APITestCase):
         self.assertEqual(UploadedFile.objects.count(), 0)
 
 
+class StreamingUploadTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Stream Batch 2024", start_year=2024, end_year=2027
+        )
+        self.dt = DiscussionType.objects.create(name="Stream Discussion")
+        self.student_user = User.objects.create_user(
+            username="streamstudent",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        self.client.force_authenticate(user=self.student_user)
+
+    def test_upload_is_spooled_to_disk_and_moved_into_place(self):
+        content = os.urandom(300 * 1024)  # Several handler chunks
+        upload = SimpleUploadedFile(
+            "lecture.pdf", content, content_type="application/pdf"
+        )
+        with mock.patch(
+            "django.core.files.storage.filesystem.file_move_safe",
+            wraps=file_move_safe,
+        ) as move_mock:
+            response = self.client.post(
+                reverse("uploadedfile-list"),
+                {"batch": self.batch.id, "discussion_type": self.dt.id, "file": upload},
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        move_mock.assert_called_once()
+        temp_source = move_mock.call_args.args[0]
+        self.assertTrue(
+            temp_source.startswith(os.path.join(self.media_root, ".upload_tmp"))
+        )
+
+        stored = UploadedFile.objects.get()
+        with open(stored.file.path, "rb") as fh:
+            self.assertEqual(fh.read(), content)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, ".upload_tmp")), [])
+
+
+@override_settings(CHUNKED_UPLOAD_CHUNK_SIZE=1024)
+class ChunkedUploadTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Chunk Batch 2024", start_year=2024, end_year=2027
+        )
+        self.other_batch = Batch.objects.create(
+            name="Other Chunk Batch 2025", start_year=2025, end_year=2028
+        )
+        self.dt = DiscussionType.objects.create(name="Chunk Discussion")
+        self.student_user = User.objects.create_user(
+            username="chunkstudent",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        self.client.force_authenticate(user=self.student_user)
+        self.content = os.urandom(2500)  # 3 chunks: 1024 + 1024 + 452
+
+    def _init(self, batch=None):
+        return self.client.post(
+            reverse("chunkedupload-list"),
+            {
+                "batch": (batch or self.batch).id,
+                "discussion_type": self.dt.id,
+                "original_filename": "big_deck.pptx",
+                "total_size": len(self.content),
+            },
+            format="json",
+        )
+
+    def _put_chunk(self, upload_id, index, data):
+        url = reverse("chunkedupload-upload-chunk", args=[upload_id, index])
+        return self.client.put(url, data, content_type="application/octet-stream")
+
+    def test_resume_and_complete(self):
+        response = self._init()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        upload_id = response.data["id"]
+        self.assertEqual(response.data["chunk_count"], 3)
+
+        # Chunks can arrive out of order; the connection "drops" before chunk 1
+        self.assertEqual(
+            self._put_chunk(upload_id, 2, self.content[2048:]).status_code,
+            status.HTTP_200_OK,
+        )
+        self._put_chunk(upload_id, 0, self.content[:1024])
+        progress = self.client.get(reverse("chunkedupload-detail", args=[upload_id]))
+        self.assertEqual(progress.data["missing_chunks"], [1])
+
+        complete_url = reverse("chunkedupload-complete", args=[upload_id])
+        self.assertEqual(
+            self.client.post(complete_url).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self._put_chunk(upload_id, 1, self.content[1024:2048])
+        response = self.client.post(complete_url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        uploaded = UploadedFile.objects.get()
+        self.assertEqual(uploaded.original_filename, "big_deck.pptx")
+        self.assertEqual(uploaded.uploader, self.student_user)
+        with open(uploaded.file.path, "rb") as fh:
+            self.assertEqual(fh.read(), self.content)
+        self.assertFalse(ChunkedUpload.objects.exists())
+        self.assertEqual(
+            os.listdir(os.path.join(self.media_root, ".chunked_uploads")), []
+        )
+
+    def test_wrong_chunk_length_is_rejected(self):
+        upload_id = self._init().data["id"]
+        response = self._put_chunk(upload_id, 0, self.content[:1000])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(ChunkedUpload.objects.get().received_chunks, [])
+
+    def test_init_uses_upload_validation(self):
+        response = self._init(batch=self.other_batch)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ChunkedUpload.objects.exists())
+
+    def test_expired_uploads_are_purged(self):
+        upload_id = self._init().data["id"]
+        ChunkedUpload.objects.filter(pk=upload_id).update(
+            expires_at=timezone.now() - datetime.timedelta(minutes=1)
+        )
+        call_command("purge_expired_uploads", stdout=io.StringIO())
+        self.assertFalse(ChunkedUpload.objects.exists())
+        self.assertEqual(
+            os.listdir(os.path.join(self.media_root, ".chunked_uploads")), []
+        )
+
+    @override_settings(CHUNKED_UPLOAD_MAX_SIZE=2048)
+    def test_oversized_upload_is_refused(self):
+        response = self._init()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("total_size", response.data)
+        self.assertFalse(ChunkedUpload.objects.exists())
+
+    def test_second_completion_of_an_upload_conflicts(self):
+        upload_id = self._init().data["id"]
+        for index in range(3):
+            self._put_chunk(
+                upload_id, index, self.content[index * 1024 : (index + 1) * 1024]
+            )
+        stale = ChunkedUpload.objects.get(pk=upload_id)
+        complete_url = reverse("chunkedupload-complete", args=[upload_id])
+        self.assertEqual(
+            self.client.post(complete_url).status_code, status.HTTP_201_CREATED
+        )
+
+        # A request that loaded the upload before the first one finished
+        with mock.patch.object(
+            ChunkedUploadViewSet, "get_object", return_value=stale
+        ):
+            response = self.client.post(complete_url)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(UploadedFile.objects.count(), 1)
+
+
+class DownloadTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Download Batch 2024", start_year=2024, end_year=2027
+        )
+        self.dt = DiscussionType.objects.create(name="Download Discussion")
+        self.student_user = User.objects.create_user(
+            username="downloadstudent",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        self.content = bytes(range(256)) * 40  # 10240 bytes
+        self.uploaded = UploadedFile.objects.create(
+            uploader=self.student_user,
+            batch=self.batch,
+            discussion_type=self.dt,
+            file=SimpleUploadedFile("notes.pdf", self.content),
+        )
+        self.url = reverse("download-uploaded-file", args=[self.uploaded.id])
+        self.client.force_authenticate(user=self.student_user)
+
+    def test_full_download_carries_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_if_modified_since_returns_304(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_byte_range_returns_206(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=100-199")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response["Content-Range"], "bytes 100-199/10240")
+        self.assertEqual(response["Content-Length"], "100")
+        self.assertEqual(b"".join(response.streaming_content), self.content[100:200])
+
+    def test_suffix_range(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-10")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), self.content[-10:])
+
+    def test_unsatisfiable_range_returns_416(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=20000-")
+        self.assertEqual(
+            response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+        self.assertEqual(response["Content-Range"], "bytes */10240")
+
+    def test_stale_if_range_serves_full_file(self):
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(FILE_DELIVERY_BACKEND="x-accel-redirect")
+    def test_x_accel_redirect_hands_off_to_proxy(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(
+            response["X-Accel-Redirect"], "/protected-media/" + self.uploaded.file.name
+        )
+        self.assertIn("attachment;", response["Content-Disposition"])
+
+    @override_settings(FILE_DELIVERY_BACKEND="x-accel-redirect")
+    def test_delegated_download_carries_validators(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertTrue(etag)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotIn("X-Accel-Redirect", response)
+
+    @override_settings(FILE_DELIVERY_BACKEND="x-sendfile")
+    def test_x_sendfile_still_checks_permissions(self):
+        outsider = User.objects.create_user(
+            username="outsider", password="password123", role="student"
+        )
+        self.client.force_authenticate(user=outsider)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertNotIn("X-Sendfile", response)
+
+    @override_settings(FILE_DELIVERY_BACKEND="x-acel-redirect")
+    def test_unknown_backend_fails_the_system_check(self):
+        errors = check_file_delivery_backend(None)
+        self.assertEqual([error.id for error in errors], ["core_api.E001"])
+        with self.assertRaises(ImproperlyConfigured):  # Not hidden as a 404
+            self.client.get(self.url)
+
+
+class ZipExportTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Export Batch 2024", start_year=2024, end_year=2027
+        )
+        self.other_batch = Batch.objects.create(
+            name="Hidden Batch 2025", start_year=2025, end_year=2028
+        )
+        self.dt = DiscussionType.objects.create(name="Export Discussion")
+        self.student_user = User.objects.create_user(
+            username="exportstudent",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        self.other_student = User.objects.create_user(
+            username="hiddenstudent",
+            password="password123",
+            role="student",
+            batch=self.other_batch,
+        )
+        self.pdf_bytes = b"%PDF-1.4 " + b"x" * 5000
+        self.txt_bytes = b"plain text notes " * 300
+        for uploader, batch, name, content in (
+            (self.student_user, self.batch, "case.pdf", self.pdf_bytes),
+            (self.student_user, self.batch, "notes.txt", self.txt_bytes),
+            (self.other_student, self.other_batch, "secret.pdf", b"hidden"),
+        ):
+            UploadedFile.objects.create(
+                uploader=uploader,
+                batch=batch,
+                discussion_type=self.dt,
+                file=SimpleUploadedFile(name, content),
+            )
+        self.client.force_authenticate(user=self.student_user)
+
+    def _export(self, **params):
+        return self.client.get(reverse("uploadedfile-export"), params)
+
+    def test_requires_a_filter(self):
+        self.assertEqual(self._export().status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_streams_visible_files_only(self):
+        response = self._export(date_from="2000-01-01")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertIsNone(archive.testzip())
+        names = archive.namelist()
+        self.assertEqual(len(names), 2)
+        self.assertFalse(any("hidden" in name for name in names))
+
+        by_ext = {os.path.splitext(i.filename)[1]: i for i in archive.infolist()}
+        self.assertEqual(by_ext[".pdf"].compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(by_ext[".txt"].compress_type, zipfile.ZIP_DEFLATED)
+        self.assertEqual(archive.read(by_ext[".pdf"]), self.pdf_bytes)
+        self.assertEqual(archive.read(by_ext[".txt"]), self.txt_bytes)
+
+    def test_bad_date_is_rejected(self):
+        response = self._export(date_to="last tuesday")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SubmissionStatusTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Status Batch 2024", start_year=2024, end_year=2027
+        )
+        self.dt = DiscussionType.objects.create(name="Status Discussion")
+        self.professor = User.objects.create_user(
+            username="statusprof", password="password123", role="professor"
+        )
+        self.student_user = User.objects.create_user(
+            username="statusstudent",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        self.client.force_authenticate(user=self.professor)
+
+    def _add_schedules(self, count, with_files):
+        for i in range(count):
+            schedule = Schedule.objects.create(
+                batch=self.batch,
+                discussion_type=self.dt,
+                title=f"Status Topic {Schedule.objects.count()}",
+                scheduled_date=datetime.date(2024, 7, 1),
+                created_by=self.professor,
+            )
+            for _ in range(with_files):
+                UploadedFile.objects.create(
+                    uploader=self.student_user,
+                    batch=self.batch,
+                    discussion_type=self.dt,
+                    schedule=schedule,
+                    file=SimpleUploadedFile("deck.pdf", b"deck"),
+                )
+
+    def _list_query_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("schedule-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), response
+
+    def test_list_query_count_is_constant(self):
+        self._add_schedules(2, with_files=1)
+        small, _ = self._list_query_count()
+        self._add_schedules(6, with_files=2)
+        large, _ = self._list_query_count()
+        self.assertEqual(small, large)
+
+    def test_status_fields(self):
+        self._add_schedules(1, with_files=0)
+        self._add_schedules(1, with_files=2)
+        _, response = self._list_query_count()
+        by_count = {row["submission_count"]: row for row in response.data}
+        self.assertFalse(by_count[0]["is_submission_uploaded"])
+        self.assertIsNone(by_count[0]["latest_submission_date"])
+        self.assertTrue(by_count[2]["is_submission_uploaded"])
+        self.assertIsNotNone(by_count[2]["latest_submission_date"])
+
+
+class VerificationReportTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Verify Batch 2024", start_year=2024, end_year=2027
+        )
+        self.other_batch = Batch.objects.create(
+            name="Verify Other 2025", start_year=2025, end_year=2028
+        )
+        self.dt = DiscussionType.objects.create(name="Verify Discussion")
+        self.leader = User.objects.create_user(
+            username="verifyleader",
+            password="password123",
+            role="batch_leader",
+            batch=self.batch,
+        )
+        self.presenter = User.objects.create_user(
+            username="verifypresenter",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        today = timezone.localdate()
+        past, future = today - datetime.timedelta(days=3), today + datetime.timedelta(days=3)
+        self.submitted = self._schedule(self.batch, "Submitted", past)
+        self.overdue = self._schedule(self.batch, "Overdue", past)
+        self.pending = self._schedule(self.batch, "Pending", future)
+        self._schedule(self.other_batch, "Other batch", past)  # Out of scope
+        UploadedFile.objects.create(
+            uploader=self.presenter,
+            batch=self.batch,
+            discussion_type=self.dt,
+            schedule=self.submitted,
+            file=SimpleUploadedFile("done.pdf", b"done"),
+        )
+        self.client.force_authenticate(user=self.leader)
+
+    def _schedule(self, batch, title, date):
+        return Schedule.objects.create(
+            batch=batch,
+            discussion_type=self.dt,
+            title=title,
+            presenter=self.presenter if batch == self.batch else None,
+            scheduled_date=date,
+            created_by=self.leader,
+        )
+
+    def test_counts_are_scoped_to_batch_leader(self):
+        response = self.client.get(reverse("verification-report"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = {"total": 3, "submitted": 1, "pending": 1, "overdue": 1}
+        self.assertEqual(response.data["totals"], expected)
+        self.assertEqual(len(response.data["by_batch"]), 1)
+        self.assertEqual(response.data["by_batch"][0]["batch_name"], self.batch.name)
+        self.assertEqual(
+            response.data["by_presenter"][0]["presenter_username"], "verifypresenter"
+        )
+
+    def test_missing_list(self):
+        response = self.client.get(reverse("verification-report"))
+        missing = {row["id"]: row["is_overdue"] for row in response.data["missing"]}
+        self.assertEqual(missing, {self.overdue.id: True, self.pending.id: False})
+
+    def test_query_count_does_not_grow_with_schedules(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(reverse("verification-report"))
+        for i in range(5):
+            self._schedule(self.batch, f"Extra {i}", timezone.localdate())
+        with CaptureQueriesContext(connection) as large:
+            self.client.get(reverse("verification-report"))
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+
+class DashboardSummaryTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Dash Batch 2024", start_year=2024, end_year=2027
+        )
+        self.dt = DiscussionType.objects.create(name="Dash Discussion")
+        self.professor = User.objects.create_user(
+            username="dashprof", password="password123", role="professor"
+        )
+        self.student = User.objects.create_user(
+            username="dashstudent",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        self.classmate = User.objects.create_user(
+            username="dashclassmate",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        today = timezone.localdate()
+        self.upcoming = self._schedule(
+            "Upcoming", today + datetime.timedelta(days=2), self.student
+        )
+        self._schedule("Classmate's", today + datetime.timedelta(days=1), self.classmate)
+        self._schedule("Overdue", today - datetime.timedelta(days=2), self.student)
+        UploadedFile.objects.create(
+            uploader=self.student,
+            batch=self.batch,
+            discussion_type=self.dt,
+            file=SimpleUploadedFile("mine.pdf", b"mine"),
+        )
+        UploadedFile.objects.create(
+            uploader=self.classmate,
+            batch=self.batch,
+            discussion_type=self.dt,
+            file=SimpleUploadedFile("theirs.pdf", b"theirs"),
+        )
+
+    def _schedule(self, title, date, presenter):
+        return Schedule.objects.create(
+            batch=self.batch,
+            discussion_type=self.dt,
+            title=title,
+            presenter=presenter,
+            scheduled_date=date,
+            created_by=self.professor,
+        )
+
+    def test_student_sees_own_presentations_and_uploads(self):
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get(reverse("dashboard-summary"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [s["id"] for s in response.data["upcoming_schedules"]], [self.upcoming.id]
+        )
+        self.assertEqual(
+            [f["uploader_username"] for f in response.data["recent_uploads"]],
+            ["dashstudent"],
+        )
+        self.assertEqual(response.data["counts"]["total"], 2)
+        self.assertEqual(response.data["counts"]["overdue"], 1)
+        self.assertEqual(response.data["by_batch"], [])
+
+    def test_staff_gets_batch_breakdown(self):
+        self.client.force_authenticate(user=self.professor)
+        response = self.client.get(reverse("dashboard-summary"), {"limit": 1})
+        self.assertEqual(response.data["counts"]["total"], 3)
+        self.assertEqual(len(response.data["upcoming_schedules"]), 1)
+        self.assertEqual(len(response.data["recent_uploads"]), 1)
+        self.assertEqual(response.data["by_batch"][0]["total"], 3)
+
+    def test_query_count_is_fixed(self):
+        self.client.force_authenticate(user=self.professor)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(reverse("dashboard-summary"))
+        for i in range(4):
+            self._schedule(f"Extra {i}", timezone.localdate(), self.classmate)
+        with CaptureQueriesContext(connection) as large:
+            self.client.get(reverse("dashboard-summary"))
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+
+class ListIndexTests(APITestCase):
+    def setUp(self):
+        self.batch = Batch.objects.create(
+            name="Index Batch 2024", start_year=2024, end_year=2027
+        )
+        self.leader = User.objects.create_user(
+            username="indexleader",
+            password="password123",
+            role="batch_leader",
+            batch=self.batch,
+        )
+
+    @skipUnless(connection.vendor == "sqlite", "Checks SQLite query plans")
+    def test_batch_leader_lists_use_composite_indexes(self):
+        for queryset, index_name in (
+            (
+                Schedule.objects.visible_to(self.leader).order_by(
+                    "-scheduled_date", "-id"
+                ),
+                "schedule_batch_date_idx",
+            ),
+            (
+                UploadedFile.objects.visible_to(self.leader).order_by(
+                    "-upload_date", "-id"
+                ),
+                "file_batch_date_idx",
+            ),
+        ):
+            plan = queryset.explain()
+            self.assertIn(index_name, plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_benchmark_command_runs(self):
+        out = io.StringIO()
+        call_command("benchmark_list_queries", iterations=1, stdout=out)
+        self.assertIn("indexleader (batch_leader)", out.getvalue())
+        self.assertIn("files?batch_id", out.getvalue())
+
+
+class StudentVisibilityQueryTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Scope Batch 2024", start_year=2024, end_year=2027
+        )
+        self.other_batch = Batch.objects.create(
+            name="Scope Other 2025", start_year=2025, end_year=2028
+        )
+        self.dt = DiscussionType.objects.create(name="Scope Discussion")
+        self.professor = User.objects.create_user(
+            username="scopeprof", password="password123", role="professor"
+        )
+        self.student = User.objects.create_user(
+            username="scopestudent",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        self.outsider = User.objects.create_user(
+            username="scopeoutsider",
+            password="password123",
+            role="student",
+            batch=self.other_batch,
+        )
+        # Own upload inside own batch: matches both branches, must appear once.
+        self.own_in_batch = self._file(self.student, self.batch, "own.pdf")
+        self.own_elsewhere = self._file(self.student, self.other_batch, "away.pdf")
+        self.batch_file = self._file(self.outsider, self.batch, "shared.pdf")
+        self._file(self.outsider, self.other_batch, "hidden.pdf")
+        today = timezone.localdate()
+        self.presenting = self._schedule(self.batch, "Mine", today, self.student)
+        self.guest = self._schedule(self.other_batch, "Guest", today, self.student)
+        self.batch_schedule = self._schedule(self.batch, "Batch", today, None)
+        self._schedule(self.other_batch, "Hidden", today, None)
+        self.client.force_authenticate(user=self.student)
+
+    def _file(self, uploader, batch, name):
+        return UploadedFile.objects.create(
+            uploader=uploader,
+            batch=batch,
+            discussion_type=self.dt,
+            file=SimpleUploadedFile(name, b"data"),
+        )
+
+    def _schedule(self, batch, title, date, presenter):
+        return Schedule.objects.create(
+            batch=batch,
+            discussion_type=self.dt,
+            title=title,
+            presenter=presenter,
+            scheduled_date=date,
+            created_by=self.professor,
+        )
+
+    def test_same_rows_without_distinct(self):
+        files = UploadedFile.objects.visible_to(self.student)
+        schedules = Schedule.objects.visible_to(self.student)
+        self.assertEqual(
+            sorted(files.values_list("pk", flat=True)),
+            sorted([self.own_in_batch.pk, self.own_elsewhere.pk, self.batch_file.pk]),
+        )
+        self.assertEqual(
+            sorted(schedules.values_list("pk", flat=True)),
+            sorted([self.presenting.pk, self.guest.pk, self.batch_schedule.pk]),
+        )
+        self.assertNotIn("DISTINCT", str(files.query))
+        self.assertNotIn("DISTINCT", str(schedules.query))
+
+    def test_list_endpoints_query_count_and_time(self):
+        def timed_lists():
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                files = self.client.get(reverse("uploadedfile-list"))
+                schedules = self.client.get(reverse("schedule-list"))
+                elapsed = time.perf_counter() - start
+            self.assertEqual(files.status_code, status.HTTP_200_OK)
+            self.assertEqual(schedules.status_code, status.HTTP_200_OK)
+            return queries, elapsed
+
+        small, _ = timed_lists()
+        for i in range(100):
+            self._file(self.outsider, self.batch, f"bulk{i}.pdf")
+            self._schedule(self.batch, f"Bulk {i}", timezone.localdate(), None)
+        large, elapsed = timed_lists()
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertFalse(
+            any("DISTINCT" in q["sql"] for q in large.captured_queries)
+        )
+        self.assertLess(elapsed, 5.0)  # Generous: catches pathological plans only
+
+
+class SQLiteConcurrencyBenchmarkTests(APITestCase):
+    def test_benchmark_reports_both_profiles(self):
+        out = io.StringIO()
+        call_command(
+            "benchmark_sqlite_concurrency",
+            readers=1,
+            writers=1,
+            duration=0.2,
+            seed_rows=50,
+            stdout=out,
+        )
+        self.assertIn("stock", out.getvalue())
+        self.assertIn("tuned", out.getvalue())
+
+    def test_tuning_profile_configures_new_connections(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        handler = ConnectionHandler(
+            {
+                "default": {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": os.path.join(directory, "tuned.sqlite3"),
+                    "OPTIONS": settings.SQLITE_TUNING_OPTIONS,
+                }
+            }
+        )
+        tuned = handler["default"]
+        self.addCleanup(tuned.close)
+        pragmas = {}
+        with tuned.cursor() as cursor:
+            for name in ("journal_mode", "synchronous", "busy_timeout"):
+                cursor.execute(f"PRAGMA {name}")
+                pragmas[name] = cursor.fetchone()[0]
+        self.assertEqual(
+            pragmas,
+            {
+                "journal_mode": "wal",
+                "synchronous": 1,  # NORMAL
+                "busy_timeout": settings.SQLITE_TUNING_PRAGMAS["busy_timeout"],
+            },
+        )
+        self.assertEqual(tuned.transaction_mode, "IMMEDIATE")
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        token_cache().clear()
+        self.batch = Batch.objects.create(
+            name="Token Batch 2024", start_year=2024, end_year=2027
+        )
+        self.user = User.objects.create_user(
+            username="tokenstudent",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def _me(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("user-me"))
+        return response, queries
+
+    def test_repeat_requests_skip_token_lookup(self):
+        first, first_queries = self._me()
+        second, second_queries = self._me()
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertTrue(
+            any("authtoken_token" in q["sql"] for q in first_queries.captured_queries)
+        )
+        self.assertFalse(
+            any("authtoken_token" in q["sql"] for q in second_queries.captured_queries)
+        )
+        self.assertLess(
+            len(second_queries.captured_queries), len(first_queries.captured_queries)
+        )
+
+    def test_role_change_invalidates(self):
+        self._me()
+        self.user.role = "batch_leader"
+        self.user.save()
+        response, _ = self._me()
+        self.assertEqual(response.data["role"], "batch_leader")
+        self.assertTrue(response.data["is_staff"])
+
+    def test_batch_rename_invalidates(self):
+        self._me()
+        self.batch.name = "Token Batch Renamed"
+        self.batch.save()
+        response, _ = self._me()
+        self.assertEqual(response.data["batch_name"], "Token Batch Renamed")
+
+    def test_deactivated_user_and_deleted_token_are_rejected(self):
+        self._me()
+        self.user.is_active = False
+        self.user.save()
+        response, _ = self._me()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.is_active = True
+        self.user.save()
+        self._me()
+        self.token.delete()
+        response, _ = self._me()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_last_login_update_keeps_entry(self):
+        self._me()
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=["last_login"])
+        self.assertIsNotNone(token_cache().get(token_cache_key(self.token.key)))
+
+    def test_entry_recached_mid_transaction_is_dropped_on_commit(self):
+        self._me()
+        key = token_cache_key(self.token.key)
+        stale = token_cache().get(key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = "batch_leader"
+            self.user.save()
+            # A concurrent request still reading the old row caches it again
+            token_cache().set(key, stale)
+        self.assertIsNone(token_cache().get(key))
+
+
+class ReferenceListCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.batch = Batch.objects.create(
+            name="Cache Batch 2024", start_year=2024, end_year=2027
+        )
+        self.dt = DiscussionType.objects.create(name="Cache Discussion")
+        self.professor = User.objects.create_user(
+            username="cacheprof", password="password123", role="professor"
+        )
+        self.client.force_authenticate(user=self.professor)
+
+    def test_repeat_list_is_served_from_cache(self):
+        first = self.client.get(reverse("batch-list"))
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(reverse("batch-list"))
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(len(queries.captured_queries), 0)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(reverse("discussiontype-list"))["ETag"]
+        response = self.client.get(
+            reverse("discussiontype-list"), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    def test_save_and_delete_invalidate(self):
+        etag = self.client.get(reverse("batch-list"))["ETag"]
+        self.client.post(
+            reverse("batch-list"),
+            {"name": "Cache Batch 2025", "start_year": 2025, "end_year": 2028},
+            format="json",
+        )
+        response = self.client.get(reverse("batch-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Cache Batch 2025", [b["name"] for b in response.data])
+
+        self.client.get(reverse("discussiontype-list"))
+        self.dt.delete()
+        response = self.client.get(reverse("discussiontype-list"))
+        self.assertNotIn("Cache Discussion", [d["name"] for d in response.data])
+
+
+class UsernamesListCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(
+            username="loginstudent", password="password123", role="student"
+        )
+
+    def _usernames(self, **extra):
+        response = self.client.get(reverse("auth-usernames-list"), **extra)
+        if response.status_code != status.HTTP_200_OK:
+            return response, []
+        return response, [u["username"] for u in response.data]
+
+    def test_cached_with_etag(self):
+        first, _ = self._usernames()
+        with CaptureQueriesContext(connection) as queries:
+            second, usernames = self._usernames()
+        self.assertEqual(len(queries.captured_queries), 0)
+        self.assertIn("loginstudent", usernames)
+        response, _ = self._usernames(HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_user_changes_invalidate(self):
+        self._usernames()
+        User.objects.create_user(username="latecomer", password="password123")
+        _, usernames = self._usernames()
+        self.assertIn("latecomer", usernames)
+
+        self.student.is_active = False
+        self.student.save()
+        _, usernames = self._usernames()
+        self.assertNotIn("loginstudent", usernames)
+
+    def test_batch_delete_invalidates(self):
+        batch = Batch.objects.create(name="Gone 2024", start_year=2024, end_year=2027)
+        self.student.batch = batch
+        self.student.save()
+        batch_id = batch.pk
+        response, _ = self._usernames()
+        self.assertIn(batch_id, [u["batch_id"] for u in response.data])
+        batch.delete()
+        response, _ = self._usernames()
+        self.assertNotIn(batch_id, [u["batch_id"] for u in response.data])
+
+    def test_throttled_per_ip(self):
+        with mock.patch.object(
+            LoginScreenRateThrottle, "rate", "2/minute", create=True
+        ):
+            self.assertEqual(self._usernames()[0].status_code, status.HTTP_200_OK)
+            self.assertEqual(self._usernames()[0].status_code, status.HTTP_200_OK)
+            throttled, _ = self._usernames()
+            self.assertEqual(throttled.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            other_ip, _ = self._usernames(REMOTE_ADDR="10.0.0.2")
+            self.assertEqual(other_ip.status_code, status.HTTP_200_OK)
+
+
+class SparseFieldsetTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Sparse Batch 2024", start_year=2024, end_year=2027
+        )
+        self.dt = DiscussionType.objects.create(name="Sparse Discussion")
+        self.professor = User.objects.create_user(
+            username="sparseprof", password="password123", role="professor"
+        )
+        for i in range(3):
+            schedule = Schedule.objects.create(
+                batch=self.batch,
+                discussion_type=self.dt,
+                title=f"Sparse {i}",
+                scheduled_date=timezone.localdate(),
+                created_by=self.professor,
+            )
+            UploadedFile.objects.create(
+                uploader=self.professor,
+                batch=self.batch,
+                discussion_type=self.dt,
+                schedule=schedule,
+                file=SimpleUploadedFile(f"sparse{i}.pdf", b"data"),
+            )
+        self.client.force_authenticate(user=self.professor)
+
+    def _get(self, name, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, " ".join(q["sql"] for q in queries.captured_queries)
+
+    def test_fields_trims_output_joins_and_subqueries(self):
+        response, sql = self._get(
+            "schedule-list", {"fields": "title,scheduled_date,bogus"}
+        )
+        self.assertEqual(len(response.data), 3)
+        for row in response.data:
+            self.assertEqual(set(row), {"id", "title", "scheduled_date"})
+        self.assertNotIn("JOIN", sql)
+        self.assertNotIn("core_api_uploadedfile", sql)
+        self.assertNotIn('"description"', sql)
+
+    def test_omit_drops_fields_and_their_joins(self):
+        response, sql = self._get(
+            "uploadedfile-list", {"omit": "uploader_username,file_url,schedule_title"}
+        )
+        row = response.data[0]
+        self.assertNotIn("file_url", row)
+        self.assertNotIn("uploader_username", row)
+        self.assertEqual(row["batch_name"], "Sparse Batch 2024")
+        self.assertIn("file", row)
+        self.assertNotIn("core_api_user", sql)
+        self.assertNotIn("core_api_schedule", sql)
+
+    def test_sparse_fields_with_cursor_pagination(self):
+        response, _ = self._get("uploadedfile-list", {"fields": "id", "page_size": 2})
+        self.assertEqual([set(r) for r in response.data["results"]], [{"id"}] * 2)
+        self.assertIsNotNone(response.data["next"])
+
+
+class FastListSerializationTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Fast Batch 2024", start_year=2024, end_year=2027
+        )
+        self.dt = DiscussionType.objects.create(name="Fast Discussion")
+        self.professor = User.objects.create_user(
+            username="fastprof", password="password123", role="professor"
+        )
+        self.student = User.objects.create_user(
+            username="faststudent",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        with_file = Schedule.objects.create(
+            batch=self.batch,
+            discussion_type=self.dt,
+            title="Présentation",
+            presenter=self.student,
+            scheduled_date=datetime.date(2024, 3, 1),
+            created_by=self.professor,
+            description="Notes",
+        )
+        Schedule.objects.create(
+            batch=self.batch,
+            discussion_type=self.dt,
+            title="Unassigned",
+            scheduled_date=datetime.date(2024, 3, 2),
+        )
+        UploadedFile.objects.create(
+            uploader=self.student,
+            batch=self.batch,
+            discussion_type=self.dt,
+            schedule=with_file,
+            file=SimpleUploadedFile("résumé deck.pdf", b"data"),
+            description="Final",
+        )
+        UploadedFile.objects.create(
+            uploader=self.professor,
+            batch=self.batch,
+            discussion_type=self.dt,
+            file=SimpleUploadedFile("general.pdf", b"data"),
+        )
+
+    def _both(self, name, params=None):
+        fast = self.client.get(reverse(name), params)
+        with mock.patch(
+            "core_api.fastlists.sparse_field_names", return_value=set()
+        ):  # Forces the serializer path
+            slow = self.client.get(reverse(name), params)
+        self.assertEqual(fast.status_code, status.HTTP_200_OK)
+        return fast.content, slow.content
+
+    def test_byte_identical_to_serializers(self):
+        for user in (self.professor, self.student):
+            self.client.force_authenticate(user=user)
+            for name in ("schedule-list", "uploadedfile-list"):
+                for params in (None, {"page_size": 1}):
+                    fast, slow = self._both(name, params)
+                    self.assertEqual(fast, slow, (user.username, name, params))
+
+    def test_benchmark_command_reports_identical_output(self):
+        out = io.StringIO()
+        call_command("benchmark_list_serialization", rows=[20], stdout=out)
+        self.assertIn("identical", out.getvalue())
+        self.assertNotIn("MISMATCH", out.getvalue())
+
+    def test_viewset_without_builder_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+
+            class Incomplete(FastListMixin):
+                fast_list_values = ("id",)
+
+
+class FileSearchTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Search Batch 2024", start_year=2024, end_year=2027
+        )
+        self.other_batch = Batch.objects.create(
+            name="Search Batch 2025", start_year=2025, end_year=2028
+        )
+        self.dt = DiscussionType.objects.create(name="Search Discussion")
+        self.professor = User.objects.create_user(
+            username="searchprof", password="password123", role="professor"
+        )
+        self.student = User.objects.create_user(
+            username="searchstudent",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        self.schedule = Schedule.objects.create(
+            batch=self.batch,
+            discussion_type=self.dt,
+            title="Cardiology grand rounds",
+            presenter=self.student,
+            scheduled_date=datetime.date(2024, 3, 1),
+        )
+        self.in_name = self._upload("pharmacokinetics_notes.pdf", self.batch)
+        self.in_description = self._upload(
+            "notes.pdf", self.batch, description="Intro to pharmacology"
+        )
+        self.in_schedule = self._upload(
+            "slides.pptx", self.batch, schedule=self.schedule
+        )
+        self.other = self._upload("pharmacy_audit.pdf", self.other_batch)
+
+    def _upload(self, name, batch, **extra):
+        return UploadedFile.objects.create(
+            uploader=self.professor,
+            batch=batch,
+            discussion_type=self.dt,
+            file=SimpleUploadedFile(name, b"data"),
+            **extra,
+        )
+
+    def _search(self, q, **params):
+        response = self.client.get(reverse("uploadedfile-search"), {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in response.data]
+
+    def test_prefix_match_ranks_filename_hits_first(self):
+        self.client.force_authenticate(user=self.professor)
+        ids = self._search("pharma")
+        self.assertEqual(
+            set(ids), {self.in_name.id, self.in_description.id, self.other.id}
+        )
+        self.assertNotEqual(ids[0], self.in_description.id)
+
+    def test_all_terms_must_match(self):
+        self.client.force_authenticate(user=self.professor)
+        self.assertEqual(self._search("pharma intro"), [self.in_description.id])
+        self.assertEqual(self._search("cardio round"), [self.in_schedule.id])
+
+    def test_results_are_role_scoped_and_filtered(self):
+        self.client.force_authenticate(user=self.student)
+        self.assertEqual(
+            set(self._search("pharma")), {self.in_name.id, self.in_description.id}
+        )
+        self.client.force_authenticate(user=self.professor)
+        self.assertEqual(
+            self._search("pharma", batch_id=self.other_batch.id), [self.other.id]
+        )
+
+    def test_index_follows_saves_and_deletes(self):
+        self.client.force_authenticate(user=self.professor)
+        self.in_name.description = "Antibiotics summary"
+        self.in_name.save()
+        self.assertEqual(self._search("antibio"), [self.in_name.id])
+
+        self.schedule.title = "Nephrology journal club"
+        self.schedule.save()
+        self.assertEqual(self._search("nephro"), [self.in_schedule.id])
+        self.assertEqual(self._search("cardio"), [])
+
+        self.schedule.delete()
+        self.assertEqual(self._search("nephro"), [])
+        self.in_name.delete()
+        self.assertEqual(self._search("antibio"), [])
+
+    def test_missing_query_is_rejected(self):
+        self.client.force_authenticate(user=self.professor)
+        response = self.client.get(reverse("uploadedfile-search"), {"q": " ?! "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+def _office_file(name, parts):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for part, xml in parts.items():
+            archive.writestr(part, xml)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+def _docx(name, *paragraphs):
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(f"<w:p><w:r><w:t>{p}</w:t></w:r></w:p>" for p in paragraphs)
+    xml = f'<w:document xmlns:w="{ns}"><w:body>{body}</w:body></w:document>'
+    return _office_file(name, {"word/document.xml": xml})
+
+
+def _pptx(name, slides, notes=()):
+    ns = "http://schemas.openxmlformats.org/drawingml/2006/main"
+    parts = {}
+    for prefix, texts in (("slides/slide", slides), ("notesSlides/notesSlide", notes)):
+        for number, text in enumerate(texts, start=1):
+            parts[f"ppt/{prefix}{number}.xml"] = (
+                f'<p:sld xmlns:p="p" xmlns:a="{ns}"><a:p><a:r><a:t>{text}</a:t>'
+                "</a:r></a:p></p:sld>"
+            )
+    return _office_file(name, parts)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class DocumentTextTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Text Batch 2024", start_year=2024, end_year=2027
+        )
+        self.other_batch = Batch.objects.create(
+            name="Text Batch 2025", start_year=2025, end_year=2028
+        )
+        self.dt = DiscussionType.objects.create(name="Text Discussion")
+        self.professor = User.objects.create_user(
+            username="textprof", password="password123", role="professor"
+        )
+        self.student = User.objects.create_user(
+            username="textstudent",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+
+    def _upload(self, upload, batch=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return UploadedFile.objects.create(
+                uploader=self.professor,
+                batch=batch or self.batch,
+                discussion_type=self.dt,
+                file=upload,
+            )
+
+    def _search(self, q):
+        response = self.client.get(reverse("uploadedfile-search"), {"q": q})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in response.data]
+
+    def test_docx_and_pptx_text_is_extracted_after_upload(self):
+        docx = self._upload(
+            _docx("rubric.docx", "Marking rubric", "Belladonna  dose")
+        )
+        pptx = self._upload(
+            _pptx("case.pptx", ["Second", "Third"], notes=["Speaker notes"])
+        )
+        self.assertEqual(docx.document_text.status, "indexed")
+        self.assertEqual(docx.document_text.text, "Marking rubric\nBelladonna dose")
+        self.assertEqual(pptx.document_text.text, "Second\nThird\nSpeaker notes")
+
+    def test_content_search_is_role_scoped(self):
+        own = self._upload(_docx("a.docx", "Arnica montana in trauma"))
+        self._upload(_docx("b.docx", "Arnica for bruises"), batch=self.other_batch)
+        self.client.force_authenticate(user=self.student)
+        self.assertEqual(self._search("arnic trauma"), [own.id])
+        self.assertEqual(self._search("arnica"), [own.id])
+
+    def test_unchanged_files_are_not_parsed_again(self):
+        uploaded = self._upload(_docx("notes.docx", "Nux vomica"))
+        with mock.patch("core_api.extraction.extract_text") as extract:
+            extract_document_text(uploaded.pk)
+            extract.assert_not_called()
+            extract.return_value = "Replaced"
+            extract_document_text(uploaded.pk, force=True)
+            extract.assert_called_once()
+        self.assertEqual(DocumentText.objects.get(pk=uploaded.pk).text, "Replaced")
+
+    def test_unsupported_and_corrupt_files_are_recorded(self):
+        plain = self._upload(SimpleUploadedFile("notes.txt", b"plain"))
+        with self.assertLogs("core_api", "WARNING"):
+            broken = self._upload(SimpleUploadedFile("broken.docx", b"not a zip"))
+        self.assertEqual(plain.document_text.status, "unsupported")
+        self.assertEqual(broken.document_text.status, "failed")
+
+    def test_index_documents_command_backfills(self):
+        uploaded = UploadedFile.objects.create(  # on_commit never runs here
+            uploader=self.professor,
+            batch=self.batch,
+            discussion_type=self.dt,
+            file=_docx("old.docx", "Sulphur"),
+        )
+        self.assertFalse(DocumentText.objects.filter(pk=uploaded.pk).exists())
+        out = io.StringIO()
+        call_command("index_documents", stdout=out)
+        self.assertIn("1 indexed", out.getvalue())
+        self.client.force_authenticate(user=self.professor)
+        self.assertEqual(self._search("sulph"), [uploaded.id])
+
+
+@task
+def _flaky_task(fail_until_attempt):
+    job = BackgroundJob.objects.get(status="running", task__endswith="_flaky_task")
+    if job.attempts < fail_until_attempt:
+        raise RuntimeError(f"attempt {job.attempts} failed")
+
+
+class BackgroundJobTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Job Batch 2024", start_year=2024, end_year=2027
+        )
+        self.dt = DiscussionType.objects.create(name="Job Discussion")
+        self.professor = User.objects.create_user(
+            username="jobprof", password="password123", role="professor"
+        )
+
+    def _run_worker(self):
+        out = io.StringIO()
+        call_command("run_worker", "--once", "--workers", "1", stdout=out)
+        return out.getvalue()
+
+    def test_upload_queues_jobs_for_the_worker(self):
+        uploaded = UploadedFile.objects.create(
+            uploader=self.professor,
+            batch=self.batch,
+            discussion_type=self.dt,
+            file=_docx("queued.docx", "Pulsatilla"),
+        )
+        jobs = BackgroundJob.objects.filter(args=[uploaded.pk])
+        self.assertEqual(
+            sorted(jobs.values_list("task", flat=True)),
+            [
+                "core_api.extraction.extract_document_text",
+                "core_api.previews.generate_preview",
+            ],
+        )
+        self.assertFalse(DocumentText.objects.filter(pk=uploaded.pk).exists())
+
+        self.assertIn("2 succeeded", self._run_worker())
+        self.assertEqual(DocumentText.objects.get(pk=uploaded.pk).text, "Pulsatilla")
+        self.assertEqual(set(jobs.values_list("status", flat=True)), {"succeeded"})
+
+    def test_identical_queued_jobs_are_merged(self):
+        first = enqueue(_flaky_task, 0)
+        self.assertEqual(enqueue(_flaky_task, 0), first)
+        self.assertNotEqual(enqueue(_flaky_task, 1), first)
+
+    def test_unregistered_function_cannot_be_queued(self):
+        with self.assertRaises(ValueError):
+            enqueue(len, "x")
+
+    @override_settings(BACKGROUND_JOB_MAX_ATTEMPTS=2, BACKGROUND_JOB_RETRY_DELAY=0)
+    def test_failed_jobs_are_retried_until_out_of_attempts(self):
+        recovered = enqueue(_flaky_task, 2)
+        with self.assertLogs("core_api.background", "ERROR"):
+            self._run_worker()
+        recovered.refresh_from_db()
+        self.assertEqual((recovered.status, recovered.attempts), ("succeeded", 2))
+
+        failing = enqueue(_flaky_task, 5)
+        with self.assertLogs("core_api.background", "ERROR"):
+            self._run_worker()
+        failing.refresh_from_db()
+        self.assertEqual((failing.status, failing.attempts), ("failed", 2))
+        self.assertIn("attempt 2 failed", failing.last_error)
+
+        out = io.StringIO()
+        call_command("background_jobs", "--retry-failed", stdout=out)
+        self.assertIn("Queued 1 failed job(s).", out.getvalue())
+        self.assertIn("_flaky_task: 1 queued", out.getvalue())
+
+    @override_settings(BACKGROUND_JOB_TIMEOUT=60)
+    def test_jobs_abandoned_by_a_stopped_worker_are_requeued(self):
+        job = enqueue(_flaky_task, 0)
+        stale = timezone.now() - datetime.timedelta(minutes=5)
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status="running", attempts=1, started_at=stale
+        )
+        self.assertEqual(requeue_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "queued")
+        self._run_worker()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("succeeded", 2))
+
+
+class DedupStorageTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Dedup Batch 2024", start_year=2024, end_year=2027
+        )
+        self.other_batch = Batch.objects.create(
+            name="Dedup Batch 2025", start_year=2025, end_year=2028
+        )
+        self.dt = DiscussionType.objects.create(name="Dedup Discussion")
+        self.professor = User.objects.create_user(
+            username="dedupprof", password="password123", role="professor"
+        )
+        self.client.force_authenticate(user=self.professor)
+        self.storage = UploadedFile._meta.get_field("file").storage
+
+    def _upload(self, batch, content, name="form.pdf"):
+        response = self.client.post(
+            reverse("uploadedfile-list"),
+            {
+                "batch": batch.id,
+                "discussion_type": self.dt.id,
+                "file": SimpleUploadedFile(name, content),
+            },
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return UploadedFile.objects.get(pk=response.data["id"])
+
+    def _blob_path(self, content):
+        digest = hashlib.sha256(content).hexdigest()
+        return self.storage.path(self.storage.blob_name(digest))
+
+    def test_identical_uploads_share_one_blob(self):
+        content = os.urandom(200 * 1024)
+        first = self._upload(self.batch, content)
+        second = self._upload(self.other_batch, content)
+        other = self._upload(self.batch, b"different")
+
+        self.assertNotEqual(first.file.name, second.file.name)
+        self.assertTrue(os.path.samefile(first.file.path, second.file.path))
+        self.assertTrue(os.path.samefile(first.file.path, self._blob_path(content)))
+        self.assertEqual(os.stat(first.file.path).st_nlink, 3)
+        self.assertFalse(os.path.samefile(first.file.path, other.file.path))
+        with open(second.file.path, "rb") as fh:
+            self.assertEqual(fh.read(), content)
+
+    def test_blob_removed_before_linking_is_written_again(self):
+        content = b"%PDF blob removed by the worker"
+        first = self._upload(self.batch, content)
+        blob_path = self._blob_path(content)
+        UploadedFile.objects.filter(pk=first.pk).delete()
+        os.remove(first.file.path)  # The blob is now unused
+
+        link = DedupFileSystemStorage._link
+        removed = []
+
+        def remove_blob_then_link(storage, source, name):
+            # Another process deletes the unused blob after _save() saw it
+            if not removed:
+                os.remove(blob_path)
+                removed.append(blob_path)
+            return link(storage, source, name)
+
+        with mock.patch.object(
+            DedupFileSystemStorage,
+            "_link",
+            autospec=True,
+            side_effect=remove_blob_then_link,
+        ):
+            second = self._upload(self.other_batch, content)
+        self.assertTrue(os.path.samefile(second.file.path, blob_path))
+        with open(second.file.path, "rb") as fh:
+            self.assertEqual(fh.read(), content)
+
+    def test_blob_is_removed_with_its_last_reference(self):
+        content = b"%PDF shared template"
+        first = self._upload(self.batch, content)
+        second = self._upload(self.other_batch, content)
+        blob_path = self._blob_path(content)
+
+        for uploaded in (first, second):  # Rows go first, as on a real delete
+            UploadedFile.objects.filter(pk=uploaded.pk).delete()
+        self.storage.delete(first.file.name)
+        self.assertTrue(os.path.exists(blob_path))
+        self.assertTrue(os.path.exists(second.file.path))
+        self.storage.delete(second.file.name)
+        self.assertFalse(os.path.exists(blob_path))
+
+    def test_copied_names_keep_the_blob_until_the_last_row_is_gone(self):
+        content = b"%PDF copied where links fail"
+        with mock.patch("core_api.storage.os.link", side_effect=OSError):
+            first = self._upload(self.batch, content)
+            second = self._upload(self.other_batch, content)
+        blob_path = self._blob_path(content)
+        self.assertEqual(os.stat(blob_path).st_nlink, 1)
+        self.assertFalse(os.path.samefile(first.file.path, blob_path))
+
+        UploadedFile.objects.filter(pk=first.pk).delete()
+        self.storage.delete(first.file.name)
+        self.assertTrue(os.path.exists(blob_path))
+        UploadedFile.objects.filter(pk=second.pk).delete()
+        self.storage.delete(second.file.name)
+        self.assertFalse(os.path.exists(blob_path))
+
+    def test_dedupe_media_adopts_existing_files(self):
+        content = b"uploaded before dedup"
+        names = []
+        for index in range(2):
+            name = f"legacy/copy_{index}.pdf"
+            os.makedirs(os.path.dirname(self.storage.path(name)), exist_ok=True)
+            with open(self.storage.path(name), "wb") as fh:
+                fh.write(content)
+            UploadedFile.objects.create(
+                uploader=self.professor,
+                batch=self.batch,
+                discussion_type=self.dt,
+                file=name,
+                original_filename=os.path.basename(name),
+            )
+            names.append(name)
+
+        out = io.StringIO()
+        call_command("dedupe_media", stdout=out)
+        self.assertIn("2 file(s) in the blob store", out.getvalue())
+        paths = [self.storage.path(name) for name in names]
+        self.assertTrue(os.path.samefile(paths[0], paths[1]))
+        self.assertTrue(os.path.samefile(paths[0], self._blob_path(content)))
+
+
+class DigestUploadTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Digest Batch 2024", start_year=2024, end_year=2027
+        )
+        self.other_batch = Batch.objects.create(
+            name="Digest Batch 2025", start_year=2025, end_year=2028
+        )
+        self.dt = DiscussionType.objects.create(name="Digest Discussion")
+        self.professor = User.objects.create_user(
+            username="digestprof", password="password123", role="professor"
+        )
+        self.student = User.objects.create_user(
+            username="digeststudent",
+            password="password123",
+            role="student",
+            batch=self.batch,
+        )
+        self.content = os.urandom(64 * 1024)
+        self.digest = hashlib.sha256(self.content).hexdigest()
+
+    def _upload(self, user, batch):
+        self.client.force_authenticate(user=user)
+        response = self.client.post(
+            reverse("uploadedfile-list"),
+            {
+                "batch": batch.id,
+                "discussion_type": self.dt.id,
+                "file": SimpleUploadedFile("deck.pptx", self.content),
+            },
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return UploadedFile.objects.get(pk=response.data["id"])
+
+    def _from_digest(self, user, batch, digest=None, size=None):
+        self.client.force_authenticate(user=user)
+        return self.client.post(
+            reverse("uploadedfile-from-digest"),
+            {
+                "batch": batch.id,
+                "discussion_type": self.dt.id,
+                "original_filename": "deck (resubmitted).pptx",
+                "content_sha256": digest or self.digest.upper(),
+                "size": len(self.content) if size is None else size,
+            },
+            format="json",
+        )
+
+    def test_upload_records_digest_and_size(self):
+        uploaded = self._upload(self.student, self.batch)
+        self.assertEqual(uploaded.content_sha256, self.digest)
+        self.assertEqual(uploaded.size, len(self.content))
+
+    def test_known_content_is_linked_without_upload(self):
+        source = self._upload(self.student, self.batch)
+        response = self._from_digest(self.student, self.batch)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        linked = UploadedFile.objects.get(pk=response.data["id"])
+        self.assertEqual(linked.uploader, self.student)
+        self.assertEqual(linked.original_filename, "deck (resubmitted).pptx")
+        self.assertEqual(linked.content_sha256, self.digest)
+        self.assertNotEqual(linked.file.name, source.file.name)
+        self.assertTrue(os.path.samefile(linked.file.path, source.file.path))
+
+    def test_unknown_or_invisible_content_is_not_found(self):
+        self._upload(self.professor, self.other_batch)
+        self.assertEqual(
+            self._from_digest(self.student, self.batch).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        self.assertEqual(
+            self._from_digest(self.professor, self.batch, size=1).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        self.assertEqual(
+            self._from_digest(self.professor, self.batch, digest="abc").status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_upload_rules_still_apply(self):
+        self._upload(self.professor, self.other_batch)
+        response = self._from_digest(self.student, self.other_batch)
+        self.assertIn(
+            response.status_code,
+            (status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN),
+        )
+        self.assertEqual(UploadedFile.objects.count(), 1)
+
+    def test_backfill_command_records_missing_digests(self):
+        uploaded = self._upload(self.professor, self.batch)
+        UploadedFile.objects.filter(pk=uploaded.pk).update(
+            content_sha256="", size=None
+        )
+        out = io.StringIO()
+        call_command("backfill_file_digests", stdout=out)
+        self.assertIn("1 file(s)", out.getvalue())
+        uploaded.refresh_from_db()
+        self.assertEqual(uploaded.content_sha256, self.digest)
+        self.assertEqual(uploaded.size, len(self.content))
+
+
+def _image_bytes(size=(1200, 900), color="red", fmt="PNG"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class FilePreviewTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Preview Batch 2024", start_year=2024, end_year=2027
+        )
+        self.dt = DiscussionType.objects.create(name="Preview Discussion")
+        self.professor = User.objects.create_user(
+            username="previewprof", password="password123", role="professor"
+        )
+        self.client.force_authenticate(user=self.professor)
+
+    def _upload(self, upload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return UploadedFile.objects.create(
+                uploader=self.professor,
+                batch=self.batch,
+                discussion_type=self.dt,
+                file=upload,
+            )
+
+    def _preview(self, uploaded, **headers):
+        return self.client.get(
+            reverse("uploadedfile-preview", args=[uploaded.pk]), **headers
+        )
+
+    def test_image_preview_is_served_with_etag(self):
+        uploaded = self._upload(SimpleUploadedFile("chart.png", _image_bytes()))
+        self.assertEqual(uploaded.preview.status, "ready")
+        self.assertEqual(uploaded.preview.page_count, 1)
+
+        response = self._preview(uploaded)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        image = Image.open(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertLessEqual(max(image.size), 480)
+
+        cached = self._preview(uploaded, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_pptx_thumbnail_and_slide_count(self):
+        upload = _office_file(
+            "deck.pptx",
+            {
+                "docProps/thumbnail.jpeg": _image_bytes((256, 192), fmt="JPEG"),
+                **{f"ppt/slides/slide{n}.xml": '<p:sld xmlns:p="p"/>' for n in (1, 2, 3)},
+            },
+        )
+        uploaded = self._upload(upload)
+        response = self.client.get(reverse("uploadedfile-list"))
+        item = next(i for i in response.data if i["id"] == uploaded.id)
+        self.assertEqual(item["page_count"], 3)
+        self.assertTrue(item["has_preview"])
+        self.assertEqual(self._preview(uploaded).status_code, status.HTTP_200_OK)
+
+    def test_files_without_preview_answer_404(self):
+        uploaded = self._upload(SimpleUploadedFile("notes.txt", b"plain"))
+        self.assertEqual(uploaded.preview.status, "unavailable")
+        self.assertEqual(
+            self._preview(uploaded).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    def test_identical_content_reuses_the_cached_preview(self):
+        content = _image_bytes()
+        self._upload(SimpleUploadedFile("a.png", content))
+        with mock.patch("core_api.previews._render") as render:
+            copy = self._upload(SimpleUploadedFile("b.png", content))
+        render.assert_not_called()
+        self.assertEqual(copy.preview.status, "ready")
+
+    def test_cache_is_bounded_and_evicted_previews_regenerate(self):
+        with override_settings(PREVIEW_CACHE_MAX_BYTES=1):
+            first = self._upload(SimpleUploadedFile("a.png", _image_bytes()))
+        self.assertFalse(
+            os.path.exists(previews.preview_path(first.preview.source_sha256))
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._preview(first)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self._preview(first).status_code, status.HTTP_200_OK)
+
+
+class ReconcileMediaTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        batch = Batch.objects.create(
+            name="Reconcile Batch 2024", start_year=2024, end_year=2027
+        )
+        dt = DiscussionType.objects.create(name="Reconcile Discussion")
+        professor = User.objects.create_user(
+            username="reconcileprof", password="password123", role="professor"
+        )
+        self.storage = UploadedFile._meta.get_field("file").storage
+        self.kept, self.gone = (
+            UploadedFile.objects.create(
+                uploader=professor,
+                batch=batch,
+                discussion_type=dt,
+                file=SimpleUploadedFile(name, content),
+            )
+            for name, content in (("kept.pdf", b"kept"), ("gone.pdf", b"gone"))
+        )
+        self.storage.delete(self.gone.file.name)  # A row whose file vanished
+        self.orphan = self.storage.save(  # A file whose row was deleted
+            "old-batch/seminar/stale.pdf", SimpleUploadedFile("stale.pdf", b"stale")
+        )
+        self.stray = os.path.join(self.media_root, "stray.txt")
+        with open(self.stray, "wb") as fh:
+            fh.write(b"stray")
+        # A blob nothing links to, as left by a crash mid-upload
+        self.unused_blob = self.storage.path(
+            self.storage.blob_name(hashlib.sha256(b"lost").hexdigest())
+        )
+        os.makedirs(os.path.dirname(self.unused_blob))
+        with open(self.unused_blob, "wb") as fh:
+            fh.write(b"lost")
+
+    def _reconcile(self, *args):
+        out = io.StringIO()
+        call_command("reconcile_media", *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_reports_without_deleting(self):
+        output = self._reconcile("--min-age", "0")
+        self.assertIn("Orphaned: old-batch/seminar/stale.pdf", output)
+        self.assertIn("Orphaned: stray.txt", output)
+        self.assertIn(f"Unused blob: {os.path.basename(self.unused_blob)}", output)
+        self.assertIn(f"Missing: #{self.gone.pk} {self.gone.file.name}", output)
+        self.assertIn("2 orphaned, 1 unused blob(s)", output)
+        self.assertIn("1 missing", output)
+        self.assertTrue(self.storage.exists(self.orphan))
+        self.assertTrue(os.path.exists(self.unused_blob))
+
+    def test_delete_removes_orphans_blobs_and_empty_directories(self):
+        orphan_blob = self.storage.path(
+            self.storage.blob_name(hashlib.sha256(b"stale").hexdigest())
+        )
+        output = self._reconcile("--delete", "--min-age", "0")
+        self.assertIn("Removed 3 file(s).", output)
+        for path in (self.stray, self.unused_blob, orphan_blob):
+            self.assertFalse(os.path.exists(path))
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, "old-batch")))
+        self.assertTrue(self.storage.exists(self.kept.file.name))
+        self.assertTrue(
+            os.path.exists(
+                self.storage.path(self.storage.blob_name(self.kept.content_sha256))
+            )
+        )
+
+    def test_recently_written_files_are_left_alone(self):
+        output = self._reconcile("--delete")
+        self.assertIn("0 orphaned, 0 unused blob(s)", output)
+        self.assertTrue(os.path.exists(self.stray))
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class StorageCleanupTests(TempMediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.batch = Batch.objects.create(
+            name="Cleanup Batch 2024", start_year=2024, end_year=2027
+        )
+        self.dt = DiscussionType.objects.create(name="Cleanup Discussion")
+        self.professor = User.objects.create_user(
+            username="cleanupprof", password="password123", role="professor"
+        )
+        self.storage = UploadedFile._meta.get_field("file").storage
+        self.client.force_authenticate(user=self.professor)
+
+    def _upload(self, name, content, batch=None):
+        return UploadedFile.objects.create(
+            uploader=self.professor,
+            batch=batch or self.batch,
+            discussion_type=self.dt,
+            file=SimpleUploadedFile(name, content),
+        )
+
+    def _blob(self, content):
+        return self.storage.path(
+            self.storage.blob_name(hashlib.sha256(content).hexdigest())
+        )
+
+    def test_deleting_a_file_removes_it_from_disk(self):
+        uploaded = self._upload("notes.pdf", b"delete me")
+        name = uploaded.file.name
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                reverse("uploadedfile-detail", args=[uploaded.pk])
+            )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(os.path.exists(self._blob(b"delete me")))
+
+    def test_replacing_a_file_removes_the_old_one(self):
+        uploaded = self._upload("draft.pdf", b"first draft")
+        old_name = uploaded.file.name
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("uploadedfile-detail", args=[uploaded.pk]),
+                {"description": "Renamed"},
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.storage.exists(old_name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("uploadedfile-detail", args=[uploaded.pk]),
+                {"file": SimpleUploadedFile("final.pdf", b"final version")},
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        uploaded.refresh_from_db()
+        self.assertNotEqual(uploaded.file.name, old_name)
+        self.assertTrue(self.storage.exists(uploaded.file.name))
+        self.assertFalse(self.storage.exists(old_name))
+
+    def test_cascading_delete_queues_one_cleanup_job(self):
+        other_batch = Batch.objects.create(
+            name="Cleanup Batch 2025", start_year=2025, end_year=2028
+        )
+        names = [
+            self._upload(f"{i}.pdf", f"file {i}".encode(), other_batch).file.name
+            for i in range(3)
+        ]
+        kept = self._upload("kept.pdf", b"kept")
+        with self.captureOnCommitCallbacks(execute=True):
+            other_batch.delete()
+        jobs = BackgroundJob.objects.filter(task__endswith="delete_stored_files")
+        job = jobs.get()
+        self.assertEqual(sorted(job.args[0]), sorted(names))
+        self.assertEqual(job.status, "succeeded")
+        for name in names:
+            self.assertFalse(self.storage.exists(name))
+        self.assertTrue(self.storage.exists(kept.file.name))
+
+    def test_rolled_back_delete_keeps_the_file(self):
+        uploaded = self._upload("kept.pdf", b"still needed")
+        pk, name = uploaded.pk, uploaded.file.name
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    uploaded.delete()
+                    raise RuntimeError("abort")
+            other = self._upload("other.pdf", b"other")
+            other_name = other.file.name
+            other.delete()
+        self.assertTrue(UploadedFile.objects.filter(pk=pk).exists())
+        self.assertTrue(self.storage.exists(name))
+        self.assertFalse(self.storage.exists(other_name))
+        job = BackgroundJob.objects.get(task__endswith="delete_stored_files")
+        self.assertEqual(job.args, [[other_name]])
+
+    def test_names_from_a_rolled_back_savepoint_leave_the_batch(self):
+        first, second = self._upload("1.pdf", b"one"), self._upload("2.pdf", b"two")
+        names = first.file.name, second.file.name
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                first.delete()
+                with self.assertRaises(RuntimeError):
+                    with transaction.atomic():
+                        second.delete()
+                        raise RuntimeError("abort")
+        job = BackgroundJob.objects.get(task__endswith="delete_stored_files")
+        self.assertEqual(job.args, [[names[0]]])
+        self.assertFalse(self.storage.exists(names[0]))
+        self.assertTrue(self.storage.exists(names[1]))
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.batch = Batch.objects.create(
+            name="Paging Batch 2024", start_year=2024, end_year=2027
+        )
+        self.dt = DiscussionType.objects.create(name="Paging Discussion")
+        self.professor = User.objects.create_user(
+            username="pagingprof", password="password123", role="professor"
+        )
+        same_day = datetime.date(2024, 6, 1)
+        for i in range(5):  # Same date on purpose: ordering must fall back to id
+            Schedule.objects.create(
+                batch=self.batch,
+                discussion_type=self.dt,
+                title=f"Topic {i}",
+                scheduled_date=same_day,
+                created_by=self.professor,
+            )
+        self.client.force_authenticate(user=self.professor)
+
+    def test_schedules_unpaginated_by_default(self):
+        response = self.client.get(reverse("schedule-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 5)
+
+    def test_schedules_cursor_pages_cover_every_row_once(self):
+        url = reverse("schedule-list") + "?page_size=2"
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+        expected = list(
+            Schedule.objects.order_by("-scheduled_date", "-id").values_list(
+                "id", flat=True
+            )
+        )
+        self.assertEqual(seen, expected)
+
+
 # Add more test classes for Batches, DiscussionTypes, Schedules, etc.
@@ -0,0 +1,16 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LoginScreenRateThrottle(SimpleRateThrottle):
+    """
+    Limits the public login-screen endpoints per client IP, authenticated or
+    not. Behind Caddy the IP comes from X-Forwarded-For (see NUM_PROXIES).
+    """
+
+    scope = "login_screen"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
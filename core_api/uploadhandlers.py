@@ -0,0 +1,35 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+class MediaTempFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams every uploaded file to disk in `chunk_size` pieces instead of
+    buffering it in the waitress worker's memory.
+
+    The temp file lives in settings.FILE_UPLOAD_TEMP_DIR, which sits under
+    MEDIA_ROOT. Because both are on the same filesystem, FileSystemStorage can
+    hand the file to its get_file_upload_path destination with a plain rename
+    (see django.core.files.move.file_move_safe) instead of copying it again.
+
+    Each chunk is also fed to SHA-256 on the way through; the digest is set as
+    `sha256` on the finished file so DedupFileSystemStorage need not re-read it.
+    """
+
+    def new_file(self, *args, **kwargs):
+        # NamedTemporaryFile does not create its directory; do it on first use.
+        os.makedirs(settings.FILE_UPLOAD_TEMP_DIR, exist_ok=True)
+        super().new_file(*args, **kwargs)
+        self.sha256 = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.sha256.hexdigest()
+        return file
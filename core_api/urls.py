@@ -10,6 +10,7 @@ router.register(
 )
 router.register(r"schedules", views.ScheduleViewSet, basename="schedule")
 router.register(r"files", views.UploadedFileViewSet, basename="uploadedfile")
+router.register(r"uploads", views.ChunkedUploadViewSet, basename="chunkedupload")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -22,6 +23,16 @@ urlpatterns = [
         views.PresenterCandidatesListView.as_view(),
         name="presenter-candidates-list",
     ),
+    path(
+        "verification/",
+        views.VerificationReportView.as_view(),
+        name="verification-report",
+    ),
+    path(
+        "dashboard/",
+        views.DashboardSummaryView.as_view(),
+        name="dashboard-summary",
+    ),
     path(
         "download-file/<int:file_id>/",
         views.download_uploaded_file,
@@ -1,21 +1,33 @@
-from rest_framework import viewsets, permissions, status, generics
+from rest_framework import viewsets, permissions, status, generics, mixins
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
-from django.db.models import Q
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
 from django.http import (
-    FileResponse,
     Http404,
     HttpResponseForbidden,
+    StreamingHttpResponse,
 )  # For download view
 from django.shortcuts import get_object_or_404  # For download view
-from urllib.parse import quote  # For filename encoding in download view
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.text import slugify
 import os  # For download view if needed for basename
 
 from rest_framework.exceptions import ValidationError as DRFValidationError
 
-from .models import User, Batch, DiscussionType, Schedule, UploadedFile
+from .models import (
+    User,
+    Batch,
+    DiscussionType,
+    Schedule,
+    UploadedFile,
+    ChunkedUpload,
+)
 
 # It's good practice to import specific serializers if you know them,
 # or just 'from . import serializers' and use 'serializers.UserSerializer'
@@ -27,6 +39,10 @@ from .serializers import (
     DiscussionTypeSerializer,
     ScheduleSerializer,
     UploadedFileSerializer,
+    ChunkedUploadSerializer,
+    MissingSubmissionSerializer,
+    DigestUploadSerializer,
+    sparse_field_names,
 )
 from .permissions import (
     IsStaffOrReadOnly,
@@ -34,14 +50,46 @@ from .permissions import (
     FileObjectPermissions,
     IsStaffUser,
 )
+from .caching import (
+    BATCH_LIST_CACHE_KEY,
+    DISCUSSION_TYPE_LIST_CACHE_KEY,
+    USERNAME_LIST_CACHE_KEY,
+    CachedListMixin,
+)
+from .downloads import content_disposition, serve_uploaded_file
+from .exports import iter_zip_archive
+from .fastlists import (
+    SCHEDULE_VALUES,
+    UPLOADED_FILE_VALUES,
+    FastListMixin,
+    schedule_list,
+    uploaded_file_list,
+)
+from .previews import preview_response
+from .reports import dashboard_summary, missing_submissions, verification_report
+from .search import search_terms, search_uploaded_files
+from .pagination import ScheduleCursorPagination, UploadedFileCursorPagination
+from .throttling import LoginScreenRateThrottle
+from .chunked import (
+    AssembledChunkedFile,
+    ChunkWriteError,
+    create_part_file,
+    discard_chunked_upload,
+    next_expiry,
+    write_chunk,
+)
 
 
-class UsernamesListView(generics.ListAPIView):
-    queryset = User.objects.filter(is_active=True, is_superuser=False).order_by(
-        "username"
+class UsernamesListView(CachedListMixin, generics.ListAPIView):
+    queryset = (
+        User.objects.filter(is_active=True, is_superuser=False)
+        .select_related("batch")
+        .order_by("username")
     )
     serializer_class = SimpleUserSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginScreenRateThrottle]
+    list_cache_key = USERNAME_LIST_CACHE_KEY
 
 
 class CustomObtainAuthToken(ObtainAuthToken):
@@ -163,30 +211,43 @@ class PresenterCandidatesListView(generics.ListAPIView):
         return queryset.order_by("username")
 
 
-class BatchViewSet(viewsets.ModelViewSet):
+class BatchViewSet(CachedListMixin, viewsets.ModelViewSet):
     queryset = Batch.objects.filter(is_active=True).order_by("name")
     serializer_class = BatchSerializer
     permission_classes = [IsStaffOrReadOnly]
+    list_cache_key = BATCH_LIST_CACHE_KEY
 
 
-class DiscussionTypeViewSet(viewsets.ModelViewSet):
+class DiscussionTypeViewSet(CachedListMixin, viewsets.ModelViewSet):
     queryset = DiscussionType.objects.all().order_by("name")
     serializer_class = DiscussionTypeSerializer
     permission_classes = [IsStaffOrReadOnly]
+    list_cache_key = DISCUSSION_TYPE_LIST_CACHE_KEY
 
 
-class ScheduleViewSet(viewsets.ModelViewSet):
+class ScheduleViewSet(FastListMixin, viewsets.ModelViewSet):
     serializer_class = ScheduleSerializer
+    pagination_class = ScheduleCursorPagination  # Opt-in via ?page_size= / ?cursor=
+    fast_list_values = SCHEDULE_VALUES
+    fast_list_builder = staticmethod(schedule_list)
 
     def get_queryset(self):
         user = self.request.user
-        queryset = (
-            Schedule.objects.select_related(
+        fields = (
+            sparse_field_names(self.request, ScheduleSerializer)
+            if self.action == "list"
+            else None
+        )
+        if fields is None:
+            queryset = Schedule.objects.select_related(
                 "batch", "discussion_type", "presenter", "created_by"
+            ).with_submission_status()
+        else:  # ?fields= / ?omit=: only the joins, columns and subqueries used
+            queryset = ScheduleSerializer.trim_queryset(
+                Schedule.objects.all(), fields, always=["scheduled_date"]
             )
-            .prefetch_related("files")
-            .all()
-        )
+            if fields & ScheduleSerializer.annotated_fields:
+                queryset = queryset.with_submission_status()
 
         batch_id_param = self.request.query_params.get("batch_id")
         if batch_id_param:
@@ -205,21 +266,8 @@ class ScheduleViewSet(viewsets.ModelViewSet):
                 queryset = queryset.none()
 
         # Apply role-based visibility
-        if user.is_staff:
-            if user.role == "batch_leader" and user.batch:
-                # Batch leader is already filtered to their batch for schedule management
-                # If batch_id_param is given and it's not their batch, result is empty (correct)
-                return queryset.filter(batch=user.batch).order_by("-scheduled_date")
-            return queryset.order_by("-scheduled_date")  # Admin/Professor
-
-        if user.role == "student":
-            base_filter = Q()
-            if user.batch:
-                base_filter |= Q(batch=user.batch)  # Schedules in their batch
-            base_filter |= Q(presenter=user)  # Schedules they present
-            return queryset.filter(base_filter).distinct().order_by("-scheduled_date")
-
-        return queryset.none()
+        # If batch_id_param is given and it's not a batch leader's batch, result is empty (correct)
+        return queryset.visible_to(user).order_by("-scheduled_date")
 
     def get_permissions(self):
         class IsStaffAndCorrectBatchLeaderForSchedule(permissions.BasePermission):
@@ -263,14 +311,164 @@ class ScheduleViewSet(viewsets.ModelViewSet):
         serializer.save()  # created_by should not change on update typically, or handle if it can
 
 
-class UploadedFileViewSet(viewsets.ModelViewSet):
+class VerificationReportView(APIView):
+    """
+    Submitted / pending / overdue counts (overall and per batch, discussion
+    type and presenter) plus the list of schedules still missing a file.
+    Scoped exactly like ScheduleViewSet; optional batch_id and
+    discussion_type_id filters.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        schedules = Schedule.objects.visible_to(request.user)
+        for param, field in (
+            ("batch_id", "batch_id"),
+            ("discussion_type_id", "discussion_type_id"),
+        ):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    schedules = schedules.filter(**{field: int(value)})
+                except ValueError:
+                    schedules = schedules.none()
+
+        today = timezone.localdate()
+        report = verification_report(schedules, today)
+        report["missing"] = MissingSubmissionSerializer(
+            missing_submissions(schedules), many=True, context={"today": today}
+        ).data
+        return Response(report)
+
+
+class DashboardSummaryView(APIView):
+    """
+    Everything DashboardPage needs in one response: status counts, per-batch
+    chart data (staff only), upcoming schedules, recent uploads and pending
+    submissions, each capped at `limit` rows (default 5, max 20).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    default_limit = 5
+    max_limit = 20
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+
+        today = timezone.localdate()
+        summary = dashboard_summary(request.user, today, limit)
+        context = {"request": request, "today": today}
+        return Response(
+            {
+                "counts": summary["counts"],
+                "by_batch": summary["by_batch"],
+                "upcoming_schedules": ScheduleSerializer(
+                    summary["upcoming_schedules"], many=True, context=context
+                ).data,
+                "recent_uploads": UploadedFileSerializer(
+                    summary["recent_uploads"], many=True, context=context
+                ).data,
+                "pending_submissions": MissingSubmissionSerializer(
+                    summary["pending_submissions"], many=True, context=context
+                ).data,
+            }
+        )
+
+
+def validate_upload_target(user, batch_obj, discussion_type_obj, schedule_obj):
+    """
+    Raises DRFValidationError unless `user` may upload a file to the given
+    batch / discussion type / schedule. Shared by direct and chunked uploads.
+    """
+    if user.is_staff:
+        if user.role == "batch_leader":
+            if not user.batch:
+                raise DRFValidationError(
+                    {"detail": "Batch leader is not assigned to a batch."},
+                    code=status.HTTP_403_FORBIDDEN,
+                )
+            if batch_obj != user.batch:
+                raise DRFValidationError(
+                    {
+                        "detail": "Batch Leaders can only upload files to their own batch."
+                    },
+                    code=status.HTTP_403_FORBIDDEN,
+                )
+            if schedule_obj and schedule_obj.batch != user.batch:
+                raise DRFValidationError(
+                    {
+                        "detail": "The selected schedule does not belong to your batch."
+                    },
+                    code=status.HTTP_403_FORBIDDEN,
+                )
+    elif user.role == "student":
+        if not user.batch:
+            raise DRFValidationError(
+                {
+                    "detail": "You are not assigned to a batch and cannot upload files."
+                },
+                code=status.HTTP_403_FORBIDDEN,
+            )
+        if batch_obj != user.batch:
+            raise DRFValidationError(
+                {"detail": "Students can only upload files to their own batch."},
+                code=status.HTTP_403_FORBIDDEN,
+            )
+        if schedule_obj:
+            if schedule_obj.batch != user.batch:
+                raise DRFValidationError(
+                    {
+                        "detail": "The selected schedule does not belong to your batch."
+                    },
+                    code=status.HTTP_403_FORBIDDEN,
+                )
+            if schedule_obj.presenter and schedule_obj.presenter != user:
+                raise DRFValidationError(
+                    {
+                        "detail": "You can only upload files for schedules you are presenting."
+                    },
+                    code=status.HTTP_403_FORBIDDEN,
+                )
+
+    if schedule_obj:  # Common check for all roles if schedule is linked
+        if batch_obj != schedule_obj.batch:
+            raise DRFValidationError(
+                {"detail": "File's batch must match the schedule's batch."}
+            )
+        if discussion_type_obj != schedule_obj.discussion_type:
+            raise DRFValidationError(
+                {
+                    "detail": "File's discussion type must match the schedule's discussion type."
+                }
+            )
+
+
+class UploadedFileViewSet(FastListMixin, viewsets.ModelViewSet):
     serializer_class = UploadedFileSerializer
+    pagination_class = UploadedFileCursorPagination  # Opt-in via ?page_size= / ?cursor=
+    fast_list_values = UPLOADED_FILE_VALUES
+    fast_list_builder = staticmethod(uploaded_file_list)
 
     def get_queryset(self):
         user = self.request.user
-        queryset = UploadedFile.objects.select_related(
-            "uploader", "batch", "discussion_type", "schedule"
-        ).all()
+        fields = (
+            sparse_field_names(self.request, UploadedFileSerializer)
+            if self.action == "list"
+            else None
+        )
+        if fields is None:
+            queryset = UploadedFile.objects.select_related(
+                "uploader", "batch", "discussion_type", "schedule", "preview"
+            ).all()
+        else:  # ?fields= / ?omit=: only the joins and columns used
+            queryset = UploadedFileSerializer.trim_queryset(
+                UploadedFile.objects.all(), fields, always=["upload_date"]
+            )
 
         # Apply query_param filters
         batch_id_param = self.request.query_params.get("batch_id")
@@ -301,25 +499,14 @@ class UploadedFileViewSet(viewsets.ModelViewSet):
         # Default ordering
         final_queryset = queryset.order_by("-upload_date")
 
-        # Role-based visibility for LIST action (self.action == 'list' or None)
-        if self.action == "list" or self.action is None:
-            if user.is_staff:
-                if user.role == "batch_leader" and user.batch:
-                    return final_queryset.filter(batch=user.batch)
-                return final_queryset  # Admin/Professor see all (potentially filtered by params)
-            if user.role == "student":
-                base_filter = Q(uploader=user)  # Always see their own uploads
-                if user.batch:
-                    base_filter |= Q(
-                        batch=user.batch
-                    )  # And files in their current batch
-                return final_queryset.filter(base_filter).distinct()
-            return final_queryset.none()  # Should not be reached
+        # Role-based visibility for collection actions (list, export, or None)
+        if self.action in ("list", "export", "search", None):
+            return final_queryset.visible_to(user)
 
         return final_queryset  # For detail views, permissions handle access
 
     def get_permissions(self):
-        if self.action == "create":
+        if self.action in ("create", "from_digest"):
             return [permissions.IsAuthenticated(), CanUploadFile()]
         # FileObjectPermissions handles retrieve, update, partial_update, destroy
         # It also implicitly handles list by virtue of being applied, but get_queryset is primary for list scoping.
@@ -327,81 +514,248 @@ class UploadedFileViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         user = self.request.user
-        batch_obj = serializer.validated_data.get(
-            "batch"
-        )  # batch_obj is a Batch instance
-        schedule_obj = serializer.validated_data.get(
-            "schedule"
-        )  # schedule_obj is a Schedule instance
-
-        if user.is_staff:
-            if user.role == "batch_leader":
-                if not user.batch:
-                    raise DRFValidationError(
-                        {"detail": "Batch leader is not assigned to a batch."},
-                        code=status.HTTP_403_FORBIDDEN,
-                    )
-                if batch_obj != user.batch:
-                    raise DRFValidationError(
-                        {
-                            "detail": "Batch Leaders can only upload files to their own batch."
-                        },
-                        code=status.HTTP_403_FORBIDDEN,
-                    )
-                if schedule_obj and schedule_obj.batch != user.batch:
-                    raise DRFValidationError(
-                        {
-                            "detail": "The selected schedule does not belong to your batch."
-                        },
-                        code=status.HTTP_403_FORBIDDEN,
-                    )
-        elif user.role == "student":
-            if not user.batch:
-                raise DRFValidationError(
-                    {
-                        "detail": "You are not assigned to a batch and cannot upload files."
-                    },
-                    code=status.HTTP_403_FORBIDDEN,
-                )
-            if batch_obj != user.batch:
-                raise DRFValidationError(
-                    {"detail": "Students can only upload files to their own batch."},
-                    code=status.HTTP_403_FORBIDDEN,
-                )
-            if schedule_obj:
-                if schedule_obj.batch != user.batch:
-                    raise DRFValidationError(
-                        {
-                            "detail": "The selected schedule does not belong to your batch."
-                        },
-                        code=status.HTTP_403_FORBIDDEN,
-                    )
-                if schedule_obj.presenter and schedule_obj.presenter != user:
-                    raise DRFValidationError(
-                        {
-                            "detail": "You can only upload files for schedules you are presenting."
-                        },
-                        code=status.HTTP_403_FORBIDDEN,
+        validate_upload_target(
+            user,
+            serializer.validated_data.get("batch"),
+            serializer.validated_data.get("discussion_type"),
+            serializer.validated_data.get("schedule"),
+        )
+        serializer.save(uploader=user)
+
+    @action(detail=True, methods=["get"], url_path="preview")
+    def preview(self, request, pk=None):
+        """
+        First-page preview (JPEG, cacheable by ETag). 404 when the file has
+        none; `has_preview` in the file data says whether to ask.
+        """
+        return preview_response(request, self.get_object())
+
+    @action(detail=False, methods=["post"], url_path="from-digest")
+    def from_digest(self, request):
+        """
+        Creates an upload from content the server already holds, without the
+        bytes: the client posts the file's SHA-256 and size with the usual
+        upload fields. 404 when no file the user can see has that content;
+        the client then uploads the file normally.
+        """
+        serializer = DigestUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        validate_upload_target(
+            request.user, data["batch"], data["discussion_type"], data.get("schedule")
+        )
+        source = (
+            UploadedFile.objects.visible_to(request.user)
+            .filter(content_sha256=data["content_sha256"], size=data["size"])
+            .exclude(file="")
+            .first()
+        )
+        if source is None:
+            return Response(
+                {"detail": "No stored file has this content."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        try:
+            with source.file.open("rb"):
+                content = File(source.file.file, name=data["original_filename"])
+                content.sha256 = source.content_sha256  # Storage links its blob
+                uploaded_file = serializer.save(uploader=request.user, file=content)
+        except FileNotFoundError:
+            return Response(
+                {"detail": "No stored file has this content."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(
+            UploadedFileSerializer(
+                uploaded_file, context=self.get_serializer_context()
+            ).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        """
+        Ranked search over filename, description and schedule title, matching
+        each word of ?q= as a prefix. Scoped and filtered like list; ?limit=
+        caps the results (default 50, max 200).
+        """
+        query = request.query_params.get("q", "")
+        if not search_terms(query):
+            return Response(
+                {"detail": "Provide a search query with q."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params.get("limit", 50))
+        except ValueError:
+            limit = 50
+        limit = max(1, min(limit, 200))
+
+        results = search_uploaded_files(self.get_queryset(), query)[:limit]
+        return Response(self.get_serializer(results, many=True).data)
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """
+        Streams a ZIP of every file the user can see, narrowed by the usual
+        list filters plus date_from / date_to (YYYY-MM-DD, on upload date).
+        At least one of batch_id, discussion_type_id, date_from or date_to is
+        required so nobody pulls the whole archive by accident.
+        """
+        params = request.query_params
+        if not any(
+            params.get(key)
+            for key in ("batch_id", "discussion_type_id", "date_from", "date_to")
+        ):
+            return Response(
+                {
+                    "detail": "Specify batch_id, discussion_type_id, date_from or date_to."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = self.get_queryset()
+        for param, lookup in (
+            ("date_from", "upload_date__date__gte"),
+            ("date_to", "upload_date__date__lte"),
+        ):
+            if params.get(param):
+                date_value = parse_date(params[param])
+                if date_value is None:
+                    return Response(
+                        {"detail": f"{param} must be a date (YYYY-MM-DD)."},
+                        status=status.HTTP_400_BAD_REQUEST,
                     )
+                queryset = queryset.filter(**{lookup: date_value})
+
+        name_parts = ["medmat-files"]
+        if params.get("batch_id", "").isdigit():
+            batch = Batch.objects.filter(pk=int(params["batch_id"])).first()
+            if batch:
+                name_parts.append(slugify(batch.name))
+        name_parts.append(timezone.localdate().isoformat())
+
+        response = StreamingHttpResponse(
+            iter_zip_archive(queryset.iterator(chunk_size=200)),
+            content_type="application/zip",
+        )
+        response["Content-Disposition"] = content_disposition(
+            "_".join(name_parts) + ".zip"
+        )
+        return response
 
-        if schedule_obj:  # Common check for all roles if schedule is linked
-            if batch_obj != schedule_obj.batch:
-                raise DRFValidationError(
-                    {"detail": "File's batch must match the schedule's batch."}
-                )
-            if (
-                serializer.validated_data.get("discussion_type")
-                != schedule_obj.discussion_type
-            ):
-                raise DRFValidationError(
-                    {
-                        "detail": "File's discussion type must match the schedule's discussion type."
-                    }
+
+class ChunkedUploadViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Resumable uploads for large files:
+      POST   /uploads/                  -> start; returns id, chunk_size, chunk_count
+      PUT    /uploads/<id>/chunks/<n>/  -> raw bytes of chunk n (any order, re-sendable)
+      GET    /uploads/<id>/             -> progress, incl. missing_chunks for resuming
+      POST   /uploads/<id>/complete/    -> creates the UploadedFile
+      DELETE /uploads/<id>/             -> abandon
+    """
+
+    serializer_class = ChunkedUploadSerializer
+    permission_classes = [permissions.IsAuthenticated, CanUploadFile]
+
+    def get_queryset(self):
+        # Users only ever see their own, unexpired uploads
+        return ChunkedUpload.objects.filter(
+            uploader=self.request.user, expires_at__gt=timezone.now()
+        ).select_related("batch", "discussion_type", "schedule")
+
+    def perform_create(self, serializer):
+        user = self.request.user
+        validate_upload_target(
+            user,
+            serializer.validated_data.get("batch"),
+            serializer.validated_data.get("discussion_type"),
+            serializer.validated_data.get("schedule"),
+        )
+        upload = serializer.save(
+            uploader=user,
+            chunk_size=settings.CHUNKED_UPLOAD_CHUNK_SIZE,
+            expires_at=next_expiry(),
+        )
+        create_part_file(upload)
+
+    def perform_destroy(self, instance):
+        discard_chunked_upload(instance)
+
+    @action(detail=True, methods=["put"], url_path=r"chunks/(?P<index>\d+)")
+    def upload_chunk(self, request, pk=None, index=None):
+        upload = self.get_object()
+        index = int(index)
+        if index >= upload.chunk_count:
+            return Response(
+                {"detail": f"Chunk index must be below {upload.chunk_count}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            write_chunk(upload, index, request.stream)
+        except ChunkWriteError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+            if index not in upload.received_chunks:
+                upload.received_chunks = sorted(upload.received_chunks + [index])
+            upload.expires_at = next_expiry()  # Activity keeps the upload alive
+            upload.save(update_fields=["received_chunks", "expires_at"])
+        return Response(self.get_serializer(upload).data)
+
+    @action(detail=True, methods=["post"], url_path="complete")
+    def complete(self, request, pk=None):
+        upload = self.get_object()
+        if upload.missing_chunk_count:
+            return Response(
+                {
+                    "detail": "Upload is incomplete.",
+                    "missing_chunks": upload.missing_chunks,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        # Re-check: the schedule or the user's batch may have changed since init
+        validate_upload_target(
+            request.user, upload.batch, upload.discussion_type, upload.schedule
+        )
+
+        uploaded_file = UploadedFile(
+            uploader=request.user,
+            batch=upload.batch,
+            discussion_type=upload.discussion_type,
+            schedule=upload.schedule,
+            description=upload.description,
+            original_filename=upload.original_filename,
+            file=AssembledChunkedFile(
+                upload.part_path, upload.original_filename, upload.total_size
+            ),
+        )
+        with transaction.atomic():
+            # Deleting the row claims the upload: a concurrent complete() of it
+            # deletes nothing and gets a 409. A failure below restores the row.
+            claimed, _ = ChunkedUpload.objects.filter(pk=upload.pk).delete()
+            if not claimed:
+                return Response(
+                    {"detail": "Upload is already being completed."},
+                    status=status.HTTP_409_CONFLICT,
                 )
-        serializer.save(uploader=user)
+            uploaded_file.save()  # Storage renames the .part file into place
+            discard_chunked_upload(upload)
+
+        serializer = UploadedFileSerializer(
+            uploaded_file, context=self.get_serializer_context()
+        )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-from django.http import FileResponse, Http404, HttpResponseForbidden
+from django.core.exceptions import ImproperlyConfigured
+from django.http import Http404, HttpResponseForbidden
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -433,25 +787,11 @@ def download_uploaded_file(request, file_id):
         raise Http404("File not found associated with this record.")
 
     try:
-        # Use a try-except for file opening as well
-        file_handle = uploaded_file.file.open("rb")
-        response = FileResponse(
-            file_handle, as_attachment=True, filename=uploaded_file.original_filename
-        )
-
-        # Optional: More robust filename encoding for Content-Disposition
-        try:
-            uploaded_file.original_filename.encode("ascii")
-            filename_header = 'filename="{}"'.format(uploaded_file.original_filename)
-        except UnicodeEncodeError:
-            filename_header = "filename*=UTF-8''{}".format(
-                quote(uploaded_file.original_filename)
-            )
-        response["Content-Disposition"] = "attachment; {}".format(filename_header)
-
-        return response
+        return serve_uploaded_file(request, uploaded_file)
     except FileNotFoundError:
         raise Http404("File not found on the server's filesystem.")
+    except ImproperlyConfigured:
+        raise  # A settings problem, not a missing file: let it surface as a 500
     except Exception as e:
         print(f"Error serving file (ID: {file_id}): {e}")  # Log the actual error
         raise Http404("An error occurred while trying to serve the file.")
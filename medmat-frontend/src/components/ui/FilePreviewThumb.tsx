@@ -0,0 +1,71 @@
+import React, { useEffect, useRef, useState } from "react";
+import { FileText } from "lucide-react";
+import { getFilePreviewUrl } from "../../services/fileService";
+import type { UploadedFile } from "../../types";
+
+interface FilePreviewThumbProps {
+  file: Pick<UploadedFile, "id" | "has_preview" | "original_filename">;
+  className?: string;
+}
+
+// First-page preview, fetched (with the auth header) only once the row scrolls into view.
+const FilePreviewThumb: React.FC<FilePreviewThumbProps> = ({
+  file,
+  className = "",
+}) => {
+  const containerRef = useRef<HTMLDivElement>(null);
+  const [isVisible, setIsVisible] = useState(false);
+  const [src, setSrc] = useState<string | null>(null);
+
+  useEffect(() => {
+    const node = containerRef.current;
+    if (!node || !file.has_preview) return;
+    const observer = new IntersectionObserver(([entry]) => {
+      if (entry.isIntersecting) {
+        setIsVisible(true);
+        observer.disconnect();
+      }
+    });
+    observer.observe(node);
+    return () => observer.disconnect();
+  }, [file.has_preview]);
+
+  useEffect(() => {
+    if (!isVisible) return;
+    let objectUrl: string | null = null;
+    let cancelled = false;
+    getFilePreviewUrl(file.id)
+      .then((url) => {
+        objectUrl = url;
+        if (cancelled) URL.revokeObjectURL(url);
+        else setSrc(url);
+      })
+      .catch(() => setSrc(null)); // Keep the icon; the preview may still be generating
+    return () => {
+      cancelled = true;
+      if (objectUrl) URL.revokeObjectURL(objectUrl);
+    };
+  }, [isVisible, file.id]);
+
+  return (
+    <div
+      ref={containerRef}
+      className={`w-12 h-12 flex-shrink-0 rounded-md overflow-hidden border border-light-border dark:border-dark-border bg-light-bg dark:bg-dark-bg flex items-center justify-center ${className}`}
+    >
+      {src ? (
+        <img
+          src={src}
+          alt={`Preview of ${file.original_filename}`}
+          className="w-full h-full object-cover"
+        />
+      ) : (
+        <FileText
+          size={20}
+          className="text-light-text-secondary/60 dark:text-dark-text-secondary/60"
+        />
+      )}
+    </div>
+  );
+};
+
+export default FilePreviewThumb;
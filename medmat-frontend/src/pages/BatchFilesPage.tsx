@@ -4,8 +4,10 @@ import { useParams, Link, useLocation } from "react-router-dom";
 import { useAuth } from "../hooks/useAuth";
 import {
   getFiles,
+  searchFiles,
   deleteFile,
   downloadFileProgrammatically,
+  downloadFilesZip,
 } from "../services/fileService"; // Import new download function
 import { useAppDataStore } from "../services/appDataService";
 import type { UploadedFile as UploadedFileType, SimpleUser } from "../types";
@@ -18,6 +20,8 @@ import {
 } from "../components/ui/Card";
 import Alert from "../components/ui/Alert";
 import Button from "../components/ui/Button";
+import Input from "../components/ui/Input";
+import FilePreviewThumb from "../components/ui/FilePreviewThumb";
 import Select from "../components/ui/Select";
 import {
   Download,
@@ -27,6 +31,8 @@ import {
   Filter,
   Activity,
   UploadCloud,
+  Archive,
+  Search,
 } from "lucide-react";
 import { getUserDisplayName } from "../utils/userDisplay";
 import { useToast } from "../hooks/useToast";
@@ -64,6 +70,8 @@ const BatchFilesPage: React.FC = () => {
   const [filterDiscussionTypeId, setFilterDiscussionTypeId] =
     useState<string>("");
   const [filterScheduleId, setFilterScheduleId] = useState<string>("");
+  const [searchTerm, setSearchTerm] = useState<string>("");
+  const [debouncedSearchTerm, setDebouncedSearchTerm] = useState<string>("");
 
   const currentBatch = useMemo(
     () => batches.find((b) => b.id.toString() === batchIdParam),
@@ -95,6 +103,12 @@ const BatchFilesPage: React.FC = () => {
     presenterCandidates.length /* fetchPresenterCandidates, batchIdParam */,
   ]);
 
+  useEffect(() => {
+    // Wait for a pause in typing before asking the server
+    const timer = setTimeout(() => setDebouncedSearchTerm(searchTerm.trim()), 300);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
   const fetchBatchFiles = useCallback(async () => {
     // ... (fetchBatchFiles logic remains the same as your provided version) ...
     if (!batchIdParam) {
@@ -125,7 +139,9 @@ const BatchFilesPage: React.FC = () => {
         params.discussion_type_id = parseInt(filterDiscussionTypeId);
       if (filterScheduleId) params.schedule_id = parseInt(filterScheduleId);
 
-      const fetchedFiles = await getFiles(params);
+      const fetchedFiles = debouncedSearchTerm
+        ? await searchFiles({ ...params, q: debouncedSearchTerm })
+        : await getFiles(params);
       setFiles(fetchedFiles);
     } catch (err: unknown) {
       console.error("Failed to fetch batch files:", err);
@@ -146,7 +162,13 @@ const BatchFilesPage: React.FC = () => {
     } finally {
       setIsLoadingFiles(false);
     }
-  }, [batchIdParam, filterDiscussionTypeId, filterScheduleId, loggedInUser]);
+  }, [
+    batchIdParam,
+    filterDiscussionTypeId,
+    filterScheduleId,
+    debouncedSearchTerm,
+    loggedInUser,
+  ]);
 
   useEffect(() => {
     fetchBatchFiles();
@@ -204,6 +226,27 @@ const BatchFilesPage: React.FC = () => {
     }
   };
 
+  const handleDownloadAllClick = async () => {
+    if (!batchIdParam) return;
+    const toastId = `download-zip-${batchIdParam}`;
+    toast.loading("Preparing ZIP...", { id: toastId });
+    try {
+      await downloadFilesZip(
+        {
+          batch_id: parseInt(batchIdParam),
+          discussion_type_id: filterDiscussionTypeId
+            ? parseInt(filterDiscussionTypeId)
+            : undefined,
+          schedule_id: filterScheduleId ? parseInt(filterScheduleId) : undefined,
+        },
+        `${currentBatch?.name || `batch-${batchIdParam}`} files.zip`
+      );
+      toast.success("ZIP download started!", { id: toastId });
+    } catch {
+      toast.error("Failed to download the ZIP archive.", { id: toastId });
+    }
+  };
+
   const discussionTypeOptions = useMemo(
     () => [
       { value: "", label: "All Discussion Types" },
@@ -304,19 +347,31 @@ const BatchFilesPage: React.FC = () => {
             </p>
           )}
         </div>
-        {canUploadToThisBatch && (
-          <Link
-            to={`/upload?batchId=${batchIdParam || loggedInUser?.batch || ""}`}
-          >
+        <div className="flex flex-wrap gap-2">
+          {files.length > 0 && (
             <Button
-              variant="primary"
+              variant="outline"
               size="md"
-              leftIcon={<UploadCloud size={18} />}
+              leftIcon={<Archive size={18} />}
+              onClick={handleDownloadAllClick}
             >
-              Upload to this Batch
+              Download All (ZIP)
             </Button>
-          </Link>
-        )}
+          )}
+          {canUploadToThisBatch && (
+            <Link
+              to={`/upload?batchId=${batchIdParam || loggedInUser?.batch || ""}`}
+            >
+              <Button
+                variant="primary"
+                size="md"
+                leftIcon={<UploadCloud size={18} />}
+              >
+                Upload to this Batch
+              </Button>
+            </Link>
+          )}
+        </div>
       </header>
 
       {(filesError || appDataError) && (
@@ -340,23 +395,35 @@ const BatchFilesPage: React.FC = () => {
             <CardTitle
               as="h2"
               icon={<Filter size={20} />}
-              subTitle="Filter files by discussion type."
+              subTitle="Search by name, description or topic, or filter by discussion type."
             >
               Filter Files
             </CardTitle>
-            <div className="w-full md:w-auto md:min-w-[250px] lg:min-w-[300px] pt-2 md:pt-0">
-              <Select
-                options={discussionTypeOptions}
-                value={filterDiscussionTypeId}
-                onChange={(e) => {
-                  setFilterDiscussionTypeId(e.target.value);
-                  if (filterScheduleId && e.target.value)
-                    setFilterScheduleId("");
-                }}
-                aria-label="Filter by discussion type"
-                placeholder="All Discussion Types"
-                disabled={isLoadingFiles || initialDataLoading}
+            <div className="w-full md:w-auto flex flex-col sm:flex-row gap-3 pt-2 md:pt-0">
+              <Input
+                id="file-search"
+                type="search"
+                placeholder="Search files..."
+                value={searchTerm}
+                onChange={(e) => setSearchTerm(e.target.value)}
+                aria-label="Search files"
+                leftIcon={<Search size={18} />}
+                containerClassName="sm:min-w-[220px]"
               />
+              <div className="md:min-w-[250px] lg:min-w-[300px]">
+                <Select
+                  options={discussionTypeOptions}
+                  value={filterDiscussionTypeId}
+                  onChange={(e) => {
+                    setFilterDiscussionTypeId(e.target.value);
+                    if (filterScheduleId && e.target.value)
+                      setFilterScheduleId("");
+                  }}
+                  aria-label="Filter by discussion type"
+                  placeholder="All Discussion Types"
+                  disabled={isLoadingFiles || initialDataLoading}
+                />
+              </div>
             </div>
           </div>
         </CardHeader>
@@ -415,13 +482,28 @@ const BatchFilesPage: React.FC = () => {
                       className="group hover:bg-light-bg dark:hover:bg-dark-bg transition-colors duration-100"
                     >
                       <td className="table-td pl-6 max-w-xs">
-                        {/* Filename is now just text, download via button */}
-                        <span
-                          className="font-medium text-light-text dark:text-dark-text truncate block group-hover:whitespace-normal group-hover:text-primary dark:group-hover:text-primary-light"
-                          title={file.original_filename}
-                        >
-                          {file.original_filename}
-                        </span>
+                        <div className="flex items-center gap-3 min-w-0">
+                          <FilePreviewThumb file={file} />
+                          <div className="min-w-0">
+                            {/* Filename is now just text, download via button */}
+                            <span
+                              className="font-medium text-light-text dark:text-dark-text truncate block group-hover:whitespace-normal group-hover:text-primary dark:group-hover:text-primary-light"
+                              title={file.original_filename}
+                            >
+                              {file.original_filename}
+                            </span>
+                            {file.page_count && file.page_count > 1 ? (
+                              <span className="text-xs text-light-text-secondary dark:text-dark-text-secondary">
+                                {file.page_count}{" "}
+                                {file.original_filename
+                                  .toLowerCase()
+                                  .endsWith(".pptx")
+                                  ? "slides"
+                                  : "pages"}
+                              </span>
+                            ) : null}
+                          </div>
+                        </div>
                       </td>
                       <td
                         className="table-td-secondary max-w-sm truncate group-hover:whitespace-normal"
@@ -1,9 +1,8 @@
 // src/pages/DashboardPage.tsx
 import React, { useEffect, useMemo } from "react";
 import { useAuth } from "../hooks/useAuth";
-import { useAppDataStore } from "../services/appDataService";
-import type { UploadedFile as UploadedFileType } from "../types";
-import { getFiles } from "../services/fileService";
+import type { DashboardSummary } from "../types";
+import { getDashboardSummary } from "../services/scheduleService";
 import Alert from "../components/ui/Alert";
 import {
   CalendarDays,
@@ -45,144 +44,75 @@ const formatDate = (dateString: string) => {
 
 const DashboardPage: React.FC = () => {
   const { user: loggedInUser } = useAuth();
-  const {
-    schedules,
-    fetchSchedules,
-    batches,
-    fetchBatches,
-    isLoading: appDataIsLoading,
-    error: appDataError,
-    fetchPresenterCandidates,
-  } = useAppDataStore();
-
-  const [recentUploads, setRecentUploads] = React.useState<UploadedFileType[]>(
-    []
+  const [summary, setSummary] = React.useState<DashboardSummary | null>(
+    null
   );
-  const [uploadsLoading, setUploadsLoading] = React.useState(false);
+  const [summaryLoading, setSummaryLoading] = React.useState(false);
+  const [summaryError, setSummaryError] = React.useState<string | null>(null);
 
   const displayName = getUserDisplayName(loggedInUser);
   const displayRoleConcept = getRoleDisplay(loggedInUser);
 
   useEffect(() => {
     if (!loggedInUser) return;
-    if (!batches.length) fetchBatches();
-
-    if (loggedInUser.role === "student" && loggedInUser.id) {
-      fetchSchedules({
-        presenterId: loggedInUser.id,
-        batchId: loggedInUser.batch || undefined,
-      });
-      const fetchRecentStudentUploads = async () => {
-        setUploadsLoading(true);
-        try {
-          const uploads = await getFiles({
-            uploader_id: loggedInUser.id,
-            ordering: "-upload_date",
-          });
-          setRecentUploads(uploads.slice(0, 3));
-        } catch (err) {
-          console.error("Failed to fetch recent uploads:", err);
-        } finally {
-          setUploadsLoading(false);
-        }
-      };
-      fetchRecentStudentUploads();
-    } else if (loggedInUser.role === "batch_leader" && loggedInUser.batch) {
-      fetchSchedules({ batchId: loggedInUser.batch });
-      // Batch leader might also need presenterCandidates for their batch if they view details often
-      fetchPresenterCandidates({ batchId: loggedInUser.batch });
-    } else if (loggedInUser.is_staff) {
-      fetchSchedules({});
-      fetchPresenterCandidates({}); // Staff might view details across batches
-    }
-  }, [
-    loggedInUser,
-    fetchSchedules,
-    fetchBatches,
-    batches.length,
-    fetchPresenterCandidates,
-  ]);
+    // One request instead of schedules + files + batches + candidates.
+    const fetchSummary = async () => {
+      setSummaryLoading(true);
+      setSummaryError(null);
+      try {
+        setSummary(await getDashboardSummary());
+      } catch (err) {
+        console.error("Failed to fetch dashboard summary:", err);
+        setSummaryError(
+          err instanceof Error ? err.message : "Unknown error"
+        );
+      } finally {
+        setSummaryLoading(false);
+      }
+    };
+    fetchSummary();
+  }, [loggedInUser]);
 
   const upcomingPresentations = useMemo(() => {
-    if (loggedInUser?.role !== "student" || !loggedInUser.id) return [];
-    const today = new Date().toISOString().split("T")[0];
-    return schedules
-      .filter(
-        (s) => s.presenter === loggedInUser.id && s.scheduled_date >= today
-      )
-      .sort(
-        (a, b) =>
-          new Date(a.scheduled_date).getTime() -
-          new Date(b.scheduled_date).getTime()
-      )
-      .slice(0, 3);
-  }, [schedules, loggedInUser]);
+    if (loggedInUser?.role !== "student" || !summary) return [];
+    return summary.upcoming_schedules.slice(0, 3);
+  }, [summary, loggedInUser]);
+
+  const recentUploads = useMemo(
+    () => (summary ? summary.recent_uploads.slice(0, 3) : []),
+    [summary]
+  );
 
   const batchLeaderStats = useMemo(() => {
-    if (loggedInUser?.role !== "batch_leader" || !loggedInUser.batch)
+    if (loggedInUser?.role !== "batch_leader" || !loggedInUser.batch || !summary)
       return null;
-    const today = new Date();
-    const currentBatchSchedules = schedules.filter(
-      (s) => s.batch === loggedInUser.batch
-    );
-
-    const upcomingThisMonth = currentBatchSchedules.filter((s) => {
-      const schedDate = new Date(
-        s.scheduled_date.includes("T")
-          ? s.scheduled_date
-          : s.scheduled_date + "T00:00:00"
-      );
-      return (
-        schedDate >= today &&
-        schedDate.getMonth() === today.getMonth() &&
-        schedDate.getFullYear() === today.getFullYear()
-      );
-    }).length;
-
-    const pendingSubmissionsOverall = currentBatchSchedules.filter(
-      (s) => !s.is_submission_uploaded
-    ).length;
-    const batchName =
-      batches.find((b) => b.id === loggedInUser.batch)?.name || "Your Batch";
-    // To get totalStudents, you'd need to fetch users for this batch:
-    // const totalStudents = presenterCandidates.filter(pc => pc.batch_id === loggedInUser.batch && pc.role === 'student').length;
-    const totalStudents = "N/A"; // Placeholder until user fetching for batch members is robust
-
     return {
-      upcomingThisMonth,
-      pendingSubmissionsOverall,
-      batchName,
-      totalStudents,
+      upcomingThisMonth: summary.counts.upcoming_this_month,
+      pendingSubmissionsOverall:
+        summary.counts.pending + summary.counts.overdue,
+      batchName: loggedInUser.batch_name || "Your Batch",
     };
-  }, [schedules, loggedInUser, batches]);
+  }, [summary, loggedInUser]);
 
   const adminProfessorChartData = useMemo(() => {
-    if (!loggedInUser?.is_staff || loggedInUser.role === "batch_leader")
+    if (
+      !loggedInUser?.is_staff ||
+      loggedInUser.role === "batch_leader" ||
+      !summary
+    )
       return []; // Exclude batch leaders from this specific chart
-    const dataByBatch: { name: string; scheduled: number; pending: number }[] =
-      [];
-    batches
-      .filter((b) => b.is_active)
-      .forEach((batch) => {
-        const batchSchedules = schedules.filter((s) => s.batch === batch.id);
-        if (batchSchedules.length > 0) {
-          // Only include batches with schedules
-          dataByBatch.push({
-            name: batch.name.replace(" Batch", "").replace(" batch", ""),
-            scheduled: batchSchedules.length,
-            pending: batchSchedules.filter((s) => !s.is_submission_uploaded)
-              .length,
-          });
-        }
-      });
-    return dataByBatch.sort((a, b) => b.scheduled - a.scheduled).slice(0, 5);
-  }, [schedules, batches, loggedInUser]);
+    return summary.by_batch
+      .filter((row) => row.total > 0)
+      .map((row) => ({
+        name: row.batch_name.replace(" Batch", "").replace(" batch", ""),
+        scheduled: row.total,
+        pending: row.total - row.submitted,
+      }))
+      .sort((a, b) => b.scheduled - a.scheduled)
+      .slice(0, 5);
+  }, [summary, loggedInUser]);
 
-  if (
-    !loggedInUser ||
-    (appDataIsLoading.schedules && !schedules.length) ||
-    (appDataIsLoading.batches && !batches.length && loggedInUser.is_staff)
-  ) {
+  if (!loggedInUser || (summaryLoading && !summary)) {
     return (
       <div className="flex flex-col items-center justify-center min-h-[calc(100vh-15rem)]">
         <Activity
@@ -215,11 +145,11 @@ const DashboardPage: React.FC = () => {
         </p>
       </header>
 
-      {appDataError && (
+      {summaryError && (
         <Alert
           type="error"
           title="Data Loading Error"
-          message={`Could not load some dashboard data: ${appDataError}`}
+          message={`Could not load some dashboard data: ${summaryError}`}
           className="mb-6"
         />
       )}
@@ -307,11 +237,7 @@ const DashboardPage: React.FC = () => {
                   : undefined
               }
             >
-              {uploadsLoading ? (
-                <p className="text-sm animate-subtle-pulse py-4 text-center">
-                  Loading uploads...
-                </p>
-              ) : recentUploads.length > 0 ? (
+              {recentUploads.length > 0 ? (
                 <ul className="space-y-3 max-h-80 overflow-y-auto pr-2 pretty-scrollbar">
                   {recentUploads.map((file) => (
                     <li
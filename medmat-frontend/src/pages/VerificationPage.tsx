@@ -3,7 +3,13 @@ import React, { useEffect, useState, useMemo } from "react";
 import { useAppDataStore } from "../services/appDataService";
 import { useAuth } from "../hooks/useAuth";
 import { Link } from "react-router-dom";
-import type { Schedule as ScheduleType, SimpleUser } from "../types";
+import type {
+  MissingSubmission,
+  SimpleUser,
+  VerificationReport,
+} from "../types";
+import { getVerificationReport } from "../services/scheduleService";
+import { StatCard } from "../components/dashboard/StatCard";
 import {
   Card,
   CardContent,
@@ -16,11 +22,12 @@ import Alert from "../components/ui/Alert";
 import {
   CheckCircle,
   XCircle,
-  Info,
   ListChecks, // Page title icon
   Filter, // Filter section icon
-  ExternalLink, // For "View Files" link
+  Upload, // For the "Upload" link
   Activity, // Loading
+  Clock, // Pending count
+  AlertTriangle, // Overdue count
 } from "lucide-react";
 import { getUserDisplayName } from "../utils/userDisplay";
 
@@ -39,16 +46,7 @@ const formatDate = (dateString: string) => {
 
 const VerificationPage: React.FC = () => {
   const { user: loggedInUser } = useAuth();
-  const {
-    schedules,
-    fetchSchedules,
-    batches,
-    fetchBatches,
-    presenterCandidates,
-    fetchPresenterCandidates,
-    isLoading: appDataIsLoading,
-    error: appDataError,
-  } = useAppDataStore();
+  const { batches, fetchBatches, presenterCandidates } = useAppDataStore();
 
   const [filterBatchId, setFilterBatchId] = useState<string>(() => {
     if (loggedInUser?.role === "batch_leader" && loggedInUser.batch) {
@@ -56,49 +54,32 @@ const VerificationPage: React.FC = () => {
     }
     return ""; // Default to "All Batches" for Professors/Admins
   });
-  const [filterStatus, setFilterStatus] = useState<
-    "all" | "uploaded" | "pending"
-  >("all");
+  const [report, setReport] = useState<VerificationReport | null>(null);
+  const [isLoading, setIsLoading] = useState(true);
+  const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
     if (!batches.length) fetchBatches();
   }, [fetchBatches, batches.length]);
 
   useEffect(() => {
-    const params: { batchId?: number } = {};
-    if (filterBatchId) {
-      params.batchId = parseInt(filterBatchId);
-    } else if (loggedInUser?.role === "batch_leader" && loggedInUser.batch) {
-      // Ensure batch leader always has their batch filter applied if "All Batches" isn't an option for them
-      params.batchId = loggedInUser.batch;
-    }
-    fetchSchedules(params);
-  }, [fetchSchedules, filterBatchId, loggedInUser]);
-
-  useEffect(() => {
-    if (loggedInUser?.is_staff && schedules.length > 0) {
-      const presenterIds = new Set(
-        schedules.map((s) => s.presenter).filter(Boolean) as number[]
-      );
-      if (presenterIds.size === 0) return;
-      const neededPresenterIds = Array.from(presenterIds).filter(
-        (id) => !presenterCandidates.some((pc) => pc.id === id)
-      );
-      if (neededPresenterIds.length > 0) {
-        const fetchParams: { batchId?: number } = {};
-        if (filterBatchId) fetchParams.batchId = parseInt(filterBatchId);
-        else if (loggedInUser.role === "batch_leader" && loggedInUser.batch)
-          fetchParams.batchId = loggedInUser.batch;
-        fetchPresenterCandidates(fetchParams);
-      }
-    }
-  }, [
-    loggedInUser,
-    schedules,
-    presenterCandidates,
-    fetchPresenterCandidates,
-    filterBatchId,
-  ]);
+    // Counts and the missing list are worked out on the server; the page
+    // never downloads the full schedule list.
+    setIsLoading(true);
+    getVerificationReport(
+      filterBatchId ? { batch_id: parseInt(filterBatchId) } : undefined
+    )
+      .then((data) => {
+        setReport(data);
+        setError(null);
+      })
+      .catch((err) => {
+        console.error("Failed to fetch verification report:", err);
+        setReport(null);
+        setError("Could not load the verification report.");
+      })
+      .finally(() => setIsLoading(false));
+  }, [filterBatchId]);
 
   const batchOptions = useMemo(() => {
     const options = batches.map((b) => ({
@@ -120,22 +101,10 @@ const VerificationPage: React.FC = () => {
     return [{ value: "", label: "Select a Batch" }, ...options]; // Should ideally not be reached by non-staff
   }, [batches, loggedInUser]);
 
-  const statusOptions = [
-    { value: "all", label: "All Statuses" },
-    { value: "uploaded", label: "Uploaded Only" },
-    { value: "pending", label: "Pending Upload Only" },
-  ];
-
-  const filteredSchedules = useMemo(() => {
-    return schedules.filter((schedule) => {
-      if (filterStatus === "uploaded") return schedule.is_submission_uploaded;
-      if (filterStatus === "pending") return !schedule.is_submission_uploaded;
-      return true; // 'all'
-    });
-  }, [schedules, filterStatus]);
+  const missing = report?.missing ?? [];
 
   const getDisplayPresenterName = (
-    schedule: ScheduleType
+    schedule: MissingSubmission
   ): string | React.ReactNode => {
     if (!schedule.presenter)
       return (
@@ -146,6 +115,7 @@ const VerificationPage: React.FC = () => {
     if (loggedInUser && schedule.presenter === loggedInUser.id) {
       return getUserDisplayName(loggedInUser);
     }
+    // Only names already loaded elsewhere; no extra request for this page
     const presenterUser = presenterCandidates.find(
       (u) => u.id === schedule.presenter
     );
@@ -172,18 +142,7 @@ const VerificationPage: React.FC = () => {
     );
   };
 
-  const isLoadingPage =
-    (appDataIsLoading.schedules || appDataIsLoading.batches) &&
-    !filteredSchedules.length;
-  const isLoadingPresentersForDisplay =
-    loggedInUser?.is_staff &&
-    appDataIsLoading.presenterCandidates &&
-    schedules.some(
-      (s) =>
-        s.presenter && !presenterCandidates.find((pc) => pc.id === s.presenter)
-    );
-
-  if (isLoadingPage) {
+  if (isLoading && !report) {
     return (
       <div className="flex flex-col items-center justify-center min-h-[calc(100vh-15rem)]">
         <Activity
@@ -214,15 +173,37 @@ const VerificationPage: React.FC = () => {
         </div>
       </header>
 
-      {appDataError && (
+      {report && (
+        <div className="grid grid-cols-2 lg:grid-cols-4 gap-4">
+          <StatCard
+            title="Scheduled"
+            value={report.totals.total}
+            icon={<ListChecks size={24} />}
+          />
+          <StatCard
+            title="Submitted"
+            value={report.totals.submitted}
+            icon={<CheckCircle size={24} />}
+          />
+          <StatCard
+            title="Pending"
+            value={report.totals.pending}
+            icon={<Clock size={24} />}
+          />
+          <StatCard
+            title="Overdue"
+            value={report.totals.overdue}
+            icon={<AlertTriangle size={24} />}
+            isAlert
+          />
+        </div>
+      )}
+
+      {error && (
         <Alert
-          type={filteredSchedules.length > 0 ? "warning" : "error"}
-          title={
-            filteredSchedules.length > 0
-              ? "Data Incomplete"
-              : "Error Loading Data"
-          }
-          message={appDataError}
+          type="error"
+          title="Error Loading Data"
+          message={error}
           className="my-4"
         />
       )}
@@ -234,9 +215,9 @@ const VerificationPage: React.FC = () => {
           <CardTitle
             as="h2"
             icon={<Filter size={20} />}
-            subTitle="Filter schedules to verify submissions."
+            subTitle="Schedules that have no file uploaded yet."
           >
-            Filter Submissions
+            Missing Submissions
           </CardTitle>
           <div className="mt-4 grid grid-cols-1 md:grid-cols-2 gap-4">
             <Select
@@ -247,41 +228,28 @@ const VerificationPage: React.FC = () => {
               disabled={
                 (loggedInUser?.role === "batch_leader" &&
                   !!loggedInUser.batch) ||
-                isLoadingPage
+                isLoading
               }
               placeholder="Select Batch..."
             />
-            <Select
-              label="Filter by Upload Status"
-              options={statusOptions}
-              value={filterStatus}
-              onChange={(e) =>
-                setFilterStatus(
-                  e.target.value as "all" | "uploaded" | "pending"
-                )
-              }
-              disabled={isLoadingPage}
-            />
           </div>
         </CardHeader>
-        <CardContent
-          className={filteredSchedules.length > 0 ? "p-0 sm:p-0" : "pt-4"}
-        >
-          {isLoadingPage && filteredSchedules.length === 0 ? (
+        <CardContent className={missing.length > 0 ? "p-0 sm:p-0" : "pt-4"}>
+          {isLoading ? (
             <div className="text-center py-10 text-light-text-secondary dark:text-dark-text-secondary">
-              Loading filtered schedules...
+              Loading missing submissions...
             </div>
-          ) : filteredSchedules.length === 0 ? (
+          ) : missing.length === 0 ? (
             <div className="text-center py-12 px-6">
-              <Info
+              <CheckCircle
                 size={56}
-                className="mx-auto text-light-text-secondary/40 dark:text-dark-text-secondary/40 mb-4"
+                className="mx-auto text-success/60 dark:text-green-300/60 mb-4"
               />
               <h3 className="text-lg font-semibold text-light-text dark:text-dark-text mb-1">
-                No Schedules Match
+                Nothing Missing
               </h3>
               <p className="text-sm text-light-text-secondary dark:text-dark-text-secondary">
-                Try adjusting your filters.
+                Every schedule in this selection has a file uploaded.
               </p>
             </div>
           ) : (
@@ -291,22 +259,14 @@ const VerificationPage: React.FC = () => {
                   <tr>
                     <th className="table-th text-left pl-6">Date</th>
                     <th className="table-th text-left">Topic</th>
-                    <th className="table-th text-left">
-                      Presenter{" "}
-                      {isLoadingPresentersForDisplay && (
-                        <Activity
-                          size={14}
-                          className="inline animate-spin ml-1"
-                        />
-                      )}
-                    </th>
+                    <th className="table-th text-left">Presenter</th>
                     <th className="table-th text-left">Batch</th>
                     <th className="table-th text-center">Upload Status</th>
-                    <th className="table-th text-center pr-6">View Files</th>
+                    <th className="table-th text-center pr-6">Upload</th>
                   </tr>
                 </thead>
                 <tbody className="divide-y divide-light-border dark:divide-dark-border">
-                  {filteredSchedules.map((schedule) => (
+                  {missing.map((schedule) => (
                     <tr
                       key={schedule.id}
                       className="group hover:bg-light-bg dark:hover:bg-dark-bg transition-colors duration-100"
@@ -335,36 +295,27 @@ const VerificationPage: React.FC = () => {
                         <span
                           className={`inline-flex items-center px-2.5 py-1 rounded-lg text-xs font-semibold 
                                          ${
-                                           schedule.is_submission_uploaded
-                                             ? "bg-success/10 text-success dark:bg-green-500/20 dark:text-green-300"
-                                             : "bg-error/10 text-error dark:bg-red-500/20 dark:text-red-300"
+                                           schedule.is_overdue
+                                             ? "bg-error/10 text-error dark:bg-red-500/20 dark:text-red-300"
+                                             : "bg-warning/10 text-warning dark:bg-yellow-500/20 dark:text-yellow-300"
                                          }`}
                         >
-                          {schedule.is_submission_uploaded ? (
-                            <CheckCircle size={14} className="mr-1.5" />
-                          ) : (
+                          {schedule.is_overdue ? (
                             <XCircle size={14} className="mr-1.5" />
+                          ) : (
+                            <Clock size={14} className="mr-1.5" />
                           )}
-                          {schedule.is_submission_uploaded
-                            ? "Uploaded"
-                            : "Pending"}
+                          {schedule.is_overdue ? "Overdue" : "Pending"}
                         </span>
                       </td>
                       <td className="table-td text-center pr-6">
-                        {schedule.is_submission_uploaded ? (
-                          <Link
-                            to={`/batch/${schedule.batch}/files?schedule_id=${schedule.id}`}
-                            className="inline-flex items-center text-sm font-medium text-primary hover:text-primary-dark dark:text-primary-light dark:hover:text-primary transition-colors"
-                            title="View submitted files for this schedule"
-                          >
-                            View Files{" "}
-                            <ExternalLink size={14} className="ml-1.5" />
-                          </Link>
-                        ) : (
-                          <span className="text-sm text-light-text-secondary/70 dark:text-dark-text-secondary/70">
-                            -
-                          </span>
-                        )}
+                        <Link
+                          to={`/batch/${schedule.batch}/files?schedule_id=${schedule.id}`}
+                          className="inline-flex items-center text-sm font-medium text-primary hover:text-primary-dark dark:text-primary-light dark:hover:text-primary transition-colors"
+                          title="Open the file list for this schedule"
+                        >
+                          Upload <Upload size={14} className="ml-1.5" />
+                        </Link>
                       </td>
                     </tr>
                   ))}
@@ -373,10 +324,9 @@ const VerificationPage: React.FC = () => {
             </div>
           )}
         </CardContent>
-        {filteredSchedules.length > 0 && (
+        {missing.length > 0 && (
           <CardFooter className="text-xs text-light-text-secondary dark:text-dark-text-secondary">
-            Displaying {filteredSchedules.length} schedule(s) based on current
-            filters.
+            {missing.length} schedule(s) still missing a file.
           </CardFooter>
         )}
       </Card>
@@ -1,6 +1,6 @@
 // src/services/fileService.ts
 import apiClient from './api';
-import type { UploadedFile } from '../types';
+import type { CursorPage, UploadedFile } from '../types';
 
 interface UploadFilePayload {
     file: File;
@@ -10,7 +10,89 @@ interface UploadFilePayload {
     description?: string;
 }
 
+// Files above this size go through the resumable /uploads/ protocol, so a dropped
+// connection only costs the chunk that was in flight instead of the whole file.
+const CHUNKED_UPLOAD_THRESHOLD = 20 * 1024 * 1024;
+const CHUNK_RETRIES = 3;
+
+interface ChunkedUploadSession {
+    id: string;
+    chunk_size: number;
+    chunk_count: number;
+    missing_chunks: number[];
+}
+
+export const uploadFileChunked = async (payload: UploadFilePayload): Promise<UploadedFile> => {
+    const { data: session } = await apiClient.post<ChunkedUploadSession>('/uploads/', {
+        batch: payload.batch,
+        discussion_type: payload.discussion_type,
+        schedule: payload.schedule ?? null,
+        description: payload.description ?? '',
+        original_filename: payload.file.name,
+        total_size: payload.file.size,
+    });
+
+    for (const index of session.missing_chunks) {
+        const start = index * session.chunk_size;
+        const chunk = payload.file.slice(start, start + session.chunk_size);
+        for (let attempt = 1; ; attempt++) {
+            try {
+                await apiClient.put(`/uploads/${session.id}/chunks/${index}/`, chunk, {
+                    headers: { 'Content-Type': 'application/octet-stream' },
+                });
+                break;
+            } catch (error) {
+                if (attempt >= CHUNK_RETRIES) throw error;
+                await new Promise((res) => setTimeout(res, 1000 * attempt)); // Back off, then re-send this chunk only
+            }
+        }
+    }
+
+    const response = await apiClient.post<UploadedFile>(`/uploads/${session.id}/complete/`);
+    return response.data;
+};
+
+// Files up to this size are hashed in the browser first, so content the server
+// already holds (e.g. a re-submitted deck) is linked instead of sent again.
+// crypto.subtle cannot hash incrementally and needs the whole file in memory,
+// so larger files skip the check and are uploaded directly.
+const DIGEST_PRECHECK_MAX_SIZE = 32 * 1024 * 1024;
+
+const sha256Hex = async (file: File): Promise<string | null> => {
+    // crypto.subtle only exists on HTTPS or localhost pages
+    if (!window.crypto?.subtle || file.size > DIGEST_PRECHECK_MAX_SIZE) return null;
+    const digest = await window.crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+    return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, '0')).join('');
+};
+
+// Returns null when the server does not hold this content; upload the bytes then.
+export const uploadFromDigest = async (payload: UploadFilePayload, sha256: string): Promise<UploadedFile | null> => {
+    try {
+        const response = await apiClient.post<UploadedFile>('/files/from-digest/', {
+            batch: payload.batch,
+            discussion_type: payload.discussion_type,
+            schedule: payload.schedule ?? null,
+            description: payload.description ?? '',
+            original_filename: payload.file.name,
+            content_sha256: sha256,
+            size: payload.file.size,
+        });
+        return response.data;
+    } catch (error: any) {
+        if (error.response?.status === 404) return null;
+        throw error;
+    }
+};
+
 export const uploadFile = async (payload: UploadFilePayload): Promise<UploadedFile> => {
+    const sha256 = await sha256Hex(payload.file).catch(() => null);
+    if (sha256) {
+        const linked = await uploadFromDigest(payload, sha256);
+        if (linked) return linked;
+    }
+    if (payload.file.size > CHUNKED_UPLOAD_THRESHOLD) {
+        return uploadFileChunked(payload);
+    }
     const formData = new FormData();
     formData.append('file', payload.file);
     formData.append('batch', String(payload.batch));
@@ -40,6 +122,9 @@ interface GetFilesParams {
     schedule_id?: number;
     uploader_id?: number;
     ordering?: string;
+    // Comma-separated field names to keep (or drop); trimmed fields are absent from the response
+    fields?: string;
+    omit?: string;
 }
 
 export const getFiles = async (params?: GetFilesParams): Promise<UploadedFile[]> => {
@@ -47,11 +132,37 @@ export const getFiles = async (params?: GetFilesParams): Promise<UploadedFile[]>
     return response.data;
 };
 
+interface SearchFilesParams extends Omit<GetFilesParams, 'ordering' | 'fields' | 'omit'> {
+    q: string;
+    limit?: number; // Default 50, max 200
+}
+
+// Ranked search over filename, description and schedule title; each word matches as a prefix.
+export const searchFiles = async (params: SearchFilesParams): Promise<UploadedFile[]> => {
+    const response = await apiClient.get<UploadedFile[]>('/files/search/', { params });
+    return response.data;
+};
+
+// Cursor-paginated variant: pass `cursor` (from a previous page's next/previous link) to continue.
+export const getFilesPage = async (params?: GetFilesParams & { page_size?: number; cursor?: string }): Promise<CursorPage<UploadedFile>> => {
+    const response = await apiClient.get<CursorPage<UploadedFile>>('/files/', {
+        params: { page_size: 50, ...params },
+    });
+    return response.data;
+};
+
 export const getFileDetails = async (fileId: number): Promise<UploadedFile> => {
     const response = await apiClient.get<UploadedFile>(`/files/${fileId}/`);
     return response.data;
 };
 
+// Object URL for the file's first-page preview image; revoke it when done.
+// The server sends an ETag, so repeat views revalidate instead of re-downloading.
+export const getFilePreviewUrl = async (fileId: number): Promise<string> => {
+    const response = await apiClient.get(`/files/${fileId}/preview/`, { responseType: 'blob' });
+    return URL.createObjectURL(response.data);
+};
+
 export const deleteFile = async (fileId: number): Promise<void> => {
     await apiClient.delete(`/files/${fileId}/`);
 };
@@ -103,4 +214,26 @@ export const downloadFileProgrammatically = async (fileId: number, originalFilen
         }
         throw new Error(error.message || 'File download failed. Please check network or permissions.');
     }
-};
\ No newline at end of file
+};
+
+interface ExportFilesParams {
+    batch_id?: number;
+    discussion_type_id?: number;
+    schedule_id?: number;
+    date_from?: string; // "YYYY-MM-DD"
+    date_to?: string; // "YYYY-MM-DD"
+}
+
+// Downloads every visible file matching the filters as one ZIP, built on the fly by the server.
+export const downloadFilesZip = async (params: ExportFilesParams, zipFilename: string): Promise<void> => {
+    const response = await apiClient.get('/files/export/', { params, responseType: 'blob' });
+    const blob = new Blob([response.data], { type: 'application/zip' });
+    const url = window.URL.createObjectURL(blob);
+    const link = document.createElement('a');
+    link.href = url;
+    link.setAttribute('download', zipFilename);
+    document.body.appendChild(link);
+    link.click();
+    link.parentNode?.removeChild(link);
+    window.URL.revokeObjectURL(url);
+};
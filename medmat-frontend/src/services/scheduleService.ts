@@ -1,5 +1,5 @@
 import apiClient from './api';
-import type { Schedule } from '../types';
+import type { DashboardSummary, Schedule, VerificationReport } from '../types';
 // fetchSchedules is already in useAppDataStore, but we might want specific versions here.
 // For simplicity, let's assume appDataStore.fetchSchedules is used for listing.
 
@@ -31,4 +31,15 @@ export const getScheduleDetails = async (scheduleId: number): Promise<Schedule>
 export const deleteScheduleAPI = async (scheduleId: number): Promise<void> => {
     // Renamed to deleteScheduleAPI to avoid conflict if page has a handleDelete function
     await apiClient.delete(`/schedules/${scheduleId}/`);
-};
\ No newline at end of file
+};
+
+// Server-side submission counts and missing-submission list (scoped by role on the backend)
+export const getVerificationReport = async (params?: { batch_id?: number; discussion_type_id?: number }): Promise<VerificationReport> => {
+    const response = await apiClient.get<VerificationReport>('/verification/', { params });
+    return response.data;
+};
+
+export const getDashboardSummary = async (params?: { limit?: number }): Promise<DashboardSummary> => {
+    const response = await apiClient.get<DashboardSummary>('/dashboard/', { params });
+    return response.data;
+};
@@ -57,6 +57,8 @@ export interface Schedule {
     created_by_username: string | null;
     description?: string;
     is_submission_uploaded: boolean;
+    submission_count: number;
+    latest_submission_date: string | null; // DateTime string of the newest linked upload
 }
 
 export interface UploadedFile {
@@ -75,6 +77,53 @@ export interface UploadedFile {
     original_filename: string;
     upload_date: string; // DateTime string
     description?: string;
+    page_count?: number | null; // Pages or slides, when known
+    has_preview?: boolean; // A first-page image is available from /files/<id>/preview/
+}
+
+export interface SubmissionCounts {
+    total: number;
+    submitted: number;
+    pending: number; // Nothing uploaded yet, date not passed
+    overdue: number; // Nothing uploaded yet, date passed
+}
+
+export interface MissingSubmission {
+    id: number;
+    batch: number;
+    batch_name: string;
+    discussion_type: number;
+    discussion_type_name: string;
+    title: string;
+    presenter: number | null;
+    presenter_username: string | null;
+    scheduled_date: string; // "YYYY-MM-DD"
+    is_overdue: boolean;
+}
+
+// GET /api/verification/
+export interface VerificationReport {
+    totals: SubmissionCounts;
+    by_batch: (SubmissionCounts & { batch: number; batch_name: string })[];
+    by_discussion_type: (SubmissionCounts & { discussion_type: number; discussion_type_name: string })[];
+    by_presenter: (SubmissionCounts & { presenter: number | null; presenter_username: string | null })[];
+    missing: MissingSubmission[];
+}
+
+// GET /api/dashboard/ (students: own presentations/uploads; staff: everything visible)
+export interface DashboardSummary {
+    counts: SubmissionCounts & { upcoming_this_month: number };
+    by_batch: (SubmissionCounts & { batch: number; batch_name: string })[]; // Active batches, staff only
+    upcoming_schedules: Schedule[];
+    recent_uploads: UploadedFile[];
+    pending_submissions: MissingSubmission[];
+}
+
+// Envelope returned by list endpoints when ?page_size= or ?cursor= is sent
+export interface CursorPage<T> {
+    next: string | null;
+    previous: string | null;
+    results: T[];
 }
 
 export interface AuthResponse {
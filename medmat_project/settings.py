@@ -119,6 +119,37 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+# Opt-in SQLite tuning for production, where waitress serves requests from
+# several threads against one database file. With SQLITE_TUNING = True every
+# new connection runs SQLITE_TUNING_PRAGMAS:
+#   journal_mode=WAL      readers no longer block on, or block, the writer
+#                         (persists in the database file once set)
+#   synchronous=NORMAL    safe under WAL; fsync at checkpoints, not every commit
+#   busy_timeout          wait up to N ms for the write lock instead of raising
+#                         "database is locked"
+#   cache_size, mmap_size larger page cache (negative = KiB) and mmap'd reads
+# and transactions start with BEGIN IMMEDIATE, so atomic() blocks take the
+# write lock up front instead of failing on a read-to-write upgrade, which
+# busy_timeout cannot retry. Compare profiles with:
+#   python manage.py benchmark_sqlite_concurrency
+SQLITE_TUNING = False
+SQLITE_TUNING_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,  # ms
+    "cache_size": -20000,  # ~20 MB
+    "mmap_size": 134217728,  # 128 MB
+    "temp_store": "MEMORY",
+}
+SQLITE_TUNING_OPTIONS = {
+    "init_command": ";".join(
+        f"PRAGMA {name}={value}" for name, value in SQLITE_TUNING_PRAGMAS.items()
+    ),
+    "transaction_mode": "IMMEDIATE",
+}
+if SQLITE_TUNING and DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"]["OPTIONS"] = SQLITE_TUNING_OPTIONS
+
 # For production, consider PostgreSQL:
 # DATABASES = {
 #     'default': {
@@ -173,13 +204,23 @@ STATICFILES_DIRS = [
 STATIC_ROOT = os.path.join(
     BASE_DIR, "staticfiles_build", "static", "assets"
 )  # WhiteNoise serves from here
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 
 # Media files (User uploads)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media_files")
 
+STORAGES = {
+    # Uploads are stored once per distinct content under MEDIA_ROOT/.blobs and
+    # hard-linked to their usual paths; see core_api.storage. Run
+    #   python manage.py dedupe_media
+    # once to move files uploaded earlier into the blob store.
+    "default": {"BACKEND": "core_api.storage.DedupFileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"
+    },
+}
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -189,9 +230,27 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "core_api.User"
 
 # Django REST Framework settings
+# Caches are in-process: Waitress runs one process, so signal-based
+# invalidation reaches every thread. Use a shared backend (e.g. Redis) before
+# running more than one server process.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "medmat-default",
+    },
+    # token -> user lookups for core_api.authentication.CachedTokenAuthentication
+    "tokens": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "medmat-tokens",
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
+}
+TOKEN_AUTH_CACHE = "tokens"
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "core_api.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",  # For browsable API & Admin
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -207,14 +266,69 @@ REST_FRAMEWORK = {
     #     'rest_framework.throttling.AnonRateThrottle',
     #     'rest_framework.throttling.UserRateThrottle'
     # ],
-    # 'DEFAULT_THROTTLE_RATES': {
-    #     'anon': '100/day',
-    #     'user': '1000/day'
-    # }
+    "DEFAULT_THROTTLE_RATES": {
+        # Per IP; generous because a whole class may share one NAT address.
+        "login_screen": "120/minute",
+        # 'anon': '100/day',
+        # 'user': '1000/day'
+    },
+    # Caddy sits in front: take the client IP from X-Forwarded-For.
+    "NUM_PROXIES": 1,
 }
 
-# settings.py
-FILE_UPLOAD_MAX_MEMORY_SIZE = 262144000  # 250 MB in bytes (250 * 1024 * 1024)
-DATA_UPLOAD_MAX_MEMORY_SIZE = (
-    267386880  # Slightly larger than file upload for overhead (e.g., 255 MB)
-)
+# File uploads
+# Every uploaded file is streamed to a temp file in 64 KB chunks (never held in RAM),
+# then renamed into place. Keep the temp dir inside MEDIA_ROOT so that rename stays
+# on one filesystem and is atomic.
+FILE_UPLOAD_HANDLERS = [
+    "core_api.uploadhandlers.MediaTempFileUploadHandler",
+]
+FILE_UPLOAD_TEMP_DIR = os.path.join(MEDIA_ROOT, ".upload_tmp")  # Created by core_api
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5 MB (Django default); unused by the handler above
+# Limits the non-file part of a request body only (form fields, JSON). File data is
+# not counted here, so large presentations are unaffected.
+DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10 MB
+
+# Resumable (chunked) uploads: /api/uploads/
+CHUNKED_UPLOAD_DIR = os.path.join(MEDIA_ROOT, ".chunked_uploads")
+CHUNKED_UPLOAD_CHUNK_SIZE = 5242880  # 5 MB per PUT
+CHUNKED_UPLOAD_MAX_SIZE = 2147483648  # 2 GB; larger uploads are refused when started
+CHUNKED_UPLOAD_EXPIRY_HOURS = 24  # Idle partial uploads are purged after this
+
+# How /api/download-file/<id>/ sends the bytes once Django has checked permissions:
+#   "python"           - Django streams the file itself (default; works with no proxy).
+#   "x-accel-redirect" - Django returns an X-Accel-Redirect header pointing at
+#                        FILE_DELIVERY_INTERNAL_URL + <path under MEDIA_ROOT>, and the
+#                        front proxy (Caddy/nginx) serves it. See README "Deployment".
+#   "x-sendfile"       - Django returns X-Sendfile with the absolute path (Apache, lighttpd).
+FILE_DELIVERY_BACKEND = "python"
+FILE_DELIVERY_INTERNAL_URL = "/protected-media/"
+
+# Background jobs (core_api.background): queued in the database with the
+# request's transaction and run by `python manage.py run_worker`, at most
+# BACKGROUND_TASK_WORKERS at once. BACKGROUND_TASKS_EAGER runs them inline on
+# commit instead (tests). Inspect with `python manage.py background_jobs`.
+# Raise the worker count only with SQLITE_TUNING on (or another database):
+# without busy_timeout and BEGIN IMMEDIATE, concurrent jobs that write fail
+# with "database is locked".
+BACKGROUND_TASK_WORKERS = 1
+BACKGROUND_TASKS_EAGER = False
+BACKGROUND_JOB_MAX_ATTEMPTS = 3
+BACKGROUND_JOB_RETRY_DELAY = 30  # Seconds; doubles after each failed attempt
+BACKGROUND_JOB_TIMEOUT = 1800  # Running longer than this means the worker died
+BACKGROUND_JOB_RETENTION_DAYS = 7  # Succeeded jobs are purged after this
+
+# Content search: text pulled from uploaded PDF/PPTX/DOCX files after upload.
+# PDFs need the optional pypdf package. Backfill with
+#   python manage.py index_documents
+DOCUMENT_TEXT_MAX_FILE_SIZE = 104857600  # 100 MB; larger files are not parsed
+DOCUMENT_TEXT_MAX_CHARS = 1000000  # Stored text is truncated past this
+
+# First-page previews (core_api.previews): JPEGs no larger than PREVIEW_SIZE,
+# cached under PREVIEW_CACHE_DIR. Once the cache passes PREVIEW_CACHE_MAX_BYTES
+# the least recently served previews are evicted. Backfill with
+#   python manage.py generate_previews
+PREVIEW_CACHE_DIR = os.path.join(MEDIA_ROOT, ".previews")
+PREVIEW_CACHE_MAX_BYTES = 209715200  # 200 MB
+PREVIEW_SIZE = (480, 480)
+PREVIEW_MAX_SOURCE_SIZE = 104857600  # 100 MB; larger files get no preview